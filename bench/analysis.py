@@ -0,0 +1,265 @@
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import wave
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from bench.results import (
+    best_of,
+    compare_reports,
+    load_report,
+    make_report,
+    save_report,
+)
+from src.autotracks.config import load_config
+from src.autotracks.failure import clear_failure
+from src.autotracks.library import Library, TrackData
+
+STUBS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stubs")
+
+
+def generate_audio_files(directory: str, count: int) -> List[str]:
+    """
+    Write tiny silent WAV files, recognised as audio by the library.
+
+    Arguments:
+        directory {str} -- Where the files are written, created if needed.
+        count {int} -- Number of files.
+
+    Returns:
+        List[str] -- The written filenames.
+    """
+    os.makedirs(directory, exist_ok=True)
+    width = len(str(count))
+
+    filenames: List[str] = []
+    for index in range(count):
+        filename = os.path.join(directory, f"track-{index:0{width}d}.wav")
+        with wave.open(filename, "wb") as audio_file:
+            audio_file.setnchannels(1)
+            audio_file.setsampwidth(2)
+            audio_file.setframerate(8000)
+            audio_file.writeframes(b"\0\0" * 800)
+        filenames.append(filename)
+
+    return filenames
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """
+    Read a percentile of a list of values.
+
+    Arguments:
+        values {List[float]} -- The values.
+        fraction {float} -- The percentile, between 0 and 1.
+
+    Returns:
+        float -- The value below which the given fraction of values fall.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure(filenames: List[str], workers: int) -> Dict[str, Any]:
+    """
+    Analyse audio files with a given number of workers, timing every file.
+
+    Arguments:
+        filenames {List[str]} -- The audio files, without cached metadata.
+        workers {int} -- Number of files analysed at once.
+
+    Returns:
+        Dict[str, Any] -- Wall time and per-file latencies ("metrics"), throughput,
+        CPU utilisation and failures ("info").
+    """
+    library = Library(load_config(), [], workers=workers)
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def timed(extractor: Callable[[str], TrackData]) -> Callable[[str], TrackData]:
+        def extract(filename: str) -> TrackData:
+            start = time.perf_counter()
+            try:
+                return extractor(filename)
+            finally:
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+
+        return extract
+
+    before = os.times()
+    start = time.perf_counter()
+    tracks, errors = library._analyse_audio(filenames, timed(library._analyse_oldskool))
+    wall = time.perf_counter() - start
+    after = os.times()
+
+    # analysis runs in the tools, i.e. in child processes
+    cpu = sum(after[:4]) - sum(before[:4])
+
+    # the next run must analyse the files again
+    for track in tracks.values():
+        os.remove(track.metadata_filename)
+    for filename in errors:
+        clear_failure(filename)
+
+    return {
+        "metrics": {
+            "wall": wall,
+            "latency.mean": statistics.fmean(latencies),
+            "latency.p50": percentile(latencies, 0.50),
+            "latency.p95": percentile(latencies, 0.95),
+            "latency.p99": percentile(latencies, 0.99),
+        },
+        "info": {
+            "files": len(filenames),
+            "failures": len(errors),
+            "files_per_second": len(filenames) / wall,
+            "cpu_utilisation": cpu / (wall * (os.cpu_count() or 1)),
+        },
+    }
+
+
+def main() -> int:
+    # initialize argument parser
+    parser = argparse.ArgumentParser(
+        description="🎶 Measure audio analysis throughput with stand-in analysis tools"
+    )
+
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=200,
+        metavar="N",
+        help="Number of audio files to analyse (default: 200)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8, 16],
+        metavar="N",
+        help="Worker counts to measure (default: 1 2 4 8 16)",
+    )
+
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        metavar="SECONDS",
+        help="Median time taken by each tool call (default: 0.05)",
+    )
+
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.3,
+        help="Spread of the latency, as the sigma of a log-normal (default: 0.3)",
+    )
+
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=0.0,
+        metavar="RATE",
+        help="Probability that a tool call fails (default: 0)",
+    )
+
+    parser.add_argument(
+        "--real-tools",
+        action="store_true",
+        help="Use the configured BPM_TAG, KEYFINDER_CLI and FFPROBE instead of the stubs",
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Measure each worker count N times and keep the best values (default: 1)",
+    )
+
+    parser.add_argument(
+        "--output",
+        metavar="FILENAME",
+        help="Where to save the results (default: analysis-<date>.json)",
+    )
+
+    parser.add_argument(
+        "--baseline",
+        metavar="FILENAME",
+        help="Compare the results with a previous run, and fail on regressions",
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown flagged as a regression (default: 0.2)",
+    )
+
+    args = parser.parse_args()
+
+    # the stubs are picked up through the regular configuration
+    if not args.real_tools:
+        for variable, tool in [
+            ("BPM_TAG", "bpm-tag"),
+            ("KEYFINDER_CLI", "keyfinder-cli"),
+            ("FFPROBE", "ffprobe"),
+        ]:
+            os.environ[variable] = os.path.join(STUBS_DIRECTORY, tool)
+        os.environ["STUB_LATENCY"] = str(args.latency)
+        os.environ["STUB_JITTER"] = str(args.jitter)
+        os.environ["STUB_FAILURE_RATE"] = str(args.failure_rate)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as directory:
+        filenames = generate_audio_files(directory, args.files)
+
+        for workers in args.workers:
+            runs = [measure(filenames, workers) for _ in range(args.repeat)]
+            result = {
+                "case": f"workers={workers}",
+                "metrics": best_of([run["metrics"] for run in runs]),
+                "info": runs[0]["info"],
+            }
+            results.append(result)
+
+            info = result["info"]
+            print(
+                f"{result['case']}: {info['files_per_second']:.1f} files/s, "
+                f"p95 {result['metrics']['latency.p95']:.3f} s, "
+                f"CPU {info['cpu_utilisation']:.0%}, {info['failures']} failures"
+            )
+
+    report = make_report("analysis", vars(args), results)
+    output = args.output or f"analysis-{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_report(report, output)
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        regressions = compare_reports(
+            load_report(args.baseline), report, args.threshold
+        )
+        for regression in regressions:
+            print(
+                f"✘ Regression: {regression['case']} {regression['metric']} "
+                f"{regression['baseline']:.4f} → {regression['current']:.4f} "
+                f"(x{regression['ratio']:.2f})"
+            )
+
+        if regressions:
+            return 1
+
+    return os.EX_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
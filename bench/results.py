@@ -0,0 +1,127 @@
+import json
+import platform
+import sys
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+def make_report(
+    benchmark: str, parameters: Dict[str, Any], results: List[Dict]
+) -> Dict:
+    """
+    Wrap benchmark results with what is needed to compare them with later runs.
+
+    Arguments:
+        benchmark {str} -- The benchmark name.
+        parameters {Dict[str, Any]} -- The benchmark parameters.
+        results {List[Dict]} -- One entry per measured case, each with a "case" name and "metrics".
+
+    Returns:
+        Dict -- The report, ready to be saved as JSON.
+    """
+    return {
+        "benchmark": benchmark,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": results,
+    }
+
+
+def save_report(report: Dict, filename: str) -> None:
+    """
+    Save a benchmark report to a JSON file.
+
+    Arguments:
+        report {Dict} -- The report, as returned by make_report().
+        filename {str} -- The path to the JSON file.
+    """
+    with open(filename, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+def load_report(filename: str) -> Dict:
+    """
+    Load a benchmark report from a JSON file.
+
+    Arguments:
+        filename {str} -- The path to the JSON file.
+
+    Returns:
+        Dict -- The report.
+    """
+    with open(filename) as report_file:
+        return json.load(report_file)
+
+
+def best_of(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """
+    Keep the lowest value of each metric over repeated runs, the least disturbed by noise.
+
+    Arguments:
+        runs {List[Dict[str, float]]} -- The metrics of each run.
+
+    Returns:
+        Dict[str, float] -- The lowest value of each metric.
+    """
+    return {metric: min(run[metric] for run in runs) for metric in runs[0]}
+
+
+def _metrics(report: Dict) -> Iterator[Tuple[Tuple[str, str], float]]:
+    """
+    Flatten the metrics of a report.
+
+    Arguments:
+        report {Dict} -- The report.
+
+    Returns:
+        Iterator[Tuple[Tuple[str, str], float]] -- ((case, metric), value) for each metric.
+    """
+    for result in report["results"]:
+        for metric, value in result["metrics"].items():
+            if isinstance(value, (int, float)):
+                yield (result["case"], metric), float(value)
+
+
+def compare_reports(
+    baseline: Dict, current: Dict, threshold: float = 0.2, floor: float = 0.05
+) -> List[Dict[str, Any]]:
+    """
+    Find the metrics that got worse between two runs of a benchmark.
+
+    Every metric is "lower is better": durations, latencies and memory usage.
+
+    Arguments:
+        baseline {Dict} -- The reference report.
+        current {Dict} -- The report to check.
+
+    Keyword Arguments:
+        threshold {float} -- Relative increase flagged as a regression (default: {0.2}).
+        floor {float} -- Baseline values below this are too noisy to compare (default: {0.05}).
+
+    Returns:
+        List[Dict[str, Any]] -- The regressions: case, metric, baseline and current values, and ratio.
+    """
+    reference = dict(_metrics(baseline))
+
+    regressions: List[Dict[str, Any]] = []
+    for (case, metric), value in _metrics(current):
+        before = reference.get((case, metric))
+        if before is None or before < floor:
+            continue
+
+        ratio = value / before
+        if ratio > 1 + threshold:
+            regressions.append(
+                {
+                    "case": case,
+                    "metric": metric,
+                    "baseline": before,
+                    "current": value,
+                    "ratio": ratio,
+                }
+            )
+
+    return regressions
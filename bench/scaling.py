@@ -0,0 +1,244 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bench.results import (
+    best_of,
+    compare_reports,
+    load_report,
+    make_report,
+    save_report,
+)
+from bench.synthetic import generate_library
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.metrics import metrics
+from src.autotracks.registry import make_scorer, make_strategy
+
+
+def peak_memory() -> Optional[float]:
+    """
+    Read the peak resident memory of the current process.
+
+    Returns:
+        Optional[float] -- Peak memory in MiB, or None where it cannot be read.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    # ru_maxrss is in KiB on Linux, in bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def measure(directory: str, strategies: List[str]) -> Dict[str, Any]:
+    """
+    Load a library and run strategies on it, timing each phase.
+
+    Runs in a fresh process for each library, so that peak memory is its own.
+
+    Arguments:
+        directory {str} -- The directory holding the library.
+        strategies {List[str]} -- The names of the strategies to run.
+
+    Returns:
+        Dict[str, Any] -- Durations in seconds and peak memory in MiB ("metrics"),
+        and the shape of the library ("info").
+    """
+    config = AutotracksConfig(
+        bpm_tag="bpm-tag", keyfinder_cli="keyfinder-cli", ffprobe="ffprobe"
+    )
+
+    metrics.reset()
+    start = time.perf_counter()
+    autotracks = Autotracks(config, [directory])
+    results: Dict[str, float] = {"load": time.perf_counter() - start}
+    for name, phase in metrics.report()["phases"].items():
+        results[f"load.{name}"] = phase["seconds"]
+
+    library = autotracks.library
+    info: Dict[str, Any] = {
+        "tracks": len(library.tracks),
+        "edges": sum(len(n) for n in library.neighbours.values()) // 2,
+        "components": len(library.components),
+    }
+
+    for name in strategies:
+        strategy = make_strategy(name, make_scorer("bybpm"))
+
+        start = time.perf_counter()
+        playlists = autotracks.generate_playlists(strategy)
+        results[f"{name}.generate"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        selected = autotracks.select_playlist(strategy, playlists)
+        results[f"{name}.select"] = time.perf_counter() - start
+
+        info[f"{name}.playlists"] = len(playlists)
+        info[f"{name}.selected"] = len(selected)
+
+    memory = peak_memory()
+    if memory is not None:
+        results["peak_memory_mib"] = memory
+
+    return {"metrics": results, "info": info}
+
+
+def run_case(
+    size: int,
+    strategies: List[str],
+    seed: int,
+    repeat: int = 1,
+    library_directory: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Generate a synthetic library of a given size, then measure it in a fresh process.
+
+    Arguments:
+        size {int} -- Number of tracks.
+        strategies {List[str]} -- The names of the strategies to run.
+        seed {int} -- Seed for the synthetic library.
+
+    Keyword Arguments:
+        repeat {int} -- Number of measures, keeping the best value of each metric (default: {1}).
+        library_directory {Optional[str]} -- Where the library is kept, else a temporary directory (default: {None}).
+
+    Returns:
+        Dict[str, Any] -- The case name, its metrics and info.
+    """
+    with tempfile.TemporaryDirectory() as temporary_directory:
+        directory = os.path.join(
+            library_directory or temporary_directory, f"library-{size}"
+        )
+        generate_library(directory, size, seed)
+
+        runs: List[Dict[str, Any]] = []
+        for _ in range(repeat):
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                runs.append(executor.submit(measure, directory, strategies).result())
+
+    return {
+        "case": f"size={size}",
+        "metrics": best_of([run["metrics"] for run in runs]),
+        "info": runs[0]["info"],
+    }
+
+
+def main() -> int:
+    # initialize argument parser
+    parser = argparse.ArgumentParser(
+        description="🎶 Measure how library loading and playlist generation scale with the library size"
+    )
+
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1000, 10000],
+        metavar="N",
+        help="Library sizes to measure (default: 100 1000 10000)",
+    )
+
+    parser.add_argument(
+        "--strategies",
+        nargs="+",
+        default=["dfs", "greedy", "cover"],
+        metavar="NAME",
+        help="Strategies to run on each library (default: dfs greedy cover)",
+    )
+
+    parser.add_argument(
+        "--dfs-max-size",
+        type=int,
+        default=300,
+        metavar="N",
+        help="Skip the exhaustive search on larger libraries (default: 300)",
+    )
+
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed for the synthetic libraries"
+    )
+
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Measure each library N times and keep the best values (default: 1)",
+    )
+
+    parser.add_argument(
+        "--library-dir",
+        metavar="DIRECTORY",
+        help="Keep the synthetic libraries in this directory",
+    )
+
+    parser.add_argument(
+        "--output",
+        metavar="FILENAME",
+        help="Where to save the results (default: scaling-<date>.json)",
+    )
+
+    parser.add_argument(
+        "--baseline",
+        metavar="FILENAME",
+        help="Compare the results with a previous run, and fail on regressions",
+    )
+
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Relative slowdown flagged as a regression (default: 0.2)",
+    )
+
+    args = parser.parse_args()
+
+    results: List[Dict[str, Any]] = []
+    for size in args.sizes:
+        strategies = [
+            name
+            for name in args.strategies
+            if name != "dfs" or size <= args.dfs_max_size
+        ]
+        result = run_case(size, strategies, args.seed, args.repeat, args.library_dir)
+        results.append(result)
+
+        print(f"{result['case']}: {result['info']}")
+        for metric, value in result["metrics"].items():
+            print(f"  {metric:>28}: {value:.4f}")
+
+    report = make_report("scaling", vars(args), results)
+    output = args.output or f"scaling-{datetime.now():%Y%m%d-%H%M%S}.json"
+    save_report(report, output)
+    print(f"Results saved to {output}")
+
+    if args.baseline:
+        regressions = compare_reports(
+            load_report(args.baseline), report, args.threshold
+        )
+        for regression in regressions:
+            print(
+                f"✘ Regression: {regression['case']} {regression['metric']} "
+                f"{regression['baseline']:.4f} → {regression['current']:.4f} "
+                f"(x{regression['ratio']:.2f})"
+            )
+
+        if regressions:
+            return 1
+
+    return os.EX_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
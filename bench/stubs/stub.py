@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Stand-in for bpm-tag, keyfinder-cli and ffprobe, dispatched on the name it is called by.
+
+Output is derived from the audio filename, so that a file always gets the same BPM, key
+and duration. The following environment variables shape the behaviour of the tools:
+
+    STUB_LATENCY       median time taken by a call, in seconds (default: 0)
+    STUB_JITTER        spread of the latency, as the sigma of a log-normal (default: 0)
+    STUB_FAILURE_RATE  probability that a call fails (default: 0)
+
+Each variable can be overridden for a single tool, e.g. STUB_KEYFINDER_CLI_LATENCY.
+"""
+
+import hashlib
+import math
+import os
+import random
+import sys
+import time
+
+OPEN_KEYS = [f"{number}{mode}" for mode in "md" for number in range(1, 13)]
+
+
+def setting(tool: str, name: str) -> float:
+    """
+    Read a behaviour setting, preferring the tool-specific variable.
+
+    Arguments:
+        tool {str} -- The tool name, e.g. "keyfinder-cli".
+        name {str} -- The setting name, e.g. "LATENCY".
+
+    Returns:
+        float -- The setting value.
+    """
+    variable = f"STUB_{tool.upper().replace('-', '_')}_{name}"
+    return float(os.environ.get(variable) or os.environ.get(f"STUB_{name}") or 0)
+
+
+def main() -> int:
+    tool = os.path.basename(sys.argv[0])
+    filename = sys.argv[-1]
+
+    latency = setting(tool, "LATENCY")
+    if latency > 0:
+        jitter = setting(tool, "JITTER")
+        time.sleep(latency * math.exp(random.gauss(0, jitter)))
+
+    if random.random() < setting(tool, "FAILURE_RATE"):
+        print(f"{tool}: could not decode {filename}", file=sys.stderr)
+        return 1
+
+    seed = int.from_bytes(hashlib.sha1(filename.encode()).digest()[:8], "big")
+    rng = random.Random(seed)
+
+    if tool == "bpm-tag":
+        # bpm-tag reports on stderr
+        print(f"{filename}: {rng.uniform(85, 175):.3f} BPM", file=sys.stderr)
+    elif tool == "keyfinder-cli":
+        print(rng.choice(OPEN_KEYS))
+    elif tool == "ffprobe":
+        print(f"{rng.uniform(120, 600):.6f}")
+    else:
+        print(f"Unknown tool: {tool}", file=sys.stderr)
+        return 2
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
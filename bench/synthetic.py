@@ -0,0 +1,81 @@
+import os
+import random
+
+from typing import List, Tuple
+
+from src.autotracks.key import KEYS
+
+# Relative frequency of each key, in KEYS order (minor keys, then major keys).
+# Dance music libraries lean towards minor keys, with A, C, F and G minor on top.
+KEY_WEIGHTS: Tuple[float, ...] = (
+    # Amin, Emin, Bmin, F#min, C#min, G#min, D#min, A#min, Fmin, Cmin, Gmin, Dmin
+    9.0, 5.0, 4.0, 4.5, 4.0, 3.5, 2.5, 4.0, 7.5, 7.0, 7.5, 6.0,
+    # Cmaj, Gmaj, Dmaj, Amaj, Emaj, Bmaj, F#maj, C#maj, G#maj, D#maj, A#maj, Fmaj
+    3.5, 3.0, 2.5, 2.0, 1.5, 1.0, 1.5, 2.5, 2.0, 1.5, 2.0, 3.0,
+)  # fmt: skip
+
+# Tempo families: (weight, mean BPM, standard deviation)
+BPM_FAMILIES: Tuple[Tuple[float, float, float], ...] = (
+    (0.40, 124.0, 3.0),  # house
+    (0.25, 131.0, 4.0),  # techno
+    (0.15, 172.0, 3.0),  # drum and bass
+    (0.10, 92.0, 6.0),  # hip-hop
+    (0.10, 110.0, 8.0),  # disco, downtempo
+)
+
+
+def synthetic_track(rng: random.Random) -> Tuple[float, str, float]:
+    """
+    Draw the metadata of a synthetic track.
+
+    Arguments:
+        rng {random.Random} -- The random number generator.
+
+    Returns:
+        Tuple[float, str, float] -- BPM, key in standard notation and duration in seconds.
+    """
+    (key,) = rng.choices(KEYS, weights=KEY_WEIGHTS)
+    ((_, mean, deviation),) = rng.choices(
+        BPM_FAMILIES, weights=[family[0] for family in BPM_FAMILIES]
+    )
+    bpm = round(rng.gauss(mean, deviation), 2)
+    duration = round(min(max(rng.gauss(360.0, 75.0), 90.0), 900.0), 2)
+
+    return bpm, key.standard, duration
+
+
+def generate_library(directory: str, size: int, seed: int = 0) -> List[str]:
+    """
+    Write a synthetic library of .meta files, as cached analysis results would be.
+
+    The .meta files have no audio file next to them, so they are loaded as they are
+    without any analysis.
+
+    Arguments:
+        directory {str} -- Where the .meta files are written, created if needed.
+        size {int} -- Number of tracks.
+
+    Keyword Arguments:
+        seed {int} -- Seed for the random number generator (default: {0}).
+
+    Returns:
+        List[str] -- The written filenames.
+    """
+    rng = random.Random(seed)
+    width = len(str(size))
+
+    os.makedirs(directory, exist_ok=True)
+
+    filenames: List[str] = []
+    for index in range(size):
+        bpm, key, duration = synthetic_track(rng)
+        filename = os.path.join(directory, f"track-{index:0{width}d}.flac.meta")
+
+        with open(filename, "w") as meta_file:
+            print(bpm, file=meta_file)
+            print(key, file=meta_file)
+            print(duration, file=meta_file)
+
+        filenames.append(filename)
+
+    return filenames
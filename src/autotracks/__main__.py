@@ -1,89 +1,788 @@
 import argparse
+import json
 import logging
 import os
 import sys
+import threading
 import time
 
-from typing import Set, Tuple
+from contextlib import nullcontext
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from src.autotracks.autotracks import Autotracks
-from src.autotracks.error import Error, NotEnoughTracksError
+from src.autotracks.autotracks import Autotracks, scan_paths
+from src.autotracks.config import (
+    add_logging_arguments,
+    load_config,
+    setup_logging,
+)
+from src.autotracks.error import (
+    Error,
+    InvalidJobError,
+    NotEnoughTracksError,
+    UnknownTrackError,
+)
+from src.autotracks.job import Job, load_jobs
+from src.autotracks.library import SCHEDULES, Library
+from src.autotracks.metrics import instrument
 from src.autotracks.playlist import Playlist
-from src.autotracks.scorer import Scorer
-from src.autotracks.scorers.bybpm import ByBPM
+from src.autotracks.registry import SCORERS, STRATEGIES
+from src.autotracks.server import PlaylistService, make_server
+from src.autotracks.shard import parse_shard, select_shard
+from src.autotracks.stats import library_stats
+from src.autotracks.store import ResultStore, merge_stores, write_store
 from src.autotracks.strategy import Strategy
-from src.autotracks.strategies.dfs import DFS
 from src.autotracks.track import Track
 
-from src.autotracks.config import config
 
+def parse_option(option: str) -> Tuple[str, Any]:
+    """
+    Parse a KEY=VALUE option, the value being decoded as JSON when possible.
 
-def main() -> int:
-    # initialize argument parser
-    parser = argparse.ArgumentParser(
-        description=(
-            "🎶 Generate automatic playlists according to your tracks' mood and groove"
+    Arguments:
+        option {str} -- The option, e.g. "max_expansions=5000".
+
+    Returns:
+        Tuple[str, Any] -- The option name and value.
+
+    Raises:
+        argparse.ArgumentTypeError -- If the option has no "=" sign.
+    """
+    name, separator, value = option.partition("=")
+    if not separator or not name:
+        raise argparse.ArgumentTypeError(f"Expected KEY=VALUE, got: {option}")
+
+    try:
+        return name, json.loads(value)
+    except json.JSONDecodeError:
+        return name, value
+
+
+def parse_shard_argument(spec: str) -> Tuple[int, int]:
+    """
+    Parse a --shard argument.
+
+    Arguments:
+        spec {str} -- The shard, e.g. "3/16".
+
+    Returns:
+        Tuple[int, int] -- The shard index, numbered from 0, and the number of shards.
+
+    Raises:
+        argparse.ArgumentTypeError -- If the shard is malformed.
+    """
+    try:
+        return parse_shard(spec)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(str(error))
+
+
+def make_job(args: argparse.Namespace) -> Job:
+    """
+    Describe the playlist generation requested on the command line.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        Job -- The strategy, scorer, anchors and options to generate with.
+
+    Raises:
+        InvalidJobError -- If duration options are given to another strategy.
+    """
+    strategy = args.strategy or ("duration" if args.duration is not None else "dfs")
+
+    strategy_options: Dict[str, Any] = dict(args.option)
+    if strategy == "duration":
+        if args.duration is not None:
+            strategy_options.setdefault("target", args.duration * 60)
+        tolerance = args.tolerance if args.tolerance is not None else 2.0
+        strategy_options.setdefault("tolerance", tolerance * 60)
+    elif args.duration is not None or args.tolerance is not None:
+        raise InvalidJobError(
+            f"--duration and --tolerance only apply to the duration strategy, not {strategy}"
         )
+    if args.budget is not None:
+        strategy_options["max_expansions"] = args.budget
+
+    return Job(
+        output=args.playlist_name,
+        strategy=strategy,
+        scorer=args.scorer,
+        first=args.first,
+        last=args.last,
+        all=args.all or strategy in ("cover", "kbest"),
+        strategy_options=strategy_options,
+        scorer_options=dict(args.scorer_option),
     )
 
-    parser.add_argument(
-        "playlist_name",
-        help="The filename for the resulting playlist, including extension",
+
+def log_errors(errors: Set[Tuple[str, Error]]) -> None:
+    """
+    Show files that produced errors during analysis.
+
+    Arguments:
+        errors {Set[Tuple[str, Error]]} -- Filenames and their errors.
+    """
+    for filename, error in errors:
+        logging.error(f"✘ Error with file: {filename} ({error.message})")
+
+
+def analyse(args: argparse.Namespace) -> int:
+    """
+    Analyse audio files and cache their metadata, without building the neighbour graph.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
+    filenames = scan_paths(args.filenames)
+
+    # shards and store paths are relative to the root of the scanned tree
+    root = os.path.commonpath(
+        [
+            os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+            for path in args.filenames
+        ]
     )
+    filenames = [os.path.abspath(filename) for filename in filenames]
 
-    parser.add_argument(
-        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    if args.shard:
+        index, count = args.shard
+        filenames = select_shard(filenames, root, index, count)
+        logging.info(f"Shard {index + 1}/{count}: {len(filenames)} files")
+
+    store = ResultStore(args.store, root) if args.store else None
+    if store is not None:
+        # resume: files already in the store are not analysed again
+        filenames = [filename for filename in filenames if filename not in store]
+
+    library = Library(
+        load_config(),
+        [],
+        workers=args.jobs,
+        store=store,
+        schedule=args.schedule,
+        retry_failed=args.retry_failed,
     )
 
-    args = parser.parse_args()
+    start: float = time.perf_counter()
+    with store if store is not None else nullcontext():
+        tracks, errors = library.load_metadata(filenames)
+    end: float = time.perf_counter()
+
+    logging.info(f"Elapsed time (seconds): {end - start}")
+    logging.info(f"Tracks with cached metadata: {len(tracks)}")
+    log_errors(set(errors.items()))
+
+    return os.EX_OK
 
-    # initialize library
-    autotracks = Autotracks(config, args.filenames)
 
+def merge(args: argparse.Namespace) -> int:
+    """
+    Combine result stores, then write them to .meta files or to a single store.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
     try:
-        # select scorer
-        # TODO: move to program argument
-        scorer: Scorer = ByBPM()
+        records = merge_stores(args.stores)
+    except OSError as error:
+        logging.error(f"Could not read result store ({error})")
+        return os.EX_NOINPUT
 
-        # select strategy
-        # TODO: move to program argument
-        strategy: Strategy = DFS(scorer)
+    logging.info(f"Merged records: {len(records)}")
 
-        # generate playlists and measure elapsed time
-        start: float = time.perf_counter()
-        playlists = autotracks.generate_playlists(strategy)
-        end: float = time.perf_counter()
-        elapsed = end - start
-        logging.info(f"Elapsed time (seconds): {elapsed}")
+    if args.output:
+        write_store(records, args.output)
+        return os.EX_OK
+
+    library = Library(load_config(), [])
+
+    written, skipped = 0, 0
+    for record in records.values():
+        track = record.to_track(args.root)
+
+        # a file that is missing, or was modified since its analysis, keeps its cache
+        try:
+            current = os.stat(track.filename).st_mtime_ns
+        except FileNotFoundError:
+            current = None
 
-        # select playlist
-        selected: Playlist = autotracks.select_playlist(strategy, playlists)
+        if current != record.mtime_ns:
+            logging.warning(f"⚠ Skipping missing or modified file: {track.filename}")
+            skipped += 1
+            continue
 
-        # display playlist score
-        playlist_score: float = autotracks.score_playlist(scorer, selected)
-        logging.info(f"Playlist score: {playlist_score}")
+        library.write_metadata(track)
+        written += 1
 
-        # write selected playlist to file
-        autotracks.write_playlist(selected, args.playlist_name)
+    logging.info(f"Metadata files written: {written} (skipped: {skipped})")
 
-        # show library tracks that remain unused in the selected playlist
-        unused: Set[Track] = autotracks.get_unused_tracks(selected)
-        for track in unused:
-            logging.warning(
-                f"⚠ Unused track: {track.filename} ({track.metadata.key} @ {round(track.metadata.bpm)})"
-            )
+    return os.EX_OK if not skipped else os.EX_DATAERR
+
+
+def generate(args: argparse.Namespace) -> int:
+    """
+    Generate and write playlists; only "run" analyses files without cached metadata.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
+    try:
+        job = make_job(args)
+    except InvalidJobError as error:
+        logging.error(error.message)
+        return os.EX_USAGE
+
+    def write_preliminary(autotracks: Autotracks) -> None:
+        # a first playlist from cached metadata, while new files are analysed
+        try:
+            filenames = autotracks.run_job(replace(job, output=args.preliminary))
+            logging.info(f"Preliminary playlists written: {', '.join(filenames)}")
+        except Error as error:
+            logging.warning(f"⚠ No preliminary playlist ({error.message})")
+
+    autotracks = Autotracks(
+        load_config(),
+        args.filenames,
+        args.snapshot,
+        analyse=args.command == "run",
+        on_ready=write_preliminary if args.preliminary else None,
+        schedule=args.schedule,
+        retry_failed=args.retry_failed,
+    )
+
+    try:
+        strategy = autotracks.make_strategy(job)
+        write_playlists(autotracks, strategy, job)
+
+        if args.watch:
+            watch(autotracks, strategy, job, args)
     except NotEnoughTracksError as error:
         # can't work with that
         logging.error(error.message)
         return os.EX_DATAERR
+    except (InvalidJobError, UnknownTrackError) as error:
+        logging.error(error.message)
+        return os.EX_USAGE
     finally:
-        # show files that produced errors during analysis
-        errors: Set[Tuple[str, Error]] = autotracks.get_errors()
-        for filename, error in errors:
-            logging.error(f"✘ Error with file: {filename} ({error.message})")
+        log_errors(autotracks.get_errors())
 
     return os.EX_OK
 
 
+def batch(args: argparse.Namespace) -> int:
+    """
+    Run the jobs of a job file against a single library load.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
+    try:
+        jobs: List[Job] = load_jobs(args.jobs_filename)
+    except InvalidJobError as error:
+        logging.error(error.message)
+        return os.EX_USAGE
+
+    # initialize library once for every job
+    autotracks = Autotracks(
+        load_config(),
+        args.filenames,
+        args.snapshot,
+        schedule=args.schedule,
+        retry_failed=args.retry_failed,
+    )
+
+    results: List[List[str]] = []
+    try:
+        start: float = time.perf_counter()
+        results = autotracks.run_jobs(jobs)
+        end: float = time.perf_counter()
+        logging.info(f"Elapsed time (seconds): {end - start}")
+
+        for job, filenames in zip(jobs, results):
+            for filename in filenames:
+                logging.info(f"✔ {job.strategy}/{job.scorer}: {filename}")
+    finally:
+        log_errors(autotracks.get_errors())
+
+    return os.EX_OK if all(results) else os.EX_DATAERR
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Keep the library loaded and answer playlist requests over HTTP.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
+    # initialize library once for every request
+    service = PlaylistService(
+        Autotracks(
+            load_config(),
+            args.filenames,
+            args.snapshot,
+            schedule=args.schedule,
+            retry_failed=args.retry_failed,
+        )
+    )
+
+    if args.watch:
+        from src.autotracks.watch import LibraryWatcher, make_watcher
+
+        watcher = LibraryWatcher(
+            service.autotracks.library,
+            make_watcher(args.filenames),
+            debounce=args.debounce,
+            lock=service.lock,
+        )
+        threading.Thread(target=watcher.run, daemon=True).start()
+
+    server = make_server(service, (args.host, args.port), args.socket)
+
+    where = args.socket or f"{args.host}:{args.port}"
+    logging.info(f"Serving playlists on {where}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return os.EX_OK
+
+
+def stats(args: argparse.Namespace) -> int:
+    """
+    Describe the library built from cached metadata.
+
+    Arguments:
+        args {argparse.Namespace} -- The program arguments.
+
+    Returns:
+        int -- The exit status.
+    """
+    library = Library(load_config(), scan_paths(args.filenames), analyse=False)
+    summary = library_stats(library)
+
+    print(f"Tracks: {summary.tracks}")
+    print(f"Errors: {summary.errors}")
+    print("Keys:")
+    for key, count in summary.keys.items():
+        print(f"  {key:>5}: {count}")
+    print(f"Neighbour relationships: {summary.edges}")
+    print(f"Graph density: {summary.density:.3f}")
+    print(f"Components: {', '.join(map(str, summary.components))}")
+    print(f"Search pairs (dfs): {summary.search_pairs}")
+    print(f"Scored transitions (dfs): {summary.search_transitions}")
+
+    return os.EX_OK
+
+
+def write_playlists(autotracks: Autotracks, strategy: Strategy, job: Job) -> None:
+    """
+    Generate playlists with a strategy, then write the selected ones.
+
+    Arguments:
+        autotracks {Autotracks} -- The loaded library.
+        strategy {Strategy} -- The strategy to generate playlists with.
+        job {Job} -- The output filename, and whether every playlist is written.
+    """
+    # generate playlists and measure elapsed time
+    start: float = time.perf_counter()
+    playlists = autotracks.generate_playlists(strategy)
+    end: float = time.perf_counter()
+    elapsed = end - start
+    logging.info(f"Elapsed time (seconds): {elapsed}")
+
+    if job.all:
+        # e.g. every track belongs to one of the cover playlists, write them all
+        filenames = autotracks.write_playlists(playlists, job.output)
+        logging.info(f"Playlists written: {len(filenames)}")
+
+        return
+
+    # report the best playlist of each connected component
+    for index, best in enumerate(
+        autotracks.select_component_playlists(strategy, playlists), start=1
+    ):
+        logging.info(
+            f"Component {index}: {len(best)} tracks (score: {autotracks.score_playlist(strategy.scorer, best)})"
+        )
+
+    # select playlist
+    selected: Playlist = autotracks.select_playlist(strategy, playlists)
+
+    # display playlist score
+    playlist_score: float = autotracks.score_playlist(strategy.scorer, selected)
+    logging.info(f"Playlist score: {playlist_score}")
+
+    # write selected playlist to file
+    autotracks.write_playlist(selected, job.output)
+
+    # show library tracks that remain unused in the selected playlist
+    unused: Set[Track] = autotracks.get_unused_tracks(selected)
+    for track in unused:
+        logging.warning(
+            f"⚠ Unused track: {track.filename} ({track.metadata.key} @ {round(track.metadata.bpm)})"
+        )
+
+
+def watch(
+    autotracks: Autotracks, strategy: Strategy, job: Job, args: argparse.Namespace
+) -> None:
+    """
+    Keep the library up to date with its files and write the playlist again on changes.
+
+    Arguments:
+        autotracks {Autotracks} -- The loaded library.
+        strategy {Strategy} -- The strategy to generate playlists with.
+        job {Job} -- The output filename, and whether every playlist is written.
+        args {argparse.Namespace} -- The program arguments.
+    """
+
+    from src.autotracks.watch import LibraryWatcher, make_watcher
+
+    def regenerate() -> None:
+        try:
+            write_playlists(autotracks, strategy, job)
+        except NotEnoughTracksError as error:
+            logging.error(error.message)
+
+    watcher = LibraryWatcher(
+        autotracks.library,
+        make_watcher(args.filenames),
+        debounce=args.debounce,
+        on_change=regenerate,
+    )
+    logging.info("Watching for file changes, press Ctrl+C to stop")
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def add_instrumentation_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments that measure where time and memory go.
+
+    Arguments:
+        parser {argparse.ArgumentParser} -- The command parser.
+    """
+    parser.add_argument(
+        "--metrics-out",
+        metavar="FILENAME",
+        help="Write the duration of each phase and event counters to this JSON file",
+    )
+
+    parser.add_argument(
+        "--profile",
+        metavar="FILENAME",
+        help="Dump cProfile statistics of the main thread to this file",
+    )
+
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Add peak memory usage and top allocation sites to the metrics",
+    )
+
+
+def add_analysis_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the options of audio analysis to a command parser.
+
+    Arguments:
+        parser {argparse.ArgumentParser} -- The command parser.
+    """
+    parser.add_argument(
+        "--schedule",
+        choices=SCHEDULES,
+        default="longest",
+        help="Analyse the largest files first for throughput, the smallest first for early results, or in scan order (default: longest)",
+    )
+
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Analyse again files that failed before, once their backoff has elapsed",
+    )
+
+
+def add_generation_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments shared by the commands that generate playlists.
+
+    Arguments:
+        parser {argparse.ArgumentParser} -- The command parser.
+    """
+    parser.add_argument(
+        "playlist_name",
+        help="The filename for the resulting playlist, including extension",
+    )
+
+    parser.add_argument(
+        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    )
+
+    parser.add_argument(
+        "--strategy",
+        choices=list(STRATEGIES),
+        help="How playlists are searched (default: dfs, or duration with --duration)",
+    )
+
+    parser.add_argument(
+        "--scorer",
+        choices=list(SCORERS),
+        default="bybpm",
+        help="How transitions are scored (default: bybpm)",
+    )
+
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Write every generated playlist to numbered files (always on with the cover and kbest strategies)",
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        metavar="MINUTES",
+        help="Build a playlist whose total length matches this duration (duration strategy only)",
+    )
+
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        metavar="MINUTES",
+        help="Accepted distance to the target duration, with the duration strategy (default: 2)",
+    )
+
+    parser.add_argument(
+        "--budget",
+        type=int,
+        metavar="N",
+        help="Maximum number of search expansions from each first track (duration) or for each set (kbest)",
+    )
+
+    parser.add_argument(
+        "--option",
+        type=parse_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Extra strategy option, the value being read as JSON if possible",
+    )
+
+    parser.add_argument(
+        "--scorer-option",
+        type=parse_option,
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Scorer option, the value being read as JSON if possible",
+    )
+
+    parser.add_argument(
+        "--first",
+        metavar="FILENAME",
+        help="Open the playlist with this track",
+    )
+
+    parser.add_argument(
+        "--last",
+        metavar="FILENAME",
+        help="Close the playlist with this track",
+    )
+
+    parser.add_argument(
+        "--snapshot",
+        metavar="FILENAME",
+        help="Load the library from this binary snapshot if it is up to date, else save it there",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running, update the library when files change and write the playlist again",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Quiet time before file changes are applied in watch mode (default: 1)",
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # initialize argument parser
+    parser = argparse.ArgumentParser(
+        description=(
+            "🎶 Generate automatic playlists according to your tracks' mood and groove"
+        )
+    )
+    add_logging_arguments(parser)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyse_parser = commands.add_parser(
+        "analyse", help="Analyse audio files and cache their metadata"
+    )
+    analyse_parser.add_argument(
+        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    )
+    analyse_parser.add_argument(
+        "--jobs",
+        type=int,
+        metavar="N",
+        help="Number of files analysed at once (default: one per CPU)",
+    )
+    analyse_parser.add_argument(
+        "--shard",
+        type=parse_shard_argument,
+        metavar="I/N",
+        help="Only analyse the I-th of N slices of the files, split by path",
+    )
+    analyse_parser.add_argument(
+        "--store",
+        metavar="FILENAME",
+        help="Append results to this result store instead of writing .meta files",
+    )
+    add_analysis_arguments(analyse_parser)
+    add_instrumentation_arguments(analyse_parser)
+    analyse_parser.set_defaults(handler=analyse)
+
+    merge_parser = commands.add_parser(
+        "merge", help="Combine result stores into .meta files, newest analysis winning"
+    )
+    merge_parser.add_argument(
+        "stores", nargs="+", help="The result stores written by analyse --store"
+    )
+    merge_parser.add_argument(
+        "--root",
+        default=".",
+        help="The directory the stores were analysed from, on this machine (default: .)",
+    )
+    merge_parser.add_argument(
+        "--output",
+        metavar="FILENAME",
+        help="Write a single merged store instead of .meta files",
+    )
+    add_instrumentation_arguments(merge_parser)
+    merge_parser.set_defaults(handler=merge)
+
+    generate_parser = commands.add_parser(
+        "generate", help="Generate playlists from cached metadata only"
+    )
+    add_generation_arguments(generate_parser)
+    add_instrumentation_arguments(generate_parser)
+    generate_parser.set_defaults(
+        handler=generate, preliminary=None, schedule="none", retry_failed=False
+    )
+
+    run_parser = commands.add_parser(
+        "run", help="Analyse new files, then generate playlists"
+    )
+    add_generation_arguments(run_parser)
+    run_parser.add_argument(
+        "--preliminary",
+        metavar="FILENAME",
+        help="Write a first playlist from cached metadata while new files are analysed",
+    )
+    add_analysis_arguments(run_parser)
+    add_instrumentation_arguments(run_parser)
+    run_parser.set_defaults(handler=generate)
+
+    batch_parser = commands.add_parser(
+        "batch", help="Generate several playlists from one library load"
+    )
+    batch_parser.add_argument(
+        "jobs_filename",
+        help="A JSON file listing the jobs (output, strategy, scorer, anchors and options)",
+    )
+    batch_parser.add_argument(
+        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    )
+    batch_parser.add_argument(
+        "--snapshot",
+        metavar="FILENAME",
+        help="Load the library from this binary snapshot if it is up to date, else save it there",
+    )
+    add_analysis_arguments(batch_parser)
+    add_instrumentation_arguments(batch_parser)
+    batch_parser.set_defaults(handler=batch)
+
+    serve_parser = commands.add_parser(
+        "serve", help="Keep the library loaded and serve playlists as JSON over HTTP"
+    )
+    serve_parser.add_argument(
+        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    )
+    serve_parser.add_argument(
+        "--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1)"
+    )
+    serve_parser.add_argument(
+        "--port", type=int, default=8000, help="Port to listen on (default: 8000)"
+    )
+    serve_parser.add_argument(
+        "--socket",
+        metavar="FILENAME",
+        help="Listen on this Unix socket instead of a TCP port",
+    )
+    serve_parser.add_argument(
+        "--snapshot",
+        metavar="FILENAME",
+        help="Load the library from this binary snapshot if it is up to date, else save it there",
+    )
+    serve_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Update the library in the background when files change",
+    )
+    serve_parser.add_argument(
+        "--debounce",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="Quiet time before file changes are applied in watch mode (default: 1)",
+    )
+    add_analysis_arguments(serve_parser)
+    add_instrumentation_arguments(serve_parser)
+    serve_parser.set_defaults(handler=serve)
+
+    stats_parser = commands.add_parser(
+        "stats", help="Describe the library and estimate the search cost"
+    )
+    stats_parser.add_argument(
+        "filenames", nargs="+", help="A list of paths to explore for audio tracks"
+    )
+    add_instrumentation_arguments(stats_parser)
+    stats_parser.set_defaults(handler=stats)
+
+    args = parser.parse_args(argv)
+    setup_logging(level=args.log_level, trace=args.trace)
+
+    with instrument(args.metrics_out, args.profile, args.trace_memory):
+        return args.handler(args)
+
+
 if __name__ == "__main__":
     sys.exit(main())
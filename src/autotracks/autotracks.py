@@ -1,23 +1,33 @@
 import logging
 import os
 
-from typing import List, Set, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 from src.autotracks.config import AutotracksConfig
 from src.autotracks.error import Error, NotEnoughTracksError
+from src.autotracks.job import Job
 from src.autotracks.library import Library
+from src.autotracks.metrics import metrics
 from src.autotracks.playlist import Playlist
+from src.autotracks.registry import make_scorer, make_strategy
+from src.autotracks.repair import Repair
 from src.autotracks.scorer import Scorer
 from src.autotracks.strategy import Strategy
 from src.autotracks.track import Track
 
 
-class Autotracks:
-    library: Library
+def scan_paths(from_path: List[str]) -> List[str]:
+    """
+    List the files to load into a library.
+
+    Arguments:
+        from_path {List[str]} -- Directories, whose files are listed, and/or files.
 
-    def __init__(self, config: AutotracksConfig, from_path: List[str]):
-        # recursively try to add all files from the given path to the library
-        track_filenames: List[str] = []
+    Returns:
+        List[str] -- The filenames to load.
+    """
+    track_filenames: List[str] = []
+    with metrics.phase("walk"):
         for item in from_path:
             if os.path.isdir(item):
                 for path, _, filenames in os.walk(item):
@@ -29,7 +39,40 @@ class Autotracks:
             else:
                 track_filenames.append(item)
 
-        self.library = Library(config, track_filenames)
+    metrics.count("files.scanned", len(track_filenames))
+
+    return track_filenames
+
+
+class Autotracks:
+    library: Library
+
+    def __init__(
+        self,
+        config: AutotracksConfig,
+        from_path: List[str],
+        snapshot_filename: Optional[str] = None,
+        analyse: bool = True,
+        on_ready: Optional[Callable[["Autotracks"], None]] = None,
+        schedule: str = "longest",
+        retry_failed: bool = False,
+    ):
+        def ready(library: Library) -> None:
+            # the library is usable before its constructor returns
+            self.library = library
+            if on_ready is not None:
+                on_ready(self)
+
+        # try to add all files from the given paths to the library
+        self.library = Library(
+            config,
+            scan_paths(from_path),
+            snapshot_filename,
+            analyse=analyse,
+            on_ready=ready if on_ready is not None else None,
+            schedule=schedule,
+            retry_failed=retry_failed,
+        )
 
     def generate_playlists(self, strategy: Strategy) -> List[Playlist]:
         """
@@ -47,7 +90,15 @@ class Autotracks:
                 f"Less than two tracks could be added to the library."
             )
 
-        return strategy.generate_playlists(self.library)
+        with metrics.phase("prepare"):
+            strategy.scorer.prepare(self.library)
+
+        with metrics.phase("search"):
+            playlists = strategy.generate_playlists(self.library)
+
+        metrics.count("playlists.generated", len(playlists))
+
+        return playlists
 
     def select_playlist(
         self, strategy: Strategy, playlists: List[Playlist]
@@ -63,7 +114,106 @@ class Autotracks:
             Playlist -- A final playlist according to the strategy's criteria.
         """
 
-        return strategy.select_playlist(playlists)
+        with metrics.phase("select"):
+            return strategy.select_playlist(playlists)
+
+    def select_component_playlists(
+        self, strategy: Strategy, playlists: List[Playlist]
+    ) -> List[Playlist]:
+        """
+        Apply a given strategy to the playlists of each connected component of the library.
+
+        Arguments:
+            strategy {Strategy} -- A concrete class that implements the strategy inferance.
+            playlists {List[Playlist]} -- A set of previously generated valid playlists.
+
+        Returns:
+            List[Playlist] -- The best playlist of each component that holds at least one
+            playlist, following the library's component order.
+        """
+
+        by_component: Dict[int, List[Playlist]] = {}
+        for playlist in playlists:
+            if playlist.is_empty():
+                continue
+
+            component = self.library.component_of(playlist.tracks[0].filename)
+            by_component.setdefault(component, []).append(playlist)
+
+        return [
+            strategy.select_playlist(by_component[component])
+            for component in sorted(by_component)
+        ]
+
+    def run_jobs(self, jobs: List[Job]) -> List[List[str]]:
+        """
+        Run several generation jobs against the already loaded library, one after the other.
+
+        The library and its neighbour graph are loaded once and shared by every job; each
+        job gets its own scorer and strategy instances. A job that fails, for any reason,
+        is logged and skipped without stopping the others.
+
+        Arguments:
+            jobs {List[Job]} -- The jobs to run.
+
+        Returns:
+            List[List[str]] -- For each job, the filenames of the playlists it wrote.
+        """
+
+        results: List[List[str]] = []
+        for job in jobs:
+            try:
+                results.append(self.run_job(job))
+            except Error as error:
+                logging.error(f"Job failed: {job.output} ({error.message})")
+                results.append([])
+            except Exception:
+                logging.exception(f"Job failed: {job.output}")
+                results.append([])
+
+        return results
+
+    def make_strategy(self, job: Job) -> Strategy:
+        """
+        Build the scorer and strategy described by a job, resolving its anchors in the library.
+
+        Arguments:
+            job {Job} -- The job to build a strategy for.
+
+        Returns:
+            Strategy -- A new strategy, with its own scorer.
+        """
+
+        scorer = make_scorer(job.scorer, job.scorer_options)
+
+        return make_strategy(
+            job.strategy,
+            scorer,
+            first=self.library.find_track(job.first) if job.first else None,
+            last=self.library.find_track(job.last) if job.last else None,
+            options=job.strategy_options,
+        )
+
+    def run_job(self, job: Job) -> List[str]:
+        """
+        Generate, select and write the playlists of a single job.
+
+        Arguments:
+            job {Job} -- The job to run.
+
+        Returns:
+            List[str] -- The filenames of the playlists that were written.
+        """
+
+        strategy = self.make_strategy(job)
+        playlists = self.generate_playlists(strategy)
+
+        if job.all:
+            return self.write_playlists(playlists, job.output)
+
+        selected = self.select_playlist(strategy, playlists)
+
+        return [job.output] if self.write_playlist(selected, job.output) else []
 
     def score_playlist(self, scorer: Scorer, playlist: Playlist) -> float:
         """
@@ -73,19 +223,25 @@ class Autotracks:
             scorer {Scorer} -- The scorer to use for evaluating transitions.
             playlist {Playlist} -- A previously generated valid playlist.
         """
-        return scorer.score_playlist(playlist)
+        return playlist.score(scorer)
 
-    def write_playlist(self, playlist: Playlist, playlist_filename: str) -> None:
+    def write_playlist(self, playlist: Playlist, playlist_filename: str) -> bool:
         """
         Save an Autotracks playlist to an m3u file, containing each track's filename and metadata.
 
         Arguments:
             playlist {Playlist} -- A playlist selected for export.
             playlist_filename {str} -- The finename for the m3u file.
+
+        Returns:
+            bool -- True if the playlist was written, False if the file could not be written.
         """
 
         try:
-            with open(playlist_filename, mode="w") as playlist_file:
+            with (
+                metrics.phase("write"),
+                open(playlist_filename, mode="w") as playlist_file,
+            ):
                 for track in playlist.tracks:
                     print(
                         f"# {track.metadata.key} @ {round(track.metadata.bpm)}",
@@ -94,6 +250,94 @@ class Autotracks:
                     print(f"{track.filename}", file=playlist_file)
         except OSError:
             logging.error(f"Could not open playlist file: {playlist_filename}")
+            return False
+
+        return True
+
+    def write_playlists(
+        self, playlists: List[Playlist], playlist_filename: str
+    ) -> List[str]:
+        """
+        Save several playlists to numbered m3u files derived from a single filename.
+
+        For example, "set.m3u" becomes "set-01.m3u", "set-02.m3u", and so on.
+
+        Arguments:
+            playlists {List[Playlist]} -- Playlists selected for export.
+            playlist_filename {str} -- The base filename for the m3u files.
+
+        Returns:
+            List[str] -- The filenames the playlists were written to, leaving out the ones that could not be written.
+        """
+
+        root, extension = os.path.splitext(playlist_filename)
+        width = max(2, len(str(len(playlists))))
+
+        filenames: List[str] = []
+        for index, playlist in enumerate(playlists, start=1):
+            filename = f"{root}-{index:0{width}d}{extension}"
+            if self.write_playlist(playlist, filename):
+                filenames.append(filename)
+
+        return filenames
+
+    def read_playlist(self, playlist_filename: str) -> Playlist:
+        """
+        Load an m3u file previously written by Autotracks.
+
+        Entries that are not part of the library anymore are skipped.
+
+        Arguments:
+            playlist_filename {str} -- The filename for the m3u file.
+
+        Returns:
+            Playlist -- The tracks of the playlist that are still in the library.
+        """
+
+        with open(playlist_filename) as playlist_file:
+            filenames = [
+                line.strip()
+                for line in playlist_file
+                if line.strip() and not line.startswith("#")
+            ]
+
+        return Playlist(
+            [
+                self.library.tracks[filename]
+                for filename in filenames
+                if filename in self.library.tracks
+            ]
+        )
+
+    def repair_playlist(
+        self,
+        scorer: Scorer,
+        playlist_filename: str,
+        added: List[str],
+        removed: List[str],
+    ) -> Playlist:
+        """
+        Update the library with a small delta and repair a previously written playlist
+        accordingly, instead of generating playlists from scratch.
+
+        Arguments:
+            scorer {Scorer} -- The scorer to use for evaluating transitions.
+            playlist_filename {str} -- The m3u file of the playlist to repair.
+            added {List[str]} -- Audio and/or metadata filenames added to the library.
+            removed {List[str]} -- Audio filenames removed from the library.
+
+        Returns:
+            Playlist -- The repaired playlist.
+        """
+
+        # read the playlist before the removed tracks leave the library
+        playlist = self.read_playlist(playlist_filename)
+
+        self.library.remove_tracks(removed)
+        new_tracks = self.library.add_tracks(added)
+        scorer.prepare(self.library)
+
+        return Repair(scorer).repair(self.library, playlist, list(new_tracks.values()))
 
     def get_unused_tracks(self, playlist: Playlist) -> Set[Track]:
         """
@@ -1,51 +1,156 @@
+import argparse
+import atexit
 import logging
 import os
+import queue
 import sys
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
 
-from dotenv import dotenv_values
+from src.autotracks.key import DEFAULT_MIXING_RULES
+
+# logger for per-pair search traces, only enabled on demand
+TRACE_LOGGER = "autotracks.trace"
+
+# background thread writing log records, once logging is set up
+_listener: Optional[QueueListener] = None
 
 
 @dataclass
 class AutotracksConfig:
     bpm_tag: str
     keyfinder_cli: str
+    ffprobe: str
+    mixing_rules: Tuple[str, ...] = DEFAULT_MIXING_RULES
+
+
+def load_config(env_filename: str = ".env") -> AutotracksConfig:
+    """
+    Read the configuration from the environment.
+
+    Environment variables take precedence over the .env file, which takes precedence
+    over default values.
+
+    Keyword Arguments:
+        env_filename {str} -- The path to the .env file (default: {".env"}).
+
+    Returns:
+        AutotracksConfig -- The configuration.
+    """
+    from dotenv import dotenv_values
+
+    default_values = {
+        "BPM_TAG": "bpm-tag",
+        "KEYFINDER_CLI": "keyfinder-cli",
+        "FFPROBE": "ffprobe",
+        "MIXING_RULES": ",".join(DEFAULT_MIXING_RULES),
+    }
+    env_values: Dict[str, str | None] = {
+        **dotenv_values(env_filename),
+        **{k: os.environ[k] for k in default_values if k in os.environ},
+    }
+
+    return AutotracksConfig(
+        bpm_tag=env_values.get("BPM_TAG") or default_values["BPM_TAG"],
+        keyfinder_cli=env_values.get("KEYFINDER_CLI")
+        or default_values["KEYFINDER_CLI"],
+        ffprobe=env_values.get("FFPROBE") or default_values["FFPROBE"],
+        mixing_rules=tuple(
+            rule.strip()
+            for rule in (
+                env_values.get("MIXING_RULES") or default_values["MIXING_RULES"]
+            ).split(",")
+            if rule.strip()
+        ),
+    )
+
+
+def add_logging_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments that configure logging, as passed to setup_logging().
+
+    Arguments:
+        parser {argparse.ArgumentParser} -- The program parser.
+    """
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default="INFO",
+        help="Level of the records written to the log file (default: INFO)",
+    )
+
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="Write a trace of every (first, last) pair searched to the log file",
+    )
+
+
+def setup_logging(
+    log_directory: str = "log", level: str = "INFO", trace: bool = False
+) -> None:
+    """
+    Log to the console, and to a timestamped file in a log directory.
+
+    Handlers run in a background thread behind a queue, so that logging calls only
+    enqueue records and never wait for the disk. Calling this function again replaces
+    the previous configuration.
+
+    Keyword Arguments:
+        log_directory {str} -- Where log files are written (default: {"log"}).
+        level {str} -- Level of the records written to the log file (default: {"INFO"}).
+        trace {bool} -- Also write per-pair search traces to the log file (default: {False}).
+    """
+    global _listener
+
+    file_level = logging.DEBUG if trace else logging.getLevelName(level)
+
+    os.makedirs(log_directory, exist_ok=True)
+
+    run_time = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+
+    formatter = logging.Formatter("%(levelname)7s [%(funcName)18s] %(message)s")
+    file_handler = logging.FileHandler(os.path.join(log_directory, f"{run_time}.log"))
+    file_handler.setLevel(file_level)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    if _listener is not None:
+        _listener.stop()
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    # records below every handler's level are dropped before being formatted
+    root.setLevel(min(logging.getLevelName(level), logging.INFO))
+    logging.getLogger(TRACE_LOGGER).setLevel(
+        logging.DEBUG if trace else logging.WARNING
+    )
+
+    _listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
 
+def stop_logging() -> None:
+    """
+    Write the records still queued and stop the logging thread.
+    """
+    global _listener
 
-# load environment variables
-# environment variables > .env file > default values
-default_values = {
-    "BPM_TAG": "bpm-tag",
-    "KEYFINDER_CLI": "keyfinder-cli",
-}
-env_values: Dict[str, str | None] = {
-    # **default_values,
-    **dotenv_values(".env"),
-    **{k: os.environ[k] for k in default_values if k in os.environ},
-}
-
-# initialize config
-config = AutotracksConfig(
-    bpm_tag=env_values.get("BPM_TAG") or default_values["BPM_TAG"],
-    keyfinder_cli=env_values.get("KEYFINDER_CLI") or default_values["KEYFINDER_CLI"],
-)
-
-# initialize logger
-if not os.path.exists("log"):
-    os.makedirs("log")
-
-run_time = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
-
-file_handler = logging.FileHandler(f"log/{run_time}.log")
-file_handler.setLevel(logging.DEBUG)
-console_handler = logging.StreamHandler(sys.stdout)
-console_handler.setLevel(logging.INFO)
-
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(levelname)7s [%(funcName)18s] %(message)s",
-    handlers=[file_handler, console_handler],
-)
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -20,3 +20,13 @@ class MalformedMetaFileError(Error):
 class NotEnoughTracksError(Error):
     def __init__(self, message: str):
         self.message = message
+
+
+class UnknownTrackError(Error):
+    def __init__(self, message: str):
+        self.message = message
+
+
+class InvalidJobError(Error):
+    def __init__(self, message: str):
+        self.message = message
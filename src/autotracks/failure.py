@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from dataclasses import asdict, dataclass
+from typing import List, Optional
+
+# time before a failed file is analysed again with --retry-failed, doubled on each failure
+RETRY_BACKOFF = 3600.0
+RETRY_BACKOFF_MAX = 7 * 24 * 3600.0
+
+# extension of the failure record written next to an audio file
+FAILURE_SUFFIX = ".fail"
+
+
+@dataclass
+class FailureRecord:
+    """
+    Failed analysis of an audio file, kept next to it so that later runs skip it.
+
+    Attributes:
+        size {int} -- Size of the audio file when it failed.
+        mtime_ns {int} -- Modification time of the audio file when it failed.
+        tools {str} -- Fingerprint of the analysis tools that failed.
+        attempts {int} -- Number of failed analyses of this version of the file.
+        failed_at {float} -- When the last analysis failed, as a Unix timestamp.
+        message {str} -- The error message.
+    """
+
+    size: int
+    mtime_ns: int
+    tools: str
+    attempts: int
+    failed_at: float
+    message: str
+
+    def matches(self, audio_filename: str, tools: str) -> bool:
+        """
+        Check that the record is about the current file and tools.
+
+        Arguments:
+            audio_filename {str} -- The path to the audio file.
+            tools {str} -- Fingerprint of the current analysis tools.
+
+        Returns:
+            bool -- True if neither the file nor the tools changed since the failure.
+        """
+        try:
+            stat = os.stat(audio_filename)
+        except OSError:
+            return False
+
+        return (
+            stat.st_size == self.size
+            and stat.st_mtime_ns == self.mtime_ns
+            and tools == self.tools
+        )
+
+    def retry_at(self) -> float:
+        """
+        Find when the file may be analysed again.
+
+        Returns:
+            float -- The Unix timestamp after which a retry is allowed.
+        """
+        backoff = min(RETRY_BACKOFF * 2 ** (self.attempts - 1), RETRY_BACKOFF_MAX)
+
+        return self.failed_at + backoff
+
+
+def failure_filename(audio_filename: str) -> str:
+    """
+    Generate the failure record filename for an audio file.
+
+    Arguments:
+        audio_filename {str} -- Path to the audio file.
+
+    Returns:
+        str -- Path to the corresponding ".fail" file.
+    """
+    return f"{audio_filename}{FAILURE_SUFFIX}"
+
+
+def read_failure(audio_filename: str) -> Optional[FailureRecord]:
+    """
+    Read the failure record of an audio file.
+
+    Arguments:
+        audio_filename {str} -- Path to the audio file.
+
+    Returns:
+        Optional[FailureRecord] -- The record, or None if there is none or it is unreadable.
+    """
+    try:
+        with open(failure_filename(audio_filename)) as failure_file:
+            return FailureRecord(**json.load(failure_file))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def write_failure(audio_filename: str, tools: str, message: str) -> FailureRecord:
+    """
+    Record a failed analysis next to an audio file.
+
+    A previous failure of the same file with the same tools counts as an attempt.
+
+    Arguments:
+        audio_filename {str} -- Path to the audio file.
+        tools {str} -- Fingerprint of the analysis tools.
+        message {str} -- The error message.
+
+    Returns:
+        FailureRecord -- The written record.
+
+    Raises:
+        OSError -- If the file cannot be read or the record cannot be written.
+    """
+    stat = os.stat(audio_filename)
+    previous = read_failure(audio_filename)
+    attempts = (
+        previous.attempts + 1
+        if previous is not None and previous.matches(audio_filename, tools)
+        else 1
+    )
+
+    record = FailureRecord(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        tools=tools,
+        attempts=attempts,
+        failed_at=time.time(),
+        message=message,
+    )
+    with open(failure_filename(audio_filename), "w") as failure_file:
+        json.dump(asdict(record), failure_file)
+
+    return record
+
+
+def clear_failure(audio_filename: str) -> None:
+    """
+    Forget a failure once the file has been analysed successfully.
+
+    Arguments:
+        audio_filename {str} -- Path to the audio file.
+    """
+    try:
+        os.remove(failure_filename(audio_filename))
+    except FileNotFoundError:
+        pass
+
+
+def tools_fingerprint(tools: List[str]) -> str:
+    """
+    Identify the installed version of the analysis tools.
+
+    Tools do not agree on how to report their version, so each one is identified by
+    its resolved path, size and modification time: upgrading a tool changes them.
+
+    Arguments:
+        tools {List[str]} -- The tool commands or paths.
+
+    Returns:
+        str -- A short fingerprint.
+    """
+    digest = hashlib.sha1()
+
+    for tool in tools:
+        path = shutil.which(tool) or tool
+        try:
+            stat = os.stat(path)
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        except OSError:
+            digest.update(f"{path}:missing\n".encode())
+
+    return digest.hexdigest()[:16]
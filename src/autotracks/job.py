@@ -0,0 +1,111 @@
+import json
+
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.autotracks.error import InvalidJobError
+
+
+@dataclass
+class Job:
+    """
+    One playlist generation request to run against a loaded library.
+
+    Attributes:
+        output {str} -- The filename for the resulting playlist, empty when it is not written to a file.
+        strategy {str} -- The strategy name (default: "dfs").
+        scorer {str} -- The scorer name (default: "bybpm").
+        first {Optional[str]} -- Path of the track the playlist must open with.
+        last {Optional[str]} -- Path of the track the playlist must close with.
+        all {bool} -- Write every generated playlist to numbered files instead of selecting one.
+        strategy_options {Dict[str, Any]} -- Extra keyword arguments for the strategy.
+        scorer_options {Dict[str, Any]} -- Keyword arguments for the scorer.
+    """
+
+    output: str = ""
+    strategy: str = "dfs"
+    scorer: str = "bybpm"
+    first: Optional[str] = None
+    last: Optional[str] = None
+    all: bool = False
+    strategy_options: Dict[str, Any] = field(default_factory=dict)
+    scorer_options: Dict[str, Any] = field(default_factory=dict)
+
+
+# JSON types accepted for each Job attribute
+JOB_TYPES: Dict[str, Tuple[type, ...]] = {
+    "output": (str,),
+    "strategy": (str,),
+    "scorer": (str,),
+    "first": (str, type(None)),
+    "last": (str, type(None)),
+    "all": (bool,),
+    "strategy_options": (dict,),
+    "scorer_options": (dict,),
+}
+
+
+def load_jobs(jobs_filename: str) -> List[Job]:
+    """
+    Read a list of jobs from a JSON file.
+
+    The file holds an array of objects whose keys are the Job attributes, e.g.:
+
+        [
+            {"output": "dfs.m3u"},
+            {"output": "slot.m3u", "strategy": "duration", "strategy_options": {"target": 3600}},
+            {"output": "cover.m3u", "strategy": "cover", "scorer": "composite", "all": true}
+        ]
+
+    Arguments:
+        jobs_filename {str} -- The path to the job file.
+
+    Returns:
+        List[Job] -- The jobs, in file order.
+
+    Raises:
+        InvalidJobError -- If the file cannot be read or does not describe valid jobs.
+    """
+    try:
+        with open(jobs_filename) as jobs_file:
+            entries = json.load(jobs_file)
+    except (OSError, json.JSONDecodeError) as error:
+        raise InvalidJobError(f"Could not read job file: {jobs_filename} ({error})")
+
+    if not isinstance(entries, list):
+        raise InvalidJobError(f"Job file must hold an array of jobs: {jobs_filename}")
+
+    jobs: List[Job] = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or "output" not in entry:
+            raise InvalidJobError(f"Job {index} must be an object with an output")
+
+        jobs.append(parse_job(entry))
+
+    return jobs
+
+
+def parse_job(entry: Dict[str, Any]) -> Job:
+    """
+    Build a job from its JSON description.
+
+    Arguments:
+        entry {Dict[str, Any]} -- An object whose keys are Job attributes.
+
+    Returns:
+        Job -- The described job.
+
+    Raises:
+        InvalidJobError -- If the object holds keys that are not Job attributes, or values of the wrong type.
+    """
+    unknown = set(entry) - {attribute.name for attribute in fields(Job)}
+    if unknown:
+        raise InvalidJobError(f"Unknown job keys: {', '.join(sorted(unknown))}")
+
+    for key, value in entry.items():
+        if not isinstance(value, JOB_TYPES[key]):
+            raise InvalidJobError(
+                f"Invalid type for job key {key}: {type(value).__name__}"
+            )
+
+    return Job(**entry)
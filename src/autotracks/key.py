@@ -1,4 +1,4 @@
-from typing import Dict, Literal, NamedTuple, Tuple, TypeGuard, Union
+from typing import Dict, Iterable, List, Literal, NamedTuple, Tuple, TypeGuard, Union
 
 
 StandardNotation = Literal[
@@ -298,3 +298,104 @@ def compatible_keys(key: Key) -> Tuple[Key, Key, Key]:
         KEY_LOOKUP[key.previous],
         KEY_LOOKUP[key.next],
     )
+
+
+# Integer code of each key, from 0 to 23: its position in KEYS.
+# Minor keys come first, both modes following the Camelot wheel from 8A/8B.
+KEY_CODES: Dict[StandardNotation, int] = {
+    key.standard: code for code, key in enumerate(KEYS)
+}
+
+
+def key_code(key: Key) -> int:
+    """
+    Get the integer code of a key.
+
+    Arguments:
+        key {Key} -- The key to encode.
+
+    Returns:
+        int -- The key code, from 0 to 23.
+    """
+    return KEY_CODES[key.standard]
+
+
+MixingRule = Literal["relative", "adjacent", "energy_boost", "parallel", "semitone"]
+
+# Supported harmonic mixing rules, with the keys they allow after 8A (Amin).
+MIXING_RULES: Dict[MixingRule, str] = {
+    "relative": "Relative major/minor key (8A <-> 8B)",
+    "adjacent": "One step around the wheel, perfect fourth or fifth (8A <-> 7A, 9A)",
+    "energy_boost": "Two steps around the wheel (8A <-> 6A, 10A)",
+    "parallel": "Same tonic, opposite mode (8A <-> 11B)",
+    "semitone": "One semitone up or down (8A <-> 3A, 1A)",
+}
+
+DEFAULT_MIXING_RULES: Tuple[MixingRule, ...] = ("relative", "adjacent")
+
+
+def _rule_targets(rule: str, code: int) -> List[int]:
+    """
+    List the key codes a mixing rule links a key code to.
+
+    Arguments:
+        rule {str} -- The mixing rule to apply.
+        code {int} -- The key code to start from.
+
+    Returns:
+        List[int] -- The linked key codes.
+    """
+    mode, position = divmod(code, 12)
+
+    def on_wheel(step: int) -> int:
+        return mode * 12 + (position + step) % 12
+
+    if rule == "relative":
+        return [(code + 12) % 24]
+    if rule == "adjacent":
+        return [on_wheel(-1), on_wheel(1)]
+    if rule == "energy_boost":
+        return [on_wheel(-2), on_wheel(2)]
+    if rule == "parallel":
+        # a minor key's parallel major sits three steps clockwise, and the other way round
+        return [12 + (position + 3) % 12] if mode == 0 else [(position - 3) % 12]
+    if rule == "semitone":
+        return [on_wheel(7), on_wheel(-7)]
+
+    raise ValueError(f"Unknown mixing rule: {rule}")
+
+
+def compatibility_table(rules: Iterable[str] = DEFAULT_MIXING_RULES) -> Tuple[int, ...]:
+    """
+    Build the key compatibility table for a set of mixing rules.
+
+    The table holds one 24-bit mask per key code: bit j of entry i is set when keys
+    i and j can be mixed. A key is always compatible with itself, and the table is
+    symmetric. Checking two keys is then a single bit test:
+
+        table[a] >> b & 1
+
+    Arguments:
+        rules {Iterable[str]} -- Names of the mixing rules to allow (default: relative and adjacent).
+
+    Returns:
+        Tuple[int, ...] -- The compatibility mask of each key code.
+
+    Raises:
+        ValueError -- If a rule name is not recognized.
+    """
+    masks: List[int] = [1 << code for code in range(len(KEYS))]
+
+    for rule in rules:
+        if rule not in MIXING_RULES:
+            raise ValueError(f"Unknown mixing rule: {rule}")
+
+        for code in range(len(KEYS)):
+            for target in _rule_targets(rule, code):
+                masks[code] |= 1 << target
+                masks[target] |= 1 << code
+
+    return tuple(masks)
+
+
+DEFAULT_COMPATIBILITY: Tuple[int, ...] = compatibility_table()
@@ -1,28 +1,48 @@
 from __future__ import annotations
 
+import logging
 import os
 import subprocess
+import time
 
 from concurrent.futures import Future, ThreadPoolExecutor, as_completed
-from typing import Callable, Dict, List, Tuple, TypedDict, Union
-
-import magic
-
-from tqdm import tqdm
-
-from src.autotracks.autotracks import AutotracksConfig
-from src.autotracks.error import Error, AudioAnalysisError, MalformedMetaFileError
-from src.autotracks.key import KeyNotation, is_valid_key_notation, lookup_key
+from typing import Callable, Dict, List, Optional, Set, Tuple, TypedDict, Union
+
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.error import (
+    Error,
+    AudioAnalysisError,
+    MalformedMetaFileError,
+    UnknownTrackError,
+)
+from src.autotracks.key import (
+    KeyNotation,
+    compatibility_table,
+    is_valid_key_notation,
+    lookup_key,
+)
+from src.autotracks.failure import (
+    clear_failure,
+    read_failure,
+    tools_fingerprint,
+    write_failure,
+)
+from src.autotracks.metrics import metrics
+from src.autotracks.store import ResultStore
 from src.autotracks.track import Track, TrackMetadata
 
 
 class OldSkoolTrackData(TypedDict):
     bpm: float
     key: KeyNotation
+    duration: float | None
 
 
 TrackData = Union[OldSkoolTrackData]
 
+# orders in which audio files are analysed, by estimated cost
+SCHEDULES: Tuple[str, ...] = ("longest", "shortest", "none")
+
 
 class Library:
     """
@@ -35,18 +55,103 @@ class Library:
         config {Dict[str, str | None]} -- Configuration including paths to analysis tools.
         tracks {Dict[str, Track]} -- Successfully loaded tracks, keyed by audio filename.
         errors {Dict[str, Error]} -- Errors encountered during loading, keyed by filename.
+        compatibility {Tuple[int, ...]} -- Key compatibility table for the configured mixing rules.
         neighbours {Dict[str, List[Track]]} -- Compatible tracks for each track.
+        components {List[Set[str]]} -- Connected components of the neighbour graph, largest first.
+        analyse {bool} -- Whether audio files without cached metadata are analysed, or reported as errors.
+        workers {Optional[int]} -- Number of audio files analysed at once (default: one per CPU).
+        store {Optional[ResultStore]} -- Where analysis results are recorded instead of .meta files.
+        on_ready {Optional[Callable[[Library], None]]} -- Called once cached tracks are indexed, while fresh files are still analysed.
+        schedule {str} -- Order in which audio files are analysed, one of SCHEDULES (default: longest first).
+        retry_failed {bool} -- Whether files that failed analysis before are tried again, once their backoff has elapsed.
     """
 
     config: AutotracksConfig
     tracks: Dict[str, Track]
     errors: Dict[str, Error]
+    compatibility: Tuple[int, ...]
     neighbours: Dict[str, List[Track]]
+    components: List[Set[str]]
+    analyse: bool
+    workers: Optional[int]
+    store: Optional[ResultStore]
+    on_ready: Optional[Callable[[Library], None]]
+    schedule: str
+    retry_failed: bool
+    _component_index: Dict[str, int]
+    _tools: Optional[str]
+
+    def __init__(
+        self,
+        config: AutotracksConfig,
+        track_filenames: List[str],
+        snapshot_filename: Optional[str] = None,
+        analyse: bool = True,
+        workers: Optional[int] = None,
+        store: Optional[ResultStore] = None,
+        on_ready: Optional[Callable[[Library], None]] = None,
+        schedule: str = "longest",
+        retry_failed: bool = False,
+    ) -> None:
+        if schedule not in SCHEDULES:
+            raise ValueError(f"Unknown analysis schedule: {schedule}")
 
-    def __init__(self, config: AutotracksConfig, track_filenames: List[str]) -> None:
         self.config = config
-        self.tracks, self.errors = self.load_metadata(track_filenames)
-        self.neighbours = self.find_neighbours(self.tracks)
+        self.analyse = analyse
+        self.workers = workers
+        self.store = store
+        self.on_ready = on_ready
+        self.schedule = schedule
+        self.retry_failed = retry_failed
+        self._tools = None
+
+        self.compatibility = compatibility_table(config.mixing_rules)
+
+        snapshot = None
+        if snapshot_filename:
+            # snapshots need numpy, only import it when they are used
+            from src.autotracks.snapshot import load_snapshot, manifest_digest
+
+            # a snapshot is only valid for the exact same scan and settings
+            with metrics.phase("snapshot.load"):
+                snapshot = load_snapshot(
+                    snapshot_filename,
+                    manifest_digest(track_filenames, config.mixing_rules, analyse),
+                )
+
+        if snapshot is not None:
+            self.tracks, self.errors, self.neighbours = snapshot
+        else:
+            self._stream_metadata(track_filenames)
+
+        with metrics.phase("components"):
+            self.components = self.find_components(self.neighbours)
+            self._component_index = self._index_components(self.components)
+
+        if snapshot_filename and snapshot is None:
+            self.save_snapshot(snapshot_filename, track_filenames)
+
+    def save_snapshot(self, snapshot_filename: str, track_filenames: List[str]) -> None:
+        """
+        Save the library to a binary snapshot, valid as long as the scanned files do not change.
+
+        Arguments:
+            snapshot_filename {str} -- The path to the snapshot file.
+            track_filenames {List[str]} -- The scanned filenames the library was loaded from.
+        """
+        from src.autotracks.snapshot import manifest_digest, save_snapshot
+
+        try:
+            with metrics.phase("snapshot.save"):
+                save_snapshot(
+                    self,
+                    snapshot_filename,
+                    manifest_digest(
+                        track_filenames, self.config.mixing_rules, self.analyse
+                    ),
+                )
+        except OSError:
+            logging.error(f"Could not write snapshot file: {snapshot_filename}")
 
     def is_audio_file(self, filename: str) -> bool:
         """
@@ -59,6 +164,8 @@ class Library:
             boolean -- True if the file is of audio type, else False.
         """
 
+        import magic
+
         if os.path.exists(filename):
             mime_type: str = magic.from_file(filename, mime=True)  # type: ignore
 
@@ -119,13 +226,16 @@ class Library:
         The file format is plain text with one value per line:
             - Line 1: BPM (float)
             - Line 2: Key (standard notation, e.g., "Amin")
+            - Line 3: Duration in seconds (float), empty if unknown
 
         Arguments:
             track {Track} -- The track whose metadata should be cached.
         """
+        duration = track.metadata.duration
         with open(track.metadata_filename, "w") as metadata_file:
             print(track.metadata.bpm, file=metadata_file)
             print(track.metadata.key, file=metadata_file)
+            print("" if duration is None else duration, file=metadata_file)
 
     def load_metadata(
         self, filenames: List[str]
@@ -145,33 +255,178 @@ class Library:
         tracks: Dict[str, Track] = {}
         errors: Dict[str, Error] = {}
 
-        audio_filenames = [f for f in filenames if self.is_audio_file(f)]
-        meta_filenames = [f for f in filenames if self.is_meta_file(f)]
-
-        # partition audio files by cached metadata availability
-        cached, fresh = self._partition_by_cache(audio_filenames)
+        cached_meta, fresh = self._classify(filenames)
 
-        # analyse fresh audio files in parallel
-        analysed_tracks, analysed_errors = self._analyse_audio(
-            fresh, self._analyse_oldskool
-        )
+        # analyse fresh audio files in parallel, unless only cached metadata is wanted
+        analysed_tracks, analysed_errors = self._analyse_fresh(fresh)
         tracks.update(analysed_tracks)
         errors.update(analysed_errors)
 
-        # load cached metadata files (audio files with associated metadata files)
-        cached_meta = [self.metadata_filename(f) for f in cached]
-        cached_tracks, cached_errors = self._load_cached(cached_meta)
+        with metrics.phase("cache.load"):
+            cached_tracks, cached_errors = self._load_cached(cached_meta)
+
         tracks.update(cached_tracks)
         errors.update(cached_errors)
 
-        # load orphaned metadata files (passed without corresponding audio file)
+        return tracks, errors
+
+    def _stream_metadata(self, filenames: List[str]) -> None:
+        """
+        Load the library, indexing cached tracks while fresh files are being analysed.
+
+        Analysis is submitted first. Cached metadata is then loaded and its neighbour
+        graph built while the analysis tools run, and on_ready is called with the
+        cached part of the library. Analysed tracks are linked into the graph as they
+        complete, so that loading ends with the slowest file rather than after it.
+
+        Arguments:
+            filenames {List[str]} -- List of audio and/or metadata filenames.
+        """
+        self.tracks, self.errors, self.neighbours = {}, {}, {}
+
+        cached_meta, fresh = self._classify(filenames)
+
+        def index_cached() -> None:
+            with metrics.phase("cache.load"):
+                cached_tracks, cached_errors = self._load_cached(cached_meta)
+            self.errors.update(cached_errors)
+
+            with metrics.phase("neighbours"):
+                self.tracks.update(cached_tracks)
+                self.neighbours = self.find_neighbours(self.tracks)
+
+            if self.on_ready is not None and fresh and self.analyse:
+                # a preliminary view of the library, without the fresh tracks
+                self.components = self.find_components(self.neighbours)
+                self._component_index = self._index_components(self.components)
+                self.on_ready(self)
+
+        def link_analysed(track: Track) -> None:
+            with metrics.phase("neighbours"):
+                self._link_track(track)
+
+        _, analysed_errors = self._analyse_fresh(
+            fresh, on_submitted=index_cached, on_track=link_analysed
+        )
+        self.errors.update(analysed_errors)
+
+    def _classify(self, filenames: List[str]) -> Tuple[List[str], List[str]]:
+        """
+        Sort files into metadata files to load and audio files to analyse.
+
+        Arguments:
+            filenames {List[str]} -- List of audio and/or metadata filenames.
+
+        Returns:
+            Tuple[List[str], List[str]] -- The .meta files to load, cached or orphaned,
+            and the audio files without cached metadata.
+        """
+        with metrics.phase("classify"):
+            audio_filenames = [f for f in filenames if self.is_audio_file(f)]
+            meta_filenames = [f for f in filenames if self.is_meta_file(f)]
+
+        # partition audio files by cached metadata availability
+        cached, fresh = self._partition_by_cache(audio_filenames)
+        metrics.count("files.audio", len(audio_filenames))
+        metrics.count("files.meta", len(meta_filenames))
+        metrics.count("cache.hits", len(cached))
+        metrics.count("cache.misses", len(fresh))
+
+        # cached metadata files (audio files with associated metadata files)
+        cached_meta = [self.metadata_filename(f) for f in cached]
+        # orphaned metadata files (passed without corresponding audio file)
         orphaned_meta = self._find_orphan_meta_files(meta_filenames, audio_filenames)
-        orphaned_tracks, orphaned_errors = self._load_cached(orphaned_meta)
-        tracks.update(orphaned_tracks)
-        errors.update(orphaned_errors)
+
+        return cached_meta + orphaned_meta, fresh
+
+    def _analyse_fresh(
+        self,
+        audio_filenames: List[str],
+        on_submitted: Optional[Callable[[], None]] = None,
+        on_track: Optional[Callable[[Track], None]] = None,
+    ) -> Tuple[Dict[str, Track], Dict[str, Error]]:
+        """
+        Analyse audio files without cached metadata, or report them when analysis is off.
+
+        Arguments:
+            audio_filenames {List[str]} -- Audio files to analyse.
+
+        Keyword Arguments:
+            on_submitted {Optional[Callable[[], None]]} -- Run while the analysis is under way (default: {None}).
+            on_track {Optional[Callable[[Track], None]]} -- Called with each analysed track (default: {None}).
+
+        Returns:
+            Tuple[Dict[str, Track], Dict[str, Error]] -- Tracks and errors.
+        """
+        if not self.analyse:
+            if on_submitted is not None:
+                on_submitted()
+
+            return {}, {
+                filename: AudioAnalysisError(f"No cached metadata for file: {filename}")
+                for filename in audio_filenames
+            }
+
+        audio_filenames, skipped = self._skip_known_failures(audio_filenames)
+
+        with metrics.phase("analysis"):
+            tracks, errors = self._analyse_audio(
+                audio_filenames, self._analyse_oldskool, on_submitted, on_track
+            )
+
+        errors.update(skipped)
 
         return tracks, errors
 
+    def _skip_known_failures(
+        self, audio_filenames: List[str]
+    ) -> Tuple[List[str], Dict[str, Error]]:
+        """
+        Leave out files whose analysis failed before, as long as neither they nor the tools changed.
+
+        With retry_failed, such files are analysed again once their backoff has elapsed.
+
+        Arguments:
+            audio_filenames {List[str]} -- Audio files to analyse.
+
+        Returns:
+            Tuple[List[str], Dict[str, Error]] -- The files to analyse, and errors for the skipped ones.
+        """
+        remaining: List[str] = []
+        skipped: Dict[str, Error] = {}
+        now = time.time()
+
+        for filename in audio_filenames:
+            record = read_failure(filename)
+            if (
+                record is None
+                or not record.matches(filename, self.tools_fingerprint())
+                or (self.retry_failed and now >= record.retry_at())
+            ):
+                remaining.append(filename)
+            else:
+                skipped[filename] = AudioAnalysisError(
+                    f"Skipping file that failed analysis before ({record.attempts} attempts): {record.message}"
+                )
+
+        metrics.count("failures.skipped", len(skipped))
+
+        return remaining, skipped
+
+    def tools_fingerprint(self) -> str:
+        """
+        Identify the analysis tools, so that failures are forgotten when they are upgraded.
+
+        Returns:
+            str -- The fingerprint of bpm-tag and keyfinder-cli.
+        """
+        if self._tools is None:
+            self._tools = tools_fingerprint(
+                [self.config.bpm_tag, self.config.keyfinder_cli]
+            )
+
+        return self._tools
+
     def _find_orphan_meta_files(
         self, meta_filenames: List[str], audio_filenames: List[str]
     ) -> List[str]:
@@ -222,28 +477,48 @@ class Library:
         self,
         audio_filenames: List[str],
         extractor: Callable[[str], TrackData],
+        on_submitted: Optional[Callable[[], None]] = None,
+        on_track: Optional[Callable[[Track], None]] = None,
     ) -> Tuple[Dict[str, Track], Dict[str, Error]]:
         """
         Analyse audio files without cached metadata in parallel.
 
-        Extracts BPM and key, creates Track objects, and caches metadata.
+        Extracts BPM and key, creates Track objects, and caches metadata in .meta files,
+        or in the result store if there is one.
 
         Arguments:
             audio_filenames {List[str]} -- Audio files to analyse.
             extractor {Callable[[str], TrackData]} -- Function that takes a filename and returns extracted data.
 
+        Keyword Arguments:
+            on_submitted {Optional[Callable[[], None]]} -- Run in the calling thread once every file is submitted (default: {None}).
+            on_track {Optional[Callable[[Track], None]]} -- Called in the calling thread with each analysed track (default: {None}).
+
         Returns:
             Tuple[Dict[str, Track], Dict[str, Error]] -- Tracks and errors.
         """
+        if not audio_filenames:
+            # nothing to wait for, and no empty progress bar
+            if on_submitted is not None:
+                on_submitted()
+
+            return {}, {}
+
+        from tqdm import tqdm
+
         tracks: Dict[str, Track] = {}
         errors: Dict[str, Error] = {}
 
-        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        with ThreadPoolExecutor(max_workers=self.workers or os.cpu_count()) as executor:
+            # idle workers take the next queued file, in schedule order
             futures: Dict[Future[TrackData], str] = {
                 executor.submit(extractor, filename): filename
-                for filename in audio_filenames
+                for filename in self.schedule_analysis(audio_filenames)
             }
 
+            if on_submitted is not None:
+                on_submitted()
+
             with tqdm(
                 total=len(audio_filenames), desc="Analysing audio files", unit="file"
             ) as pbar:
@@ -253,14 +528,64 @@ class Library:
 
                     if isinstance(result, Track):
                         tracks[audio_filename] = result
-                        self.write_metadata(result)
+                        if self.store is not None:
+                            self.store.add(result)
+                        else:
+                            self.write_metadata(result)
+                        clear_failure(audio_filename)
+                        if on_track is not None:
+                            on_track(result)
                     else:
                         errors[audio_filename] = result
+                        self._record_failure(audio_filename, result)
 
                     pbar.update(1)
 
         return tracks, errors
 
+    def _record_failure(self, audio_filename: str, error: Error) -> None:
+        """
+        Keep a failed analysis next to the audio file, so that later runs skip it.
+
+        Arguments:
+            audio_filename {str} -- The audio file that failed.
+            error {Error} -- The analysis error.
+        """
+        try:
+            write_failure(audio_filename, self.tools_fingerprint(), error.message)
+        except OSError:
+            logging.warning(f"⚠ Could not record analysis failure: {audio_filename}")
+
+    def schedule_analysis(self, audio_filenames: List[str]) -> List[str]:
+        """
+        Order audio files for analysis by estimated cost, i.e. by file size.
+
+        Longest first keeps every worker busy until the queue drains, instead of
+        leaving a long mix submitted last to a single worker. Shortest first gets the
+        first results sooner.
+
+        Arguments:
+            audio_filenames {List[str]} -- Audio files to analyse.
+
+        Returns:
+            List[str] -- The same files, in the order they should be analysed.
+        """
+        if self.schedule == "none":
+            return list(audio_filenames)
+
+        sizes: Dict[str, int] = {}
+        for filename in audio_filenames:
+            try:
+                sizes[filename] = os.path.getsize(filename)
+            except OSError:
+                sizes[filename] = 0
+
+        return sorted(
+            audio_filenames,
+            key=sizes.__getitem__,
+            reverse=self.schedule == "longest",
+        )
+
     def _analyse_oldskool(self, filename: str) -> OldSkoolTrackData:
         """
         Start audio analysis with bpm-tag and keyfinder-cli.
@@ -269,15 +594,16 @@ class Library:
             filename {str} -- The path to an audio file.
 
         Returns:
-            OldSkoolTrackData -- Dictionary containing BPM (float) and key (KeyNotation).
+            OldSkoolTrackData -- Dictionary containing BPM (float), key (KeyNotation) and duration (float | None).
         """
         try:
             # bpm-tag writes BPM to stderr
-            bpm_output: str = subprocess.check_output(
-                [self.config.bpm_tag, "-nf", filename],
-                stderr=subprocess.STDOUT,
-                text=True,
-            ).strip()
+            with metrics.phase("analysis.bpm_tag"):
+                bpm_output: str = subprocess.check_output(
+                    [self.config.bpm_tag, "-nf", filename],
+                    stderr=subprocess.STDOUT,
+                    text=True,
+                ).strip()
 
             # parse bpm-tag output
             bpm_lines = [line for line in bpm_output.splitlines() if "BPM" in line]
@@ -287,11 +613,12 @@ class Library:
             bpm_str = last_bpm_line.split(": ")[1].split()[0]
             bpm = float(bpm_str)
 
-            key: str = subprocess.check_output(
-                [self.config.keyfinder_cli, "-n", "openkey", filename],
-                stderr=subprocess.DEVNULL,
-                text=True,
-            ).strip()
+            with metrics.phase("analysis.keyfinder_cli"):
+                key: str = subprocess.check_output(
+                    [self.config.keyfinder_cli, "-n", "openkey", filename],
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                ).strip()
 
             if not is_valid_key_notation(key):
                 raise ValueError(f"Unknown key notation: {key}")
@@ -299,12 +626,47 @@ class Library:
             return {
                 "bpm": bpm,
                 "key": key,
+                "duration": self._probe_duration(filename),
             }
         except (IndexError, ValueError, subprocess.CalledProcessError) as error:
             raise AudioAnalysisError(
                 f"Audio analysis error for file: {filename} ({error})"
             )
 
+    def _probe_duration(self, filename: str) -> float | None:
+        """
+        Read the duration of an audio file with ffprobe.
+
+        The duration is optional metadata: a missing tool or an unreadable header
+        leaves it unknown rather than failing the whole analysis.
+
+        Arguments:
+            filename {str} -- The path to an audio file.
+
+        Returns:
+            float | None -- The duration in seconds, or None if it could not be read.
+        """
+        try:
+            with metrics.phase("analysis.ffprobe"):
+                duration_output: str = subprocess.check_output(
+                    [
+                        self.config.ffprobe,
+                        "-v",
+                        "error",
+                        "-show_entries",
+                        "format=duration",
+                        "-of",
+                        "default=noprint_wrappers=1:nokey=1",
+                        filename,
+                    ],
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                ).strip()
+
+            return float(duration_output)
+        except (OSError, ValueError, subprocess.CalledProcessError):
+            return None
+
     def _handle_analysis_result(
         self, future: Future[TrackData], audio_filename: str
     ) -> Track | Error:
@@ -322,7 +684,9 @@ class Library:
             track_data = future.result()
             metadata_filename = self.metadata_filename(audio_filename)
             metadata = TrackMetadata(
-                bpm=track_data["bpm"], key=lookup_key(track_data["key"])
+                bpm=track_data["bpm"],
+                key=lookup_key(track_data["key"]),
+                duration=track_data["duration"],
             )
             return Track(audio_filename, metadata_filename, metadata)
         except AudioAnalysisError as error:
@@ -371,15 +735,56 @@ class Library:
         """
         try:
             metadata = self.parse_metadata(metadata_filename)
-            return Track(audio_filename, metadata_filename, metadata)
         except MalformedMetaFileError as error:
             return error
         except ValueError as error:
             return AudioAnalysisError(str(error))
 
+        track = Track(audio_filename, metadata_filename, metadata)
+        if (
+            self.analyse
+            and metadata.duration is None
+            and os.path.isfile(audio_filename)
+            and not self._has_duration_line(metadata_filename)
+        ):
+            self._backfill_duration(track)
+
+        return track
+
+    def _has_duration_line(self, metadata_filename: str) -> bool:
+        """
+        Check whether a .meta file has a duration line, even an empty one.
+
+        Arguments:
+            metadata_filename {str} -- Path to the .meta file.
+
+        Returns:
+            bool -- False for files cached before durations were recorded.
+        """
+        with open(metadata_filename) as meta:
+            return len(meta.readlines()) > 2
+
+    def _backfill_duration(self, track: Track) -> None:
+        """
+        Probe the duration of a track cached before durations were recorded, and cache it.
+
+        The duration line is written even when it cannot be read, so that each file
+        is only probed once.
+
+        Arguments:
+            track {Track} -- The track, updated in place.
+        """
+        track.metadata.duration = self._probe_duration(track.filename)
+        metrics.count("cache.backfilled")
+
+        try:
+            self.write_metadata(track)
+        except OSError:
+            logging.warning(f"Could not write metadata file: {track.metadata_filename}")
+
     def parse_metadata(self, metadata_filename: str) -> TrackMetadata:
         """
-        Parse metadata file and return track metadata (including BPM and key).
+        Parse metadata file and return track metadata (including BPM, key and duration).
 
         Arguments:
             metadata_filename {str} -- The filename for the metadata associated with the track.
@@ -388,7 +793,7 @@ class Library:
             TrackMetadata -- BPM, key and other metadata as previously analysed for the track.
         """
 
-        # the .meta file contains two lines -- first is BPM, second is key
+        # the .meta file contains two or three lines -- BPM, key and optional duration
         with open(metadata_filename) as meta:
             lines: List[str] = [line.strip() for line in meta.readlines()]
 
@@ -396,11 +801,14 @@ class Library:
                 bpm: float = float(lines[0])
                 key_str: str = lines[1]
                 key = lookup_key(key_str)
+                duration: float | None = (
+                    float(lines[2]) if len(lines) > 2 and lines[2] else None
+                )
 
-                return TrackMetadata(bpm=bpm, key=key)
+                return TrackMetadata(bpm=bpm, key=key, duration=duration)
             except IndexError:
                 raise MalformedMetaFileError(
-                    f"Lines in metadata file: {len(lines)} (expected 2)",
+                    f"Lines in metadata file: {len(lines)} (expected 2 or 3)",
                 )
             except ValueError as error:
                 raise MalformedMetaFileError(str(error))
@@ -409,19 +817,198 @@ class Library:
         """
         Find harmonically compatible tracks for each track in the library.
 
+        Tracks sharing a key share the same neighbours, so compatible tracks are listed
+        once per key code instead of comparing every pair of tracks.
+
         Arguments:
             tracks {Dict[str, Track]} -- All tracks to consider.
 
         Returns:
             Dict[str, List[Track]] -- For each track filename, a list of harmonically compatible tracks.
         """
-        neighbours: Dict[str, List[Track]] = {filename: [] for filename in tracks}
-
         track_list = list(tracks.values())
-        for i, track in enumerate(track_list):
-            for other in track_list[i + 1 :]:
-                if track.is_neighbour(other):
-                    neighbours[track.filename].append(other)
-                    neighbours[other.filename].append(track)
 
-        return neighbours
+        # compatible tracks for each key code, in library order
+        by_code: Dict[int, List[Track]] = {}
+        for code in {track.key_code for track in track_list}:
+            mask = self.compatibility[code]
+            by_code[code] = [
+                track for track in track_list if mask >> track.key_code & 1
+            ]
+
+        return {
+            track.filename: [
+                other for other in by_code[track.key_code] if other is not track
+            ]
+            for track in track_list
+        }
+
+    def find_track(self, filename: str) -> Track:
+        """
+        Find a library track from the path of its audio or metadata file.
+
+        Arguments:
+            filename {str} -- Path to the audio or metadata file, relative or absolute.
+
+        Returns:
+            Track -- The matching track.
+
+        Raises:
+            UnknownTrackError -- If no track of the library matches the path.
+        """
+        audio_filename = self.audio_filename(filename)
+        if audio_filename in self.tracks:
+            return self.tracks[audio_filename]
+
+        wanted = os.path.abspath(audio_filename)
+        for track in self.tracks.values():
+            if os.path.abspath(track.filename) == wanted:
+                return track
+
+        raise UnknownTrackError(f"Track is not part of the library: {filename}")
+
+    def add_tracks(self, filenames: List[str]) -> Dict[str, Track]:
+        """
+        Load new or changed files into the library without rebuilding it.
+
+        Only the neighbour relationships of the loaded tracks are computed, against
+        the tracks already in the library. Components are then refreshed.
+
+        Arguments:
+            filenames {List[str]} -- List of audio and/or metadata filenames.
+
+        Returns:
+            Dict[str, Track] -- The tracks that were loaded, keyed by audio filename.
+        """
+        tracks, errors = self.load_metadata(filenames)
+        self.insert_tracks(tracks, errors)
+
+        return tracks
+
+    def insert_tracks(self, tracks: Dict[str, Track], errors: Dict[str, Error]) -> None:
+        """
+        Insert already loaded tracks and errors into the library, replacing previous versions.
+
+        Loading and inserting are separate steps so that the slow audio analysis can run
+        while the library is still being read.
+
+        Arguments:
+            tracks {Dict[str, Track]} -- Tracks as returned by load_metadata().
+            errors {Dict[str, Error]} -- Errors as returned by load_metadata().
+        """
+        # a reloaded track replaces its previous version
+        stale = [
+            filename
+            for filename in [*tracks, *errors]
+            if filename in self.tracks or filename in self.errors
+        ]
+        if stale:
+            self.remove_tracks(stale)
+
+        self.errors.update(errors)
+        for track in tracks.values():
+            self._link_track(track)
+
+        self.components = self.find_components(self.neighbours)
+        self._component_index = self._index_components(self.components)
+
+    def _link_track(self, track: Track) -> None:
+        """
+        Add a track that is not part of the library yet to the neighbour graph.
+
+        Components are left as they are, for the caller to refresh.
+
+        Arguments:
+            track {Track} -- The track to add.
+        """
+        self.neighbours[track.filename] = []
+        for other in self.tracks.values():
+            if track.is_neighbour(other, self.compatibility):
+                self.neighbours[track.filename].append(other)
+                self.neighbours[other.filename].append(track)
+        self.tracks[track.filename] = track
+
+    def remove_tracks(self, filenames: List[str]) -> None:
+        """
+        Drop tracks and their errors from the library without rebuilding it.
+
+        Arguments:
+            filenames {List[str]} -- Audio or metadata filenames of the tracks to drop.
+        """
+        for filename in map(self.audio_filename, filenames):
+            self.errors.pop(filename, None)
+
+            track = self.tracks.pop(filename, None)
+            if track is None:
+                continue
+
+            for neighbour in self.neighbours.pop(filename):
+                self.neighbours[neighbour.filename].remove(track)
+
+        self.components = self.find_components(self.neighbours)
+        self._component_index = self._index_components(self.components)
+
+    def find_components(self, neighbours: Dict[str, List[Track]]) -> List[Set[str]]:
+        """
+        Split the neighbour graph into its connected components.
+
+        Two tracks that belong to different components can never appear in the same
+        playlist, so strategies can search each component independently.
+
+        Arguments:
+            neighbours {Dict[str, List[Track]]} -- The neighbour graph, as built by find_neighbours().
+
+        Returns:
+            List[Set[str]] -- Track filenames for each component, largest component first.
+        """
+        components: List[Set[str]] = []
+        visited: Set[str] = set()
+
+        for filename in neighbours:
+            if filename in visited:
+                continue
+
+            # iterative traversal of the component reachable from this track
+            component: Set[str] = {filename}
+            stack: List[str] = [filename]
+            while stack:
+                for neighbour in neighbours[stack.pop()]:
+                    if neighbour.filename not in component:
+                        component.add(neighbour.filename)
+                        stack.append(neighbour.filename)
+
+            visited.update(component)
+            components.append(component)
+
+        return sorted(components, key=len, reverse=True)
+
+    def component_of(self, filename: str) -> int:
+        """
+        Find the connected component a track belongs to.
+
+        Arguments:
+            filename {str} -- The track filename.
+
+        Returns:
+            int -- Index of the track's component in self.components.
+
+        Raises:
+            KeyError -- If the track is not part of the library.
+        """
+        return self._component_index[filename]
+
+    def _index_components(self, components: List[Set[str]]) -> Dict[str, int]:
+        """
+        Map each track filename to the index of its connected component.
+
+        Arguments:
+            components {List[Set[str]]} -- Components as returned by find_components().
+
+        Returns:
+            Dict[str, int] -- Component index for each track filename.
+        """
+        return {
+            filename: index
+            for index, component in enumerate(components)
+            for filename in component
+        }
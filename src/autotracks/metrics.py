@@ -0,0 +1,168 @@
+import json
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class Metrics:
+    """
+    Durations and counts recorded for each phase of a run.
+
+    Phases may run in several threads at once: their durations are then summed, so a
+    phase can add up to more than the wall-clock time of the run.
+
+    Attributes:
+        durations {Dict[str, float]} -- Total time spent in each phase, in seconds.
+        calls {Dict[str, int]} -- Number of times each phase ran.
+        counters {Dict[str, int]} -- Event counts, e.g. cache hits.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.durations: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the body of a with block as one run of a phase.
+
+        Arguments:
+            name {str} -- The phase name.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Record one run of a phase.
+
+        Arguments:
+            name {str} -- The phase name.
+            seconds {float} -- How long the phase ran.
+        """
+        with self._lock:
+            self.durations[name] = self.durations.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Increment a counter.
+
+        Arguments:
+            name {str} -- The counter name.
+
+        Keyword Arguments:
+            value {int} -- The increment (default: {1}).
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded so far.
+        """
+        with self._lock:
+            self.durations.clear()
+            self.calls.clear()
+            self.counters.clear()
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Describe the recorded phases and counters.
+
+        Returns:
+            Dict[str, Any] -- A JSON-serializable report.
+        """
+        with self._lock:
+            return {
+                "phases": {
+                    name: {"seconds": self.durations[name], "calls": self.calls[name]}
+                    for name in sorted(self.durations)
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+# process-wide metrics, recorded by every phase of the pipeline
+metrics = Metrics()
+
+
+@contextmanager
+def instrument(
+    metrics_filename: Optional[str] = None,
+    profile_filename: Optional[str] = None,
+    trace_memory: bool = False,
+) -> Iterator[None]:
+    """
+    Record metrics for the body of a with block, and write them as a JSON report.
+
+    Arguments:
+        metrics_filename {Optional[str]} -- Where the JSON report is written, if anywhere (default: {None}).
+        profile_filename {Optional[str]} -- Where cProfile statistics of the calling thread are dumped (default: {None}).
+        trace_memory {bool} -- Add tracemalloc peak usage and top allocations to the report (default: {False}).
+    """
+    metrics.reset()
+
+    profiler = None
+    if profile_filename:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    if trace_memory:
+        import tracemalloc
+
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        report: Dict[str, Any] = {"elapsed": elapsed, **metrics.report()}
+
+        if profiler is not None and profile_filename:
+            profiler.disable()
+            profiler.dump_stats(profile_filename)
+
+        if trace_memory:
+            report["memory"] = _memory_report()
+            tracemalloc.stop()
+
+        if metrics_filename:
+            try:
+                with open(metrics_filename, "w") as metrics_file:
+                    json.dump(report, metrics_file, indent=2)
+            except OSError:
+                logging.error(f"Could not write metrics file: {metrics_filename}")
+
+
+def _memory_report(top: int = 10) -> Dict[str, Any]:
+    """
+    Describe memory usage as traced by tracemalloc.
+
+    Keyword Arguments:
+        top {int} -- Number of allocation sites to list (default: {10}).
+
+    Returns:
+        Dict[str, Any] -- Current and peak traced memory, and the largest allocation sites.
+    """
+    import tracemalloc
+
+    current, peak = tracemalloc.get_traced_memory()
+    statistics = tracemalloc.take_snapshot().statistics("lineno")[:top]
+    sites: List[Dict[str, Any]] = [
+        {"location": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+        for stat in statistics
+    ]
+
+    return {"current_bytes": current, "peak_bytes": peak, "top": sites}
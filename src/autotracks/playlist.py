@@ -1,13 +1,110 @@
-from typing import List
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional, Tuple
 
 from src.autotracks.track import Track
 
+if TYPE_CHECKING:
+    from src.autotracks.scorer import Scorer
+
 
 class Playlist:
-    tracks: List[Track]
+    """
+    An immutable sequence of tracks.
+
+    Playlists built with with_track() only hold a reference to the playlist they
+    extend, so many candidates sharing a common prefix cost one node each. Their length
+    is kept on the node; their track tuple, hash and score are computed on first use
+    and cached.
+    """
+
+    __slots__ = ("_parent", "_last", "_length", "_tracks", "_hash", "_score")
+
+    _parent: Optional[Playlist]
+    _last: Optional[Track]
+    _length: int
+    _tracks: Optional[Tuple[Track, ...]]
+    _hash: Optional[int]
+    _score: Optional[Tuple[Scorer, float]]
+
+    def __init__(self, tracks: Iterable[Track] = ()) -> None:
+        self._tracks = tuple(tracks)
+        self._parent = None
+        self._last = self._tracks[-1] if self._tracks else None
+        self._length = len(self._tracks)
+        self._hash = None
+        self._score = None
+
+    @property
+    def tracks(self) -> Tuple[Track, ...]:
+        """
+        The tracks of the playlist, in order.
+
+        Returns:
+            {Tuple[Track, ...]} -- The tracks of the playlist.
+        """
+
+        if self._tracks is None:
+            # walk back to the closest materialised prefix
+            suffix: List[Track] = []
+            node: Optional[Playlist] = self
+            while node is not None and node._tracks is None:
+                assert node._last is not None
+                suffix.append(node._last)
+                node = node._parent
 
-    def __init__(self, tracks: List[Track]) -> None:
-        self.tracks = tracks.copy()
+            prefix = node._tracks if node is not None else ()
+            self._tracks = prefix + tuple(reversed(suffix))
+
+        return self._tracks
+
+    @property
+    def last(self) -> Optional[Track]:
+        """
+        The last track of the playlist, without materialising its tracks.
+
+        Returns:
+            {Optional[Track]} -- The last track, or None if the playlist is empty.
+        """
+
+        return self._last
+
+    def with_track(self, track: Track) -> Playlist:
+        """
+        Build a new playlist made of this one followed by a track, sharing this one as its prefix.
+
+        Arguments:
+            track {Track} -- The track to append.
+
+        Returns:
+            {Playlist} -- The extended playlist.
+        """
+
+        playlist = Playlist.__new__(Playlist)
+        playlist._tracks = None
+        playlist._parent = self
+        playlist._last = track
+        playlist._length = self._length + 1
+        playlist._hash = None
+        playlist._score = None
+
+        return playlist
+
+    def score(self, scorer: Scorer) -> float:
+        """
+        Score the playlist, reusing the previous result for the same scorer.
+
+        Arguments:
+            scorer {Scorer} -- The scorer to evaluate the playlist with.
+
+        Returns:
+            {float} -- The playlist score (higher is better).
+        """
+
+        if self._score is None or self._score[0] is not scorer:
+            self._score = (scorer, scorer.score_playlist(self))
+
+        return self._score[1]
 
     def is_empty(self) -> bool:
         """
@@ -17,4 +114,38 @@ class Playlist:
             {bool} -- True if the playlist is empty.
         """
 
-        return len(self.tracks) == 0
+        return self._length == 0
+
+    def duration(self) -> float:
+        """
+        Compute the total length of the playlist.
+
+        Returns:
+            {float} -- The sum of the known track durations, in seconds.
+        """
+
+        return sum(
+            track.metadata.duration
+            for track in self.tracks
+            if track.metadata.duration is not None
+        )
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[Track]:
+        return iter(self.tracks)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Playlist):
+            return NotImplemented
+
+        return self._length == other._length and all(
+            a.filename == b.filename for a, b in zip(self.tracks, other.tracks)
+        )
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(tuple(track.filename for track in self.tracks))
+
+        return self._hash
@@ -0,0 +1,104 @@
+import importlib
+
+from typing import Any, Dict, Optional
+
+from src.autotracks.error import InvalidJobError
+from src.autotracks.scorer import Scorer
+from src.autotracks.strategy import Strategy
+from src.autotracks.track import Track
+
+
+# Scorers and strategies that can be selected by name, as "module:class" paths so that
+# their dependencies (e.g. numpy for the composite scorer) are only imported when used
+SCORERS: Dict[str, str] = {
+    "bybpm": "src.autotracks.scorers.bybpm:ByBPM",
+    "composite": "src.autotracks.scorers.composite:Composite",
+}
+
+STRATEGIES: Dict[str, str] = {
+    "dfs": "src.autotracks.strategies.dfs:DFS",
+    "greedy": "src.autotracks.strategies.greedy:Greedy",
+    "cover": "src.autotracks.strategies.cover:Cover",
+    "duration": "src.autotracks.strategies.duration:Duration",
+    "kbest": "src.autotracks.strategies.kbest:KBest",
+}
+
+
+def load_class(path: str) -> Any:
+    """
+    Import a class from its "module:class" path.
+
+    Arguments:
+        path {str} -- The class path, as listed in SCORERS or STRATEGIES.
+
+    Returns:
+        Any -- The class.
+    """
+    module_name, _, class_name = path.partition(":")
+
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def make_scorer(name: str, options: Optional[Dict[str, Any]] = None) -> Scorer:
+    """
+    Instantiate a scorer from its name.
+
+    Arguments:
+        name {str} -- The scorer name, as listed in SCORERS.
+
+    Keyword Arguments:
+        options {Optional[Dict[str, Any]]} -- Keyword arguments for the scorer (default: {None}).
+
+    Returns:
+        Scorer -- A new scorer.
+
+    Raises:
+        InvalidJobError -- If the name or the options are not recognized.
+    """
+    if name not in SCORERS:
+        raise InvalidJobError(
+            f"Unknown scorer: {name} (expected one of {', '.join(SCORERS)})"
+        )
+
+    try:
+        return load_class(SCORERS[name])(**(options or {}))
+    except (TypeError, ValueError) as error:
+        raise InvalidJobError(f"Invalid options for scorer {name}: {error}")
+
+
+def make_strategy(
+    name: str,
+    scorer: Scorer,
+    first: Optional[Track] = None,
+    last: Optional[Track] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Strategy:
+    """
+    Instantiate a strategy from its name.
+
+    Arguments:
+        name {str} -- The strategy name, as listed in STRATEGIES.
+        scorer {Scorer} -- The scorer to use for evaluating tracks.
+
+    Keyword Arguments:
+        first {Optional[Track]} -- The track every playlist must open with (default: {None}).
+        last {Optional[Track]} -- The track every playlist must close with (default: {None}).
+        options {Optional[Dict[str, Any]]} -- Extra keyword arguments for the strategy (default: {None}).
+
+    Returns:
+        Strategy -- A new strategy.
+
+    Raises:
+        InvalidJobError -- If the name or the options are not recognized.
+    """
+    if name not in STRATEGIES:
+        raise InvalidJobError(
+            f"Unknown strategy: {name} (expected one of {', '.join(STRATEGIES)})"
+        )
+
+    try:
+        return load_class(STRATEGIES[name])(
+            scorer, first=first, last=last, **(options or {})
+        )
+    except (TypeError, ValueError) as error:
+        raise InvalidJobError(f"Invalid options for strategy {name}: {error}")
@@ -0,0 +1,188 @@
+import logging
+
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.track import Track
+
+
+class Repair:
+    """
+    Locally repair a playlist after tracks were added to or removed from the library.
+
+    Removed tracks leave gaps that are bridged with short detours through unused
+    tracks, and added tracks are spliced where they fit best. No global search is
+    performed, so small library edits cost a fraction of a full generation.
+    """
+
+    def __init__(self, scorer: Scorer, max_bridge: int = 2):
+        """
+        Initialize repair with a scorer.
+
+        Arguments:
+            scorer {Scorer} -- The scorer to use for evaluating transitions.
+
+        Keyword Arguments:
+            max_bridge {int} -- Maximum number of tracks inserted to bridge a gap (default: {2}).
+        """
+        self.scorer = scorer
+        self.max_bridge = max_bridge
+
+    def repair(
+        self, library: Library, playlist: Playlist, added: List[Track]
+    ) -> Playlist:
+        """
+        Repair a playlist against the current state of the library.
+
+        Arguments:
+            library {Library} -- The library, already updated with the added and removed tracks.
+            playlist {Playlist} -- The playlist to repair.
+            added {List[Track]} -- Tracks that were added to the library.
+
+        Returns:
+            Playlist -- A playlist built from the previous one, neighbour-valid unless a gap could not be bridged.
+        """
+
+        # drop tracks that left the library, using the library's current objects
+        tracks: List[Track] = [
+            library.tracks[track.filename]
+            for track in playlist.tracks
+            if track.filename in library.tracks
+        ]
+
+        tracks = self._bridge_gaps(library, tracks)
+
+        for track in added:
+            if track.filename in library.tracks and track not in tracks:
+                self._splice(library, tracks, library.tracks[track.filename])
+
+        return Playlist(tracks)
+
+    def _bridge_gaps(self, library: Library, tracks: List[Track]) -> List[Track]:
+        """
+        Restore neighbour relationships between consecutive tracks.
+
+        Each gap is bridged with the shortest, then best scoring, detour through tracks
+        that are not part of the playlist. Gaps that cannot be bridged are kept as they
+        are and reported, rather than dropping part of the user's playlist.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            tracks {List[Track]} -- The playlist tracks, possibly with gaps.
+
+        Returns:
+            List[Track] -- The repaired list of tracks.
+        """
+
+        if not tracks:
+            return []
+
+        used: Set[str] = {track.filename for track in tracks}
+        repaired: List[Track] = [tracks[0]]
+
+        for track in tracks[1:]:
+            previous = repaired[-1]
+            if not track.is_neighbour(previous, library.compatibility):
+                bridge = self._find_bridge(library, previous, track, used)
+                if bridge is None:
+                    logging.warning(
+                        f"Could not bridge the gap between {previous.filename} and {track.filename}"
+                    )
+                else:
+                    used.update(bridged.filename for bridged in bridge)
+                    repaired.extend(bridge)
+
+            repaired.append(track)
+
+        return repaired
+
+    def _find_bridge(
+        self, library: Library, start: Track, end: Track, used: Set[str]
+    ) -> Optional[List[Track]]:
+        """
+        Find the tracks that can link two tracks of a playlist.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            start {Track} -- The track before the gap.
+            end {Track} -- The track after the gap.
+            used {Set[str]} -- Filenames of the tracks already in the playlist.
+
+        Returns:
+            Optional[List[Track]] -- The bridging tracks, or None if no bridge exists.
+        """
+
+        # breadth first search keeps detours as short as possible
+        best: Optional[Tuple[float, List[Track]]] = None
+        queue: Deque[Tuple[List[Track], float]] = deque([([start], 0.0)])
+
+        while queue:
+            path, cost = queue.popleft()
+            if best is not None and len(path) > len(best[1]) + 1:
+                break
+
+            last = path[-1]
+            if len(path) > 1 and end.is_neighbour(last, library.compatibility):
+                total = cost + self.scorer.score_transition(last, end)
+                if best is None or total < best[0]:
+                    best = (total, path[1:])
+                continue
+
+            if len(path) > self.max_bridge:
+                continue
+
+            for neighbour in library.neighbours[last.filename]:
+                if neighbour.filename in used or neighbour in path:
+                    continue
+                queue.append(
+                    (
+                        path + [neighbour],
+                        cost + self.scorer.score_transition(last, neighbour),
+                    )
+                )
+
+        return best[1] if best is not None else None
+
+    def _splice(self, library: Library, tracks: List[Track], track: Track) -> None:
+        """
+        Insert a track where it adds the least transition cost, if it fits anywhere.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            tracks {List[Track]} -- The playlist tracks, updated in place.
+            track {Track} -- The track to insert.
+        """
+
+        if not tracks:
+            tracks.append(track)
+            return
+
+        # candidate positions along with the cost they add to the playlist
+        positions: Dict[int, float] = {}
+
+        def fits(other: Track) -> bool:
+            return track.is_neighbour(other, library.compatibility)
+
+        if fits(tracks[0]):
+            positions[0] = self.scorer.score_transition(track, tracks[0])
+
+        for index in range(1, len(tracks)):
+            before, after = tracks[index - 1], tracks[index]
+            if fits(before) and fits(after):
+                positions[index] = (
+                    self.scorer.score_transition(before, track)
+                    + self.scorer.score_transition(track, after)
+                    - self.scorer.score_transition(before, after)
+                )
+
+        if fits(tracks[-1]):
+            positions.setdefault(
+                len(tracks), self.scorer.score_transition(tracks[-1], track)
+            )
+
+        if positions:
+            index = min(positions, key=lambda position: (positions[position], position))
+            tracks.insert(index, track)
@@ -1,8 +1,14 @@
+from __future__ import annotations
+
 from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
 
 from src.autotracks.playlist import Playlist
 from src.autotracks.track import Track
 
+if TYPE_CHECKING:
+    from src.autotracks.library import Library
+
 
 class Scorer(ABC):
     """
@@ -26,6 +32,63 @@ class Scorer(ABC):
         """
         pass
 
+    def prepare(self, library: Library) -> None:
+        """
+        Precompute whatever the scorer needs from a library, once before generation.
+
+        Arguments:
+            library {Library} -- The library playlists will be generated from.
+        """
+        pass
+
+    def score_transitions(
+        self, from_tracks: Sequence[Track], to_tracks: Sequence[Track]
+    ) -> List[float]:
+        """
+        Score many transitions at once, pairing tracks by position.
+
+        Strategies should prefer this method when scoring a whole neighbour list.
+        Scorers that can evaluate transitions in batch should override it.
+
+        Arguments:
+            from_tracks {Sequence[Track]} -- The current tracks.
+            to_tracks {Sequence[Track]} -- The next tracks, one for each current track.
+
+        Returns:
+            List[float] -- Transition distances (lower is better).
+        """
+        return [
+            self.score_transition(from_track, to_track)
+            for from_track, to_track in zip(from_tracks, to_tracks)
+        ]
+
+    def score_neighbours(
+        self, library: Library, filenames: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Score the transitions from many tracks to each of their neighbours.
+
+        Strategies should prefer this method when they walk a whole component, scoring
+        its transitions once. Scorers that keep their own copy of the library should
+        override it, to look the tracks up once.
+
+        Arguments:
+            library {Library} -- The library the tracks belong to.
+            filenames {Iterable[str]} -- Audio filenames of the current tracks.
+
+        Returns:
+            Dict[str, List[float]] -- For each current track, the distance to each of its
+            neighbours, in library.neighbours order (lower is better).
+        """
+        scores: Dict[str, List[float]] = {}
+        for filename in filenames:
+            neighbours = library.neighbours[filename]
+            scores[filename] = self.score_transitions(
+                [library.tracks[filename]] * len(neighbours), neighbours
+            )
+
+        return scores
+
     @abstractmethod
     def score_playlist(self, playlist: Playlist) -> float:
         """
@@ -33,4 +33,4 @@ class ByBPM(Scorer):
         Returns:
             float -- Total score (higher is better).
         """
-        return float(len(playlist.tracks))
+        return float(len(playlist))
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import itertools
+
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from src.autotracks.key import Key
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.track import Track
+
+if TYPE_CHECKING:
+    from src.autotracks.library import Library
+
+
+def key_position(key: Key) -> Tuple[int, int]:
+    """
+    Locate a key on the Camelot wheel.
+
+    Arguments:
+        key {Key} -- The key.
+
+    Returns:
+        Tuple[int, int] -- Position around the wheel, from 0 to 11, and 0 for minor keys or 1 for major keys.
+    """
+    return int(key.camelot[:-1]) - 1, int(key.camelot.endswith("B"))
+
+
+@dataclass
+class TrackColumns:
+    """
+    Columnar copy of the track attributes used for scoring.
+
+    Attributes:
+        tracks {List[Track]} -- The tracks the columns were extracted from, in row order.
+        index {Dict[int, int]} -- Row of each track, keyed by the identity of the track object.
+        bpm {np.ndarray} -- Tempo of each track.
+        wheel {np.ndarray} -- Position on the Camelot wheel, from 0 to 11.
+        mode {np.ndarray} -- 0 for minor keys, 1 for major keys.
+        duration {np.ndarray} -- Length in seconds, NaN when unknown.
+    """
+
+    tracks: List[Track]
+    index: Dict[int, int]
+    bpm: npt.NDArray[np.float64]
+    wheel: npt.NDArray[np.int64]
+    mode: npt.NDArray[np.int64]
+    duration: npt.NDArray[np.float64]
+
+    @classmethod
+    def from_tracks(cls, tracks: Sequence[Track]) -> TrackColumns:
+        """
+        Extract the columns from a list of tracks.
+
+        Arguments:
+            tracks {Sequence[Track]} -- Tracks to extract, in row order.
+
+        Returns:
+            TrackColumns -- The extracted columns.
+        """
+        positions = [key_position(track.metadata.key) for track in tracks]
+
+        return cls(
+            tracks=list(tracks),
+            index={id(track): row for row, track in enumerate(tracks)},
+            bpm=np.array([track.metadata.bpm for track in tracks], dtype=np.float64),
+            wheel=np.array([wheel for wheel, _ in positions], dtype=np.int64),
+            mode=np.array([mode for _, mode in positions], dtype=np.int64),
+            duration=np.array(
+                [
+                    np.nan
+                    if track.metadata.duration is None
+                    else track.metadata.duration
+                    for track in tracks
+                ],
+                dtype=np.float64,
+            ),
+        )
+
+    def rows(self, tracks: Sequence[Track]) -> Optional[List[int]]:
+        """
+        Find the rows of tracks, as long as the columns were extracted from these very tracks.
+
+        A track reloaded since then is a new object with the same filename, and its
+        row holds stale values.
+
+        Arguments:
+            tracks {Sequence[Track]} -- The tracks to find.
+
+        Returns:
+            Optional[List[int]] -- The row of each track, or None if one of them has no up to date row.
+        """
+        # the columns keep their tracks alive, so their identities cannot be reused
+        rows: List[Optional[int]] = [self.index.get(id(track)) for track in tracks]
+        if None in rows:
+            return None
+
+        return cast(List[int], rows)
+
+
+class Composite(Scorer):
+    """
+    Scores track transitions with a weighted sum of BPM, key and duration distances.
+
+    BPM distance accounts for half and double time, key distance is measured on the
+    Camelot wheel, and duration distance is relative to the longer of the two tracks.
+    Scoring runs on NumPy columns extracted once from the library, so the transitions
+    of a whole component are scored in a single vectorised call.
+    """
+
+    def __init__(
+        self,
+        bpm_weight: float = 1.0,
+        key_weight: float = 0.5,
+        duration_weight: float = 0.1,
+    ):
+        """
+        Initialize scorer with the weight of each distance.
+
+        Keyword Arguments:
+            bpm_weight {float} -- Weight of the BPM distance (default: {1.0}).
+            key_weight {float} -- Weight of the Camelot wheel distance (default: {0.5}).
+            duration_weight {float} -- Weight of the duration distance (default: {0.1}).
+        """
+        self.bpm_weight = bpm_weight
+        self.key_weight = key_weight
+        self.duration_weight = duration_weight
+        self.columns: TrackColumns | None = None
+
+    def prepare(self, library: Library) -> None:
+        """
+        Extract track attributes from the library into columns.
+
+        Arguments:
+            library {Library} -- The library playlists will be generated from.
+        """
+        self.columns = TrackColumns.from_tracks(list(library.tracks.values()))
+
+    def score_transition(self, from_track: Track, to_track: Track) -> float:
+        """
+        Score the weighted distance between two tracks.
+
+        A single transition is scored in plain Python, as looking tracks up in the
+        columns would cost more than the distances themselves.
+
+        Arguments:
+            from_track {Track} -- The current track.
+            to_track {Track} -- The next track.
+
+        Returns:
+            float -- Weighted distance (lower is better).
+        """
+        a, b = from_track.metadata.bpm, to_track.metadata.bpm
+        bpm = min(abs(a - b), abs(2 * a - b), abs(a - 2 * b))
+
+        from_wheel, from_mode = key_position(from_track.metadata.key)
+        to_wheel, to_mode = key_position(to_track.metadata.key)
+        steps = abs(from_wheel - to_wheel)
+        key = (min(steps, 12 - steps) + abs(from_mode - to_mode)) / 7
+
+        c, d = from_track.metadata.duration, to_track.metadata.duration
+        duration = (
+            abs(c - d) / max(c, d)
+            if c is not None and d is not None and max(c, d) > 0
+            else 0.0
+        )
+
+        return (
+            self.bpm_weight * bpm / 100
+            + self.key_weight * key
+            + self.duration_weight * duration
+        )
+
+    def score_transitions(
+        self, from_tracks: Sequence[Track], to_tracks: Sequence[Track]
+    ) -> List[float]:
+        """
+        Score many transitions at once, pairing tracks by position.
+
+        Arguments:
+            from_tracks {Sequence[Track]} -- The current tracks.
+            to_tracks {Sequence[Track]} -- The next tracks, one for each current track.
+
+        Returns:
+            List[float] -- Weighted distances (lower is better).
+        """
+        columns = self.columns
+        from_ids = columns.rows(from_tracks) if columns is not None else None
+        to_ids = columns.rows(to_tracks) if columns is not None else None
+
+        if columns is None or from_ids is None or to_ids is None:
+            # tracks outside of the prepared library, or reloaded since, get
+            # temporary columns
+            columns = TrackColumns.from_tracks([*from_tracks, *to_tracks])
+            from_ids = list(range(len(from_tracks)))
+            to_ids = list(range(len(from_tracks), len(from_tracks) + len(to_tracks)))
+
+        return self.score_ids(
+            columns,
+            np.array(from_ids, dtype=np.int64),
+            np.array(to_ids, dtype=np.int64),
+        ).tolist()
+
+    def score_neighbours(
+        self, library: Library, filenames: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Score the transitions from many tracks to each of their neighbours, in a single
+        vectorised call over the rows of the prepared columns.
+
+        Arguments:
+            library {Library} -- The library the tracks belong to.
+            filenames {Iterable[str]} -- Audio filenames of the current tracks.
+
+        Returns:
+            Dict[str, List[float]] -- For each current track, the distance to each of its
+            neighbours, in library.neighbours order (lower is better).
+        """
+        filenames = list(filenames)
+        neighbours = [library.neighbours[filename] for filename in filenames]
+
+        columns = self.columns
+        from_ids = (
+            columns.rows([library.tracks[filename] for filename in filenames])
+            if columns is not None
+            else None
+        )
+        to_ids = (
+            columns.rows(list(itertools.chain.from_iterable(neighbours)))
+            if columns is not None
+            else None
+        )
+        if columns is None or from_ids is None or to_ids is None:
+            return super().score_neighbours(library, filenames)
+
+        counts = [len(n) for n in neighbours]
+        scores = self.score_ids(
+            columns,
+            np.repeat(np.array(from_ids, dtype=np.int64), counts),
+            np.array(to_ids, dtype=np.int64),
+        ).tolist()
+
+        offsets = list(itertools.accumulate(counts, initial=0))
+
+        return {
+            filename: scores[start:end]
+            for filename, start, end in zip(filenames, offsets, offsets[1:])
+        }
+
+    def score_ids(
+        self,
+        columns: TrackColumns,
+        from_ids: npt.NDArray[np.int64],
+        to_ids: npt.NDArray[np.int64],
+    ) -> npt.NDArray[np.float64]:
+        """
+        Score transitions between rows of the track columns.
+
+        Arguments:
+            columns {TrackColumns} -- The track columns.
+            from_ids {np.ndarray} -- Rows of the current tracks.
+            to_ids {np.ndarray} -- Rows of the next tracks.
+
+        Returns:
+            np.ndarray -- Weighted distances (lower is better).
+        """
+        # BPM: closest of same, half and double time
+        a, b = columns.bpm[from_ids], columns.bpm[to_ids]
+        bpm = np.minimum(
+            np.abs(a - b), np.minimum(np.abs(2 * a - b), np.abs(a - 2 * b))
+        )
+
+        # key: steps around the Camelot wheel, plus one step to switch mode
+        steps = np.abs(columns.wheel[from_ids] - columns.wheel[to_ids])
+        steps = np.minimum(steps, 12 - steps)
+        switch = np.abs(columns.mode[from_ids] - columns.mode[to_ids])
+        key = (steps + switch) / 7
+
+        # duration: relative difference, ignored when unknown
+        c, d = columns.duration[from_ids], columns.duration[to_ids]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            duration = np.nan_to_num(np.abs(c - d) / np.maximum(c, d), nan=0.0)
+
+        return (
+            self.bpm_weight * bpm / 100
+            + self.key_weight * key
+            + self.duration_weight * duration
+        )
+
+    def score_playlist(self, playlist: Playlist) -> float:
+        """
+        Score a playlist based on its length, then on the smoothness of its transitions.
+
+        Arguments:
+            playlist {Playlist} -- Playlist to score.
+
+        Returns:
+            float -- Total score (higher is better).
+        """
+        tracks = playlist.tracks
+        if len(tracks) < 2:
+            return float(len(tracks))
+
+        distances = self.score_transitions(tracks[:-1], tracks[1:])
+
+        # the mean distance is kept below one so that length always prevails
+        return len(tracks) - min(sum(distances) / len(distances), 0.999)
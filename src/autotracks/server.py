@@ -0,0 +1,196 @@
+import json
+import logging
+import os
+import socketserver
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.error import (
+    InvalidJobError,
+    NotEnoughTracksError,
+    UnknownTrackError,
+)
+from src.autotracks.job import parse_job
+from src.autotracks.lock import ReadWriteLock
+from src.autotracks.track import Track
+
+
+class PlaylistService:
+    """
+    Answers playlist requests against a resident library.
+
+    Requests only read the library, so any number of them can run at once; updates
+    to the library must hold the write side of the lock.
+
+    Attributes:
+        autotracks {Autotracks} -- The loaded library.
+        lock {ReadWriteLock} -- Guards the library against concurrent updates.
+    """
+
+    def __init__(self, autotracks: Autotracks) -> None:
+        self.autotracks = autotracks
+        self.lock = ReadWriteLock()
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Describe the resident library.
+
+        Returns:
+            Dict[str, Any] -- Track, error and component counts.
+        """
+        with self.lock.read():
+            library = self.autotracks.library
+
+            return {
+                "tracks": len(library.tracks),
+                "errors": len(library.errors),
+                "components": len(library.components),
+            }
+
+    def playlist(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Generate playlists for a request and return the selected ones.
+
+        The request holds the same keys as a batch job, except for the output file:
+        strategy, scorer, first, last, all, strategy_options and scorer_options.
+
+        Arguments:
+            request {Dict[str, Any]} -- The decoded JSON request.
+
+        Returns:
+            Dict[str, Any] -- The selected playlist, or every playlist when "all" is set.
+        """
+        if "output" in request:
+            raise InvalidJobError("Requests cannot write playlists to files")
+
+        job = parse_job(request)
+
+        with self.lock.read():
+            strategy = self.autotracks.make_strategy(job)
+            playlists = self.autotracks.generate_playlists(strategy)
+
+            if not job.all:
+                playlists = [self.autotracks.select_playlist(strategy, playlists)]
+
+            return {
+                "playlists": [
+                    {
+                        "score": playlist.score(strategy.scorer),
+                        "tracks": [self._describe(track) for track in playlist.tracks],
+                    }
+                    for playlist in playlists
+                    if not playlist.is_empty()
+                ]
+            }
+
+    def _describe(self, track: Track) -> Dict[str, Any]:
+        """
+        Describe a track for a JSON response.
+
+        Arguments:
+            track {Track} -- The track to describe.
+
+        Returns:
+            Dict[str, Any] -- The track filename and metadata.
+        """
+        return {
+            "filename": track.filename,
+            "key": str(track.metadata.key),
+            "bpm": track.metadata.bpm,
+            "duration": track.metadata.duration,
+        }
+
+
+class PlaylistRequestHandler(BaseHTTPRequestHandler):
+    """
+    JSON over HTTP front-end for a PlaylistService.
+
+    GET /status describes the library, POST /playlist generates playlists.
+    """
+
+    service: PlaylistService
+
+    def do_GET(self) -> None:
+        if self.path != "/status":
+            self._respond(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        self._respond(200, self.service.status())
+
+    def do_POST(self) -> None:
+        if self.path != "/playlist":
+            self._respond(404, {"error": f"Unknown path: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(request, dict):
+                raise InvalidJobError("Request must be a JSON object")
+
+            self._respond(200, self.service.playlist(request))
+        except (ValueError, InvalidJobError, UnknownTrackError) as error:
+            message = getattr(error, "message", str(error))
+            self._respond(400, {"error": message})
+        except NotEnoughTracksError as error:
+            self._respond(422, {"error": error.message})
+        except Exception:
+            # keep answering: the client gets an error rather than a dropped connection
+            logging.exception(f"Request failed: {self.path}")
+            self._respond(500, {"error": "Internal server error"})
+
+    def _respond(self, status: int, body: Dict[str, Any]) -> None:
+        payload = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self) -> str:
+        # Unix sockets have no client address
+        return str(self.client_address[0]) if self.client_address else "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logging.debug(f"{self.address_string()} {format % args}")
+
+
+class ThreadingUnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """
+    HTTP server listening on a Unix socket, one thread per request.
+    """
+
+    daemon_threads = True
+
+
+def make_server(
+    service: PlaylistService,
+    address: Optional[Tuple[str, int]] = None,
+    socket_filename: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """
+    Build an HTTP server for a playlist service, on a TCP address or a Unix socket.
+
+    Arguments:
+        service {PlaylistService} -- The service answering requests.
+
+    Keyword Arguments:
+        address {Optional[Tuple[str, int]]} -- Host and port to listen on (default: {None}).
+        socket_filename {Optional[str]} -- Unix socket to listen on, preferred over address (default: {None}).
+
+    Returns:
+        socketserver.BaseServer -- The server, ready to serve_forever().
+    """
+    handler = type(
+        "BoundPlaylistRequestHandler", (PlaylistRequestHandler,), {"service": service}
+    )
+
+    if socket_filename:
+        if os.path.exists(socket_filename):
+            os.remove(socket_filename)
+        return ThreadingUnixHTTPServer(socket_filename, handler)
+
+    return ThreadingHTTPServer(address or ("127.0.0.1", 8000), handler)
@@ -0,0 +1,67 @@
+import hashlib
+import os
+
+from typing import List, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """
+    Parse a shard specification such as "3/16", the third of sixteen shards.
+
+    Arguments:
+        spec {str} -- The shard specification, numbered from 1.
+
+    Returns:
+        Tuple[int, int] -- The shard index, numbered from 0, and the number of shards.
+
+    Raises:
+        ValueError -- If the specification is malformed or out of range.
+    """
+    number, separator, count = spec.partition("/")
+    if not separator:
+        raise ValueError(f"Expected a shard as I/N, got: {spec}")
+
+    index, total = int(number) - 1, int(count)
+    if total < 1 or not 0 <= index < total:
+        raise ValueError(f"Shard out of range: {spec}")
+
+    return index, total
+
+
+def shard_of(path: str, count: int) -> int:
+    """
+    Assign a path to a shard, the same way on every machine.
+
+    Arguments:
+        path {str} -- The path, relative to the root of the scanned tree.
+        count {int} -- The number of shards.
+
+    Returns:
+        int -- The shard index, numbered from 0.
+    """
+    digest = hashlib.sha1(path.replace(os.sep, "/").encode()).digest()
+
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def select_shard(filenames: List[str], root: str, index: int, count: int) -> List[str]:
+    """
+    Keep the files that belong to a shard.
+
+    Files are assigned by their path relative to the root, so that machines mounting
+    the same tree at different places agree on the shards.
+
+    Arguments:
+        filenames {List[str]} -- The scanned filenames.
+        root {str} -- The root of the scanned tree.
+        index {int} -- The shard index, numbered from 0.
+        count {int} -- The number of shards.
+
+    Returns:
+        List[str] -- The filenames of the shard.
+    """
+    return [
+        filename
+        for filename in filenames
+        if shard_of(os.path.relpath(filename, root), count) == index
+    ]
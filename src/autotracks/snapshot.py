@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.autotracks.error import (
+    AudioAnalysisError,
+    Error,
+    MalformedMetaFileError,
+)
+from src.autotracks.key import KEYS, key_code
+from src.autotracks.track import Track, TrackMetadata
+
+if TYPE_CHECKING:
+    from src.autotracks.library import Library
+
+
+# Binary layout, all values little-endian:
+#   header     -- magic, version, manifest digest, track/edge counts, blob size
+#   bpm        -- float64 per track
+#   duration   -- float64 per track, NaN when unknown
+#   offsets    -- uint32 per track + 1, start of each track's neighbours in targets
+#   targets    -- uint32 per neighbour relationship, row of the neighbour track
+#   key        -- uint8 per track, key code
+#   blob       -- UTF-8 JSON holding filenames and analysis errors
+SNAPSHOT_MAGIC = b"ATSNAP\0\0"
+SNAPSHOT_VERSION = 1
+HEADER = struct.Struct("<8sI32sIIQ")
+
+# Errors that can be restored from a snapshot, by class name; others are restored as
+# analysis errors, keeping their message
+ERROR_TYPES: Dict[str, type[Error]] = {
+    "AudioAnalysisError": AudioAnalysisError,
+    "MalformedMetaFileError": MalformedMetaFileError,
+}
+
+
+def manifest_digest(
+    filenames: List[str], mixing_rules: Tuple[str, ...], analyse: bool
+) -> bytes:
+    """
+    Fingerprint the scanned files and the settings a snapshot depends on.
+
+    Any file added, removed or modified since the snapshot was saved changes the digest.
+    The .meta file of every scanned file is always included, whether it was scanned
+    or not, so that caching fresh analysis results does not invalidate the snapshot.
+    A library loaded without analysis reports fresh files as errors instead of
+    analysing them, so its snapshot is kept apart from an analysed one.
+
+    Arguments:
+        filenames {List[str]} -- The scanned filenames.
+        mixing_rules {Tuple[str, ...]} -- The mixing rules the neighbour graph was built with.
+        analyse {bool} -- Whether files without cached metadata were analysed.
+
+    Returns:
+        bytes -- The SHA-256 digest of the manifest.
+    """
+    manifest = set(filenames)
+    manifest.update(f"{f}.meta" for f in filenames if not f.endswith(".meta"))
+
+    digest = hashlib.sha256()
+    digest.update(",".join(mixing_rules).encode())
+    digest.update(b"\0analysed" if analyse else b"\0cached")
+
+    for filename in sorted(manifest):
+        try:
+            stat = os.stat(filename)
+            digest.update(f"\0{filename}\0{stat.st_size}\0{stat.st_mtime_ns}".encode())
+        except OSError:
+            digest.update(f"\0{filename}\0missing".encode())
+
+    return digest.digest()
+
+
+def save_snapshot(library: Library, snapshot_filename: str, digest: bytes) -> None:
+    """
+    Save a library's tracks, errors and neighbour graph to a snapshot file.
+
+    The file is written next to its destination, then moved into place, so a reader
+    never sees a partial snapshot.
+
+    Arguments:
+        library {Library} -- The library to save.
+        snapshot_filename {str} -- The path to the snapshot file.
+        digest {bytes} -- The manifest digest the library was loaded from.
+    """
+    tracks = list(library.tracks.values())
+    rows = {track.filename: row for row, track in enumerate(tracks)}
+
+    offsets = np.zeros(len(tracks) + 1, dtype="<u4")
+    targets: List[int] = []
+    for row, track in enumerate(tracks):
+        targets.extend(rows[n.filename] for n in library.neighbours[track.filename])
+        offsets[row + 1] = len(targets)
+
+    blob = json.dumps(
+        {
+            "tracks": [[track.filename, track.metadata_filename] for track in tracks],
+            "errors": [
+                [filename, type(error).__name__, error.message]
+                for filename, error in library.errors.items()
+            ],
+        }
+    ).encode()
+
+    temporary_filename = f"{snapshot_filename}.tmp"
+    with open(temporary_filename, "wb") as snapshot:
+        snapshot.write(
+            HEADER.pack(
+                SNAPSHOT_MAGIC,
+                SNAPSHOT_VERSION,
+                digest,
+                len(tracks),
+                len(targets),
+                len(blob),
+            )
+        )
+        snapshot.write(
+            np.array([t.metadata.bpm for t in tracks], dtype="<f8").tobytes()
+        )
+        snapshot.write(
+            np.array(
+                [
+                    np.nan if t.metadata.duration is None else t.metadata.duration
+                    for t in tracks
+                ],
+                dtype="<f8",
+            ).tobytes()
+        )
+        snapshot.write(offsets.tobytes())
+        snapshot.write(np.array(targets, dtype="<u4").tobytes())
+        snapshot.write(
+            np.array([key_code(t.metadata.key) for t in tracks], dtype="u1").tobytes()
+        )
+        snapshot.write(blob)
+
+    os.replace(temporary_filename, snapshot_filename)
+
+
+def load_snapshot(
+    snapshot_filename: str, digest: bytes
+) -> Optional[Tuple[Dict[str, Track], Dict[str, Error], Dict[str, List[Track]]]]:
+    """
+    Load tracks, errors and the neighbour graph from a snapshot file.
+
+    The columns are decoded straight from the memory-mapped file, but tracks and
+    neighbour lists are still built as Python objects: a warm start skips parsing
+    .meta files and searching for neighbours, yet remains linear in the size of the
+    library and its graph.
+
+    Arguments:
+        snapshot_filename {str} -- The path to the snapshot file.
+        digest {bytes} -- The manifest digest of the current scan.
+
+    Returns:
+        Optional[Tuple] -- Tracks, errors and neighbours, or None if the snapshot is
+        missing, from another version, or does not match the current scan.
+    """
+    try:
+        with open(snapshot_filename, "rb") as snapshot:
+            with mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return _read_snapshot(view, digest)
+    except (OSError, ValueError, KeyError, IndexError, struct.error):
+        return None
+
+
+def _read_snapshot(
+    view: mmap.mmap, digest: bytes
+) -> Optional[Tuple[Dict[str, Track], Dict[str, Error], Dict[str, List[Track]]]]:
+    """
+    Decode a memory-mapped snapshot.
+
+    Arguments:
+        view {mmap.mmap} -- The mapped snapshot file.
+        digest {bytes} -- The manifest digest of the current scan.
+
+    Returns:
+        Optional[Tuple] -- Tracks, errors and neighbours, or None if the snapshot is stale.
+    """
+    magic, version, saved_digest, count, edges, blob_size = HEADER.unpack_from(view, 0)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION or saved_digest != digest:
+        return None
+
+    offset = HEADER.size
+    bpm = np.frombuffer(view, dtype="<f8", count=count, offset=offset)
+    offset += bpm.nbytes
+    duration = np.frombuffer(view, dtype="<f8", count=count, offset=offset)
+    offset += duration.nbytes
+    offsets = np.frombuffer(view, dtype="<u4", count=count + 1, offset=offset)
+    offset += offsets.nbytes
+    targets = np.frombuffer(view, dtype="<u4", count=edges, offset=offset)
+    offset += targets.nbytes
+    codes = np.frombuffer(view, dtype="u1", count=count, offset=offset)
+    offset += codes.nbytes
+    blob = json.loads(bytes(view[offset : offset + blob_size]))
+
+    tracks: List[Track] = [
+        Track(
+            audio_filename,
+            metadata_filename,
+            TrackMetadata(
+                bpm=track_bpm,
+                key=KEYS[code],
+                duration=None if math.isnan(track_duration) else track_duration,
+            ),
+        )
+        for (audio_filename, metadata_filename), track_bpm, track_duration, code in zip(
+            blob["tracks"], bpm.tolist(), duration.tolist(), codes.tolist()
+        )
+    ]
+
+    row_offsets: List[int] = offsets.tolist()
+    row_targets: List[int] = targets.tolist()
+    neighbours: Dict[str, List[Track]] = {
+        track.filename: [
+            tracks[target]
+            for target in row_targets[row_offsets[row] : row_offsets[row + 1]]
+        ]
+        for row, track in enumerate(tracks)
+    }
+
+    errors: Dict[str, Error] = {
+        filename: ERROR_TYPES.get(name, AudioAnalysisError)(message)
+        for filename, name, message in blob["errors"]
+    }
+
+    return {track.filename: track for track in tracks}, errors, neighbours
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+from src.autotracks.key import KEYS
+from src.autotracks.library import Library
+
+
+@dataclass
+class LibraryStats:
+    """
+    Size and shape of a library and of its neighbour graph.
+
+    Attributes:
+        tracks {int} -- Number of tracks.
+        errors {int} -- Number of files that could not be loaded.
+        keys {Dict[str, int]} -- Number of tracks in each key, in key code order.
+        edges {int} -- Number of neighbour relationships.
+        density {float} -- Ratio of neighbour relationships to track pairs.
+        components {List[int]} -- Size of each connected component, largest first.
+        search_pairs {int} -- Number of (first, last) pairs the exhaustive search considers.
+        search_transitions {int} -- Number of transitions the exhaustive search scores.
+    """
+
+    tracks: int
+    errors: int
+    keys: Dict[str, int]
+    edges: int
+    density: float
+    components: List[int]
+    search_pairs: int
+    search_transitions: int
+
+
+def library_stats(library: Library) -> LibraryStats:
+    """
+    Describe a library without generating any playlist.
+
+    The search cost is estimated for the DFS strategy: every transition of a component
+    is scored once, then a walk is followed from each first track.
+
+    Arguments:
+        library {Library} -- The library to describe.
+
+    Returns:
+        LibraryStats -- The library statistics.
+    """
+    counts = [0] * len(KEYS)
+    for track in library.tracks.values():
+        counts[track.key_code] += 1
+
+    directed_edges = sum(len(n) for n in library.neighbours.values())
+    size = len(library.tracks)
+    pairs = size * (size - 1) // 2
+
+    search_pairs = 0
+    search_transitions = 0
+    for component in library.components:
+        component_edges = sum(len(library.neighbours[f]) for f in component)
+        if len(component) > 1:
+            search_pairs += len(component) * (len(component) - 1)
+            search_transitions += component_edges
+
+    return LibraryStats(
+        tracks=size,
+        errors=len(library.errors),
+        keys={str(key.standard): count for key, count in zip(KEYS, counts) if count},
+        edges=directed_edges // 2,
+        density=directed_edges / 2 / pairs if pairs else 0.0,
+        components=[len(component) for component in library.components],
+        search_pairs=search_pairs,
+        search_transitions=search_transitions,
+    )
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import os
+
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, TextIO
+
+from src.autotracks.key import lookup_key
+from src.autotracks.track import Track, TrackMetadata
+
+
+@dataclass
+class StoreRecord:
+    """
+    Analysis result of one audio file.
+
+    Attributes:
+        path {str} -- The audio file path, relative to the root of the scanned tree.
+        bpm {float} -- The analysed BPM.
+        key {str} -- The analysed key, in standard notation.
+        duration {Optional[float]} -- The duration in seconds, if known.
+        mtime_ns {int} -- Modification time of the audio file when it was analysed.
+    """
+
+    path: str
+    bpm: float
+    key: str
+    duration: Optional[float]
+    mtime_ns: int
+
+    def to_track(self, root: str) -> Track:
+        """
+        Build the track described by the record.
+
+        Arguments:
+            root {str} -- The root of the tree the record path is relative to.
+
+        Returns:
+            Track -- The track, with its metadata filename next to the audio file.
+        """
+        audio_filename = os.path.join(root, self.path)
+        metadata = TrackMetadata(
+            bpm=self.bpm, key=lookup_key(self.key), duration=self.duration
+        )
+
+        return Track(audio_filename, f"{audio_filename}.meta", metadata)
+
+
+def read_store(filename: str) -> Dict[str, StoreRecord]:
+    """
+    Read the records of a result store.
+
+    A store is a JSON Lines file with one record per line. When a path appears several
+    times, the record with the newest mtime wins, then the last one.
+
+    Arguments:
+        filename {str} -- The path to the store.
+
+    Returns:
+        Dict[str, StoreRecord] -- The records, keyed by path.
+    """
+    records: Dict[str, StoreRecord] = {}
+
+    with open(filename) as store_file:
+        for line in store_file:
+            # a line cut short by an interrupted run is skipped
+            try:
+                record = StoreRecord(**json.loads(line))
+            except (json.JSONDecodeError, TypeError):
+                continue
+
+            _keep_newest(records, record)
+
+    return records
+
+
+def merge_stores(filenames: List[str]) -> Dict[str, StoreRecord]:
+    """
+    Combine several result stores, the record with the newest mtime winning conflicts.
+
+    Arguments:
+        filenames {List[str]} -- The paths to the stores, later ones winning ties.
+
+    Returns:
+        Dict[str, StoreRecord] -- The merged records, keyed by path.
+    """
+    records: Dict[str, StoreRecord] = {}
+
+    for filename in filenames:
+        for record in read_store(filename).values():
+            _keep_newest(records, record)
+
+    return records
+
+
+def write_store(records: Dict[str, StoreRecord], filename: str) -> None:
+    """
+    Write records to a new result store.
+
+    Arguments:
+        records {Dict[str, StoreRecord]} -- The records, keyed by path.
+        filename {str} -- The path to the store.
+    """
+    with open(filename, "w") as store_file:
+        for path in sorted(records):
+            print(json.dumps(asdict(records[path])), file=store_file)
+
+
+def _keep_newest(records: Dict[str, StoreRecord], record: StoreRecord) -> None:
+    """
+    Add a record unless a newer one is already known for its path.
+
+    Arguments:
+        records {Dict[str, StoreRecord]} -- The records, keyed by path.
+        record {StoreRecord} -- The candidate record.
+    """
+    known = records.get(record.path)
+    if known is None or record.mtime_ns >= known.mtime_ns:
+        records[record.path] = record
+
+
+class ResultStore:
+    """
+    Append-only result store that analysis writes to instead of .meta files.
+
+    Records are appended and flushed one at a time, so that an interrupted run keeps
+    its results and can resume where it stopped. Used as a context manager, the store
+    file is closed on exit.
+
+    Attributes:
+        filename {str} -- The path to the store.
+        root {str} -- The root of the scanned tree, that record paths are relative to.
+        records {Dict[str, StoreRecord]} -- The records, keyed by path.
+    """
+
+    def __init__(self, filename: str, root: str) -> None:
+        self.filename = filename
+        self.root = root
+        self.records = read_store(filename) if os.path.isfile(filename) else {}
+        self._file: Optional[TextIO] = None
+
+    def path(self, audio_filename: str) -> str:
+        """
+        Key of an audio file in the store.
+
+        Arguments:
+            audio_filename {str} -- The path to the audio file.
+
+        Returns:
+            str -- The path relative to the root.
+        """
+        return os.path.relpath(audio_filename, self.root)
+
+    def __contains__(self, audio_filename: str) -> bool:
+        record = self.records.get(self.path(audio_filename))
+
+        # a file modified after its analysis needs to be analysed again
+        try:
+            return (
+                record is not None
+                and record.mtime_ns == os.stat(audio_filename).st_mtime_ns
+            )
+        except FileNotFoundError:
+            return False
+
+    def add(self, track: Track) -> None:
+        """
+        Record the analysis result of a track.
+
+        Arguments:
+            track {Track} -- The analysed track.
+        """
+        record = StoreRecord(
+            path=self.path(track.filename),
+            bpm=track.metadata.bpm,
+            key=track.metadata.key.standard,
+            duration=track.metadata.duration,
+            mtime_ns=os.stat(track.filename).st_mtime_ns,
+        )
+        self.records[record.path] = record
+
+        if self._file is None:
+            self._file = open(self.filename, "a")
+        print(json.dumps(asdict(record)), file=self._file, flush=True)
+
+    def close(self) -> None:
+        """
+        Close the store file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> ResultStore:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.close()
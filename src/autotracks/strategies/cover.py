@@ -0,0 +1,147 @@
+from collections import deque
+from typing import Deque, Dict, List, Set, Tuple
+
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.strategy import Strategy
+from src.autotracks.track import Track
+
+
+class Cover(Strategy):
+    def generate_playlists(self, library: Library) -> List[Playlist]:
+        """
+        Partition the whole library into as few playlists as possible, so that every
+        track appears in exactly one of them.
+
+        Finding a minimum path cover is NP-hard on general graphs, so each connected
+        component is covered greedily: a path is started from the track with the fewest
+        remaining neighbours, then grown at both ends. The next track is the one that
+        has the fewest remaining neighbours itself, ties being broken by the scorer.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+
+        Returns:
+            List[Playlist] -- Playlists covering every track of the library, longest first.
+        """
+
+        playlists: List[Playlist] = []
+
+        for component in library.components:
+            playlists.extend(self._cover_component(library, component))
+
+        return sorted(playlists, key=lambda playlist: len(playlist), reverse=True)
+
+    def select_playlist(self, playlists: List[Playlist]) -> Playlist:
+        """
+        Select the best scoring playlist of the cover.
+
+        Returns:
+            {Playlist} -- The best playlist from the list, or an empty playlist if the list is empty.
+        """
+
+        return max(
+            playlists,
+            key=lambda playlist: playlist.score(self.scorer),
+            default=Playlist([]),
+        )
+
+    def _cover_component(self, library: Library, component: Set[str]) -> List[Playlist]:
+        """
+        Greedily cover a connected component with vertex-disjoint paths.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            component {Set[str]} -- Filenames of the tracks in the component.
+
+        Returns:
+            List[Playlist] -- Playlists covering every track of the component.
+        """
+
+        playlists: List[Playlist] = []
+
+        # number of neighbours that are not part of a playlist yet
+        degrees: Dict[str, int] = {
+            filename: len(library.neighbours[filename]) for filename in component
+        }
+        remaining: Set[str] = set(component)
+
+        def take(track: Track) -> None:
+            remaining.discard(track.filename)
+            for neighbour in library.neighbours[track.filename]:
+                degrees[neighbour.filename] -= 1
+
+        while remaining:
+            # dead ends make the best path extremities
+            start = library.tracks[
+                min(remaining, key=lambda filename: (degrees[filename], filename))
+            ]
+            take(start)
+
+            path: Deque[Track] = deque([start])
+            grow_tail = True
+            while True:
+                end = path[-1] if grow_tail else path[0]
+                candidate = self._next_track(
+                    library, end, remaining, degrees, grow_tail
+                )
+
+                if candidate is None:
+                    if not grow_tail:
+                        break
+                    # the tail is stuck, try to grow the path from its head instead
+                    grow_tail = False
+                    continue
+
+                take(candidate)
+                if grow_tail:
+                    path.append(candidate)
+                else:
+                    path.appendleft(candidate)
+
+            playlists.append(Playlist(list(path)))
+
+        return playlists
+
+    def _next_track(
+        self,
+        library: Library,
+        end: Track,
+        remaining: Set[str],
+        degrees: Dict[str, int],
+        forward: bool,
+    ) -> Track | None:
+        """
+        Pick the track that should extend one end of a path.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            end {Track} -- The track at the end of the path being grown.
+            remaining {Set[str]} -- Filenames of the tracks not part of a playlist yet.
+            degrees {Dict[str, int]} -- Number of remaining neighbours for each track.
+            forward {bool} -- True when appending after end, False when prepending before it.
+
+        Returns:
+            Track | None -- The next track, or None if the end cannot be extended.
+        """
+
+        neighbours = [
+            neighbour
+            for neighbour in library.neighbours[end.filename]
+            if neighbour.filename in remaining
+        ]
+        scores = (
+            self.scorer.score_transitions([end] * len(neighbours), neighbours)
+            if forward
+            else self.scorer.score_transitions(neighbours, [end] * len(neighbours))
+        )
+
+        best: Tuple[int, float] | None = None
+        best_track: Track | None = None
+
+        for score, neighbour in zip(scores, neighbours):
+            key = (degrees[neighbour.filename], score)
+            if best is None or key < best:
+                best, best_track = key, neighbour
+
+        return best_track
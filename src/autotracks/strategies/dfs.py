@@ -1,21 +1,35 @@
+from __future__ import annotations
+
 import logging
 import math
 
-from typing import Dict, List, Optional, Set, Tuple
-
-from tqdm import tqdm
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
+from src.autotracks.config import TRACE_LOGGER
 from src.autotracks.library import Library
+from src.autotracks.metrics import metrics
 from src.autotracks.playlist import Playlist
 from src.autotracks.strategy import Strategy
 from src.autotracks.track import Track
 
+if TYPE_CHECKING:
+    from tqdm import tqdm
+
+trace = logging.getLogger(TRACE_LOGGER)
+
 
 class DFS(Strategy):
     def generate_playlists(self, library: Library) -> List[Playlist]:
         """
         Explore every possible graph for the track list and generate every playlist.
 
+        Tracks in different connected components of the neighbour graph can never be
+        linked, so each component is searched on its own and (first, last) pairs that
+        straddle two components are never tried.
+
+        When the strategy is anchored, only the component of the anchors is searched,
+        and only pairs that start (or end) with the anchored tracks are tried.
+
         Arguments:
             library {Library} -- The considered library of tracks.
 
@@ -26,40 +40,107 @@ class DFS(Strategy):
 
         playlists: List[Playlist] = []
 
-        tracks = list(library.tracks.items())
-        total_combinations = len(tracks) * (len(tracks) - 1)
+        # a component made of a single track cannot hold a (first, last) pair
+        components = [
+            c
+            for c in library.components
+            if len(c) > 1
+            and (self.first is None or self.first.filename in c)
+            and (self.last is None or self.last.filename in c)
+        ]
+        total_combinations = sum(
+            len(self._firsts(c)) * len(self._lasts(c))
+            - len(self._firsts(c) & self._lasts(c))
+            for c in components
+        )
         total_neighbours = sum(len(n) for n in library.neighbours.values())
 
-        logging.info(f"Total tracks: {len(library.tracks)}")
-        logging.info(f"Total combinations: {total_combinations}")
-        logging.info(f"Total neighbour relationships: {total_neighbours}")
+        logging.info("Total tracks: %d", len(library.tracks))
+        logging.info("Total components: %d", len(library.components))
+        logging.info("Total combinations: %d", total_combinations)
+        logging.info("Total neighbour relationships: %d", total_neighbours)
         logging.info(
-            f"Average neighbours per track: {total_neighbours / len(library.tracks):.1f}"
+            "Average neighbours per track: %.1f", total_neighbours / len(library.tracks)
         )
 
+        from tqdm import tqdm
+
         with tqdm(
             total=total_combinations, desc="Generating playlists", unit="path"
         ) as pbar:
-            for first_filename, first_track in library.tracks.items():
-                logging.debug("⚙ Building and comparing playlists...")
-                logging.debug(f"  › Starting with: {first_filename}")
-
-                all_last_tracks = [
-                    (filename, track)
-                    for (filename, track) in library.tracks.items()
-                    if filename != first_filename
-                ]
-                for last_filename, last_track in all_last_tracks:
-                    logging.debug(f"    › Ending with: {last_filename}")
-
-                    playlist = self._create_playlist(library, first_track, last_track)
-                    if not playlist.is_empty():
-                        playlists.append(playlist)
-                        logging.debug(f"      » {len(playlist.tracks)} tracks.")
+            for component in components:
+                playlists.extend(
+                    self._generate_component_playlists(library, component, pbar)
+                )
+
+        return playlists
+
+    def _generate_component_playlists(
+        self, library: Library, component: Set[str], pbar: tqdm
+    ) -> List[Playlist]:
+        """
+        Generate the playlists for every (first, last) pair of a connected component.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            component {Set[str]} -- Filenames of the tracks in the component.
+            pbar {tqdm} -- Progress bar to update after each pair.
+
+        Returns:
+            List[Playlist] -- The playlists discovered in the component.
+        """
+
+        playlists: List[Playlist] = []
+
+        # follow library order within the component
+        tracks = [
+            (filename, track)
+            for filename, track in library.tracks.items()
+            if filename in component
+        ]
+
+        firsts, lasts = self._firsts(component), self._lasts(component)
+
+        # per-pair traces are opt-in, check once instead of formatting n² records
+        tracing = trace.isEnabledFor(logging.DEBUG)
+
+        # a walk only follows the transitions reachable from its first track, so the
+        # transitions of the whole component are scored once for every first track
+        with metrics.phase("dfs.discover_graph"):
+            graph = self._discover_graph(library, component)
+
+        for first_filename, first_track in tracks:
+            if first_filename not in firsts:
+                continue
+
+            if tracing:
+                trace.debug("⚙ Building and comparing playlists...")
+                trace.debug("  › Starting with: %s", first_filename)
+
+            # the path to each last track is a prefix of the same walk from the first
+            # track, so the walk is computed once for all last tracks
+            with metrics.phase("dfs.paths"):
+                prefixes = self._get_paths(first_track, graph, self.last)
+
+            all_last_tracks = [
+                (filename, track)
+                for (filename, track) in tracks
+                if filename != first_filename and filename in lasts
+            ]
+            for last_filename, last_track in all_last_tracks:
+                playlist = prefixes.get(last_filename)
+                if playlist is not None:
+                    playlists.append(playlist)
+
+                if tracing:
+                    trace.debug("    › Ending with: %s", last_filename)
+                    if playlist is not None:
+                        trace.debug("      » %d tracks.", len(playlist))
                     else:
-                        logging.debug("      » No possible playlist in this case.")
+                        trace.debug("      » No possible playlist in this case.")
 
-                    pbar.update(1)
+            # one progress update per first track rather than per pair
+            pbar.update(len(all_last_tracks))
 
         return playlists
 
@@ -71,52 +152,52 @@ class DFS(Strategy):
             {Playlist} -- The longest playlist from the list, or an empty playlist is the list is empty.
         """
 
-        return next(
-            iter(sorted(playlists, key=self.scorer.score_playlist, reverse=True)),
-            Playlist([]),
+        return max(
+            playlists,
+            key=lambda playlist: playlist.score(self.scorer),
+            default=Playlist([]),
         )
 
-    def _create_playlist(self, library: Library, first: Track, last: Track) -> Playlist:
+    def _firsts(self, component: Set[str]) -> Set[str]:
         """
-        Discover the library's graph by drawing every path betweens tracks, starting
-        from the provided first track. Keep the longest path and save it as a playlist.
+        List the tracks of a component that a playlist may open with.
 
         Arguments:
-            library {Library} -- The considered library of tracks.
-            first {Track} -- A track object that will be the first track in the playlist.
-            last {Track} -- A track object that will be the last track in the playlist.
+            component {Set[str]} -- Filenames of the tracks in the component.
 
         Returns:
-            {Playlist} -- The resulting playlist for the longest path from the provided
-            first track to the provided last track.
+            {Set[str]} -- The anchored first track, or every track of the component.
         """
 
-        # discover all paths between the first and the last tracks
-        graph: Dict[str, List[Tuple[float, Track]]] = self._discover_graph(
-            library, first
-        )
+        return {self.first.filename} if self.first is not None else component
 
-        # create playlists from paths in the graph
-        paths: List[List[Track]] = self._get_paths(first, last, graph)
-        playlists: List[Playlist] = [Playlist(path_tracks) for path_tracks in paths]
+    def _lasts(self, component: Set[str]) -> Set[str]:
+        """
+        List the tracks of a component that a playlist may close with.
 
-        # only keep the best scoring playlist
-        return self.select_playlist(playlists)
+        Arguments:
+            component {Set[str]} -- Filenames of the tracks in the component.
+
+        Returns:
+            {Set[str]} -- The anchored last track, or every track of the component.
+        """
+
+        return {self.last.filename} if self.last is not None else component
 
     def _discover_graph(
         self,
         library: Library,
-        first: Track,
-        visited: Optional[Set[str]] = None,
+        component: Set[str],
     ) -> Dict[str, List[Tuple[float, Track]]]:
         """
         Represent the "possible playlists problem" as a graph problem: tracks are nodes
         and edges connect tracks in the same neighbourhood.
 
+        Every transition of the component is scored in a single call to the scorer.
+
         Arguments:
             library {Library} -- The library containing all tracks and their neighbourhoods.
-            first {Track} -- The starting track from which to build the graph.
-            visited {Optional[Set[str]]} -- Set of track filenames already visited to prevent cycles. Can be None for initial calls.
+            component {Set[str]} -- Filenames of the tracks in the component.
 
         Returns:
             {Dict} -- A dictionary representing the graph, where each key is a track filename
@@ -124,95 +205,56 @@ class DFS(Strategy):
             next tracks in playlists.
         """
 
-        if visited is None:
-            visited = set()
+        scores = self.scorer.score_neighbours(library, component)
 
-        if first.filename in visited:
-            return {}
-
-        # include current track in the visited set
-        visited.add(first.filename)
-
-        graph: Dict[str, List[Tuple[float, Track]]] = {}
-        graph[first.filename] = self._find_successors(library, first)
-
-        for _, next_track in graph[first.filename]:
-            if next_track.filename not in visited:
-                subgraph = self._discover_graph(library, next_track, visited)
-                graph.update(subgraph)
-
-        return graph
+        return {
+            filename: list(zip(scores[filename], library.neighbours[filename]))
+            for filename in component
+        }
 
     def _get_paths(
         self,
         first_track: Track,
-        last_track: Track,
         graph: Dict[str, List[Tuple[float, Track]]],
-        path: List[Track] = [],
-    ) -> List[List[Track]]:
+        last_track: Optional[Track] = None,
+    ) -> Dict[str, Playlist]:
         """
-        Recursive Depth First Search to get all paths from a starting track to an ending track.
+        Depth First Search to get all paths from a starting track.
+
+        At each step, the best scoring successor that is not yet part of the path is
+        followed. The path to any track is therefore a prefix of a single walk: each
+        step extends the previous playlist, sharing it instead of copying it.
 
         Arguments:
-            first {Track} -- A track object that will be the first track in the playlist.
-            last {Track} -- A track object that will be the last track in the playlist.
+            first_track {Track} -- A track object that will be the first track in the playlist.
             graph {Dict} -- The representation obtained by self.discover_graph().
 
         Keyword Arguments:
-            path {List[]} -- An empty list to initialize the first path (default: {[]}).
+            last_track {Optional[Track]} -- A track where the walk can stop (default: {None}).
 
         Returns:
-            {List[List[Track]]} -- The list of paths, represented as lists themselves.
+            {Dict[str, Playlist]} -- The playlist leading to each reached track, keyed by its filename.
         """
 
-        # each "first" track is added to the path
-        path = path + [first_track]
-
-        # prevent cycles
-        if first_track == last_track:
-            return [path]
+        current: Track = first_track
+        paths: Dict[str, Playlist] = {first_track.filename: Playlist([first_track])}
 
-        # return an empty list if there is no path to follow
-        if not graph.get(first_track.filename):
-            return []
+        while current != last_track:
+            # float('inf') will always be more than any number
+            best_score, best_track = math.inf, None
 
-        paths: List[List[Track]] = []
-        # float('inf') will always be more than any number
-        best_score, best_track = math.inf, None
+            # use successors' score to determine which path to follow
+            # the lower the better
+            for score, track in graph.get(current.filename, []):
+                if track.filename not in paths:
+                    if score < best_score:
+                        best_score, best_track = score, track
 
-        # use successors' score to determine which path to follow
-        # the lower the better
-        for score, track in graph[first_track.filename]:
-            if track not in path:
-                if score < best_score:
-                    best_score, best_track = score, track
+            # stop when there is no path to follow
+            if best_track is None:
+                break
 
-        if best_track:
-            next_paths = self._get_paths(best_track, last_track, graph, path)
-
-            for new_path in next_paths:
-                paths.append(new_path)
+            paths[best_track.filename] = paths[current.filename].with_track(best_track)
+            current = best_track
 
         return paths
-
-    def _find_successors(
-        self, library: Library, track: Track
-    ) -> List[Tuple[float, Track]]:
-        """
-        Find all valid successor tracks with their transition scores.
-
-        Arguments:
-            library {Library} -- The library containing all tracks and neighbourhoods.
-            track {Track} -- The current considered track.
-
-        Returns:
-            {List[(float, Track)]} -- A list of tracks in the neighbourhood, along with their scores.
-        """
-
-        successors: List[Tuple[float, Track]] = []
-
-        for neighbour in library.neighbours[track.filename]:
-            score = self.scorer.score_transition(track, neighbour)
-            successors.append((score, neighbour))
-
-        return successors
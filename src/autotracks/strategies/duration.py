@@ -0,0 +1,298 @@
+import math
+
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.strategy import Strategy
+from src.autotracks.track import Track
+
+
+def _is_number(value: object) -> bool:
+    """
+    Check that an option is a real number, booleans excluded.
+
+    Arguments:
+        value {object} -- The option value.
+
+    Returns:
+        bool -- True if the value is an int or a float.
+    """
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Duration(Strategy):
+    """
+    Build playlists whose total length fits a target time slot.
+
+    Tracks without a known duration are left out of the search.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer,
+        target: float,
+        tolerance: float = 120.0,
+        max_expansions: int = 100_000,
+        first: Optional[Track] = None,
+        last: Optional[Track] = None,
+    ):
+        """
+        Initialize strategy with a scorer and a target duration.
+
+        Arguments:
+            scorer {Scorer} -- The scorer to use for evaluating tracks.
+            target {float} -- The target playlist length, in seconds.
+
+        Keyword Arguments:
+            tolerance {float} -- Accepted distance to the target, in seconds (default: {120.0}).
+            max_expansions {int} -- Search budget for each first track, in explored paths (default: {100_000}).
+            first {Optional[Track]} -- The track every playlist must open with (default: {None}).
+            last {Optional[Track]} -- The track every playlist must close with (default: {None}).
+
+        Raises:
+            ValueError -- If the target, tolerance or search budget is not a valid number.
+        """
+        if not _is_number(target) or not target > 0:
+            raise ValueError(f"Target must be a positive number of seconds: {target!r}")
+        if not _is_number(tolerance) or not tolerance >= 0:
+            raise ValueError(
+                f"Tolerance must be a non-negative number of seconds: {tolerance!r}"
+            )
+        if (
+            isinstance(max_expansions, bool)
+            or not isinstance(max_expansions, int)
+            or max_expansions <= 0
+        ):
+            raise ValueError(
+                f"Budget must be a positive number of expansions: {max_expansions!r}"
+            )
+
+        super().__init__(scorer, first, last)
+        self.target = target
+        self.tolerance = tolerance
+        self.max_expansions = max_expansions
+
+    def generate_playlists(self, library: Library) -> List[Playlist]:
+        """
+        Search, from every track, the neighbour-valid path whose length is the closest
+        to the target, within the tolerance window.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+
+        Returns:
+            List[Playlist] -- The best playlist found from each first track, if any.
+        """
+
+        playlists: List[Playlist] = []
+
+        for component in library.components:
+            if self.last is not None and self.last.filename not in component:
+                continue
+
+            timed = [
+                library.tracks[filename]
+                for filename in sorted(component)
+                if library.tracks[filename].metadata.duration is not None
+            ]
+
+            # even the whole component is too short to fill the slot
+            total = sum(self._duration(track) for track in timed)
+            if total < self.target - self.tolerance:
+                continue
+
+            # the transitions of the component are scored once for every first track
+            scores = self.scorer.score_neighbours(
+                library, [track.filename for track in timed]
+            )
+
+            for first in timed:
+                if self.first is not None and first != self.first:
+                    continue
+
+                playlist = self._search(library, first, scores)
+                if not playlist.is_empty():
+                    playlists.append(playlist)
+
+        return playlists
+
+    def select_playlist(self, playlists: List[Playlist]) -> Playlist:
+        """
+        Select the best scoring playlist, preferring the one closest to the target on ties.
+
+        Returns:
+            {Playlist} -- The best playlist from the list, or an empty playlist if the list is empty.
+        """
+
+        return max(
+            playlists,
+            key=lambda playlist: (
+                playlist.score(self.scorer),
+                -abs(playlist.duration() - self.target),
+            ),
+            default=Playlist([]),
+        )
+
+    def _duration(self, track: Track) -> float:
+        """
+        Return the duration of a track that is known to have one.
+
+        Arguments:
+            track {Track} -- A track with a known duration.
+
+        Returns:
+            float -- The track duration, in seconds.
+        """
+
+        return track.metadata.duration or 0.0
+
+    def _search(
+        self, library: Library, first: Track, scores: Dict[str, List[float]]
+    ) -> Playlist:
+        """
+        Branch and bound search for the path closest to the target from a first track.
+
+        A branch is cut as soon as it reaches the target, when the next track would
+        overshoot it by more than the best path found so far, or when the tracks still
+        reachable from the next one, off the path, cannot bring it within the tolerance
+        window. Successors are tried best transition first, and the search stops on an
+        exact fit.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            first {Track} -- The track that opens the playlist.
+            scores {Dict[str, List[float]]} -- Transition scores to the neighbours of each timed track, from Scorer.score_neighbours.
+
+        Returns:
+            Playlist -- The best playlist found, or an empty playlist if none fits the window.
+        """
+
+        low, high = self.target - self.tolerance, self.target + self.tolerance
+
+        best_gap: float = math.inf
+        best_path: Optional[List[Track]] = None
+
+        path: List[Track] = [first]
+        visited: Set[str] = {first.filename}
+        elapsed: float = self._duration(first)
+
+        # each frame holds the successors left to try after the matching path track
+        stack: List[List[Tuple[float, Track]]] = [
+            self._successors(library, first, visited, scores)
+        ]
+        expansions = 0
+
+        while stack and expansions < self.max_expansions:
+            gap = abs(elapsed - self.target)
+            closed = self.last is None or path[-1] == self.last
+            if closed and low <= elapsed <= high and gap < best_gap:
+                best_gap, best_path = gap, path.copy()
+                if gap == 0:
+                    break
+
+            successors = stack[-1]
+
+            # extending a path that already reached the target only moves away from it,
+            # and nothing can follow the anchored last track
+            ended = self.last is not None and path[-1] == self.last
+            if not successors or elapsed >= self.target or ended:
+                stack.pop()
+                removed = path.pop()
+                visited.discard(removed.filename)
+                elapsed -= self._duration(removed)
+                continue
+
+            _, track = successors.pop()
+            if track.filename in visited:
+                continue
+
+            # overshooting more than the best gap cannot improve the result
+            if elapsed + self._duration(track) - self.target >= best_gap:
+                continue
+
+            # nothing reachable from there can bring the path into the window
+            needed = low - elapsed - self._duration(track)
+            if needed > 0 and not self._can_reach(library, track, visited, needed):
+                continue
+
+            expansions += 1
+            path.append(track)
+            visited.add(track.filename)
+            elapsed += self._duration(track)
+            stack.append(self._successors(library, track, visited, scores))
+
+        return Playlist(best_path or [])
+
+    def _can_reach(
+        self, library: Library, track: Track, visited: Set[str], needed: float
+    ) -> bool:
+        """
+        Check whether the timed tracks reachable from a track, without going through
+        the current path, last at least a given time.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            track {Track} -- The track the path would be extended with.
+            visited {Set[str]} -- Filenames of the tracks already on the path.
+            needed {float} -- The time still missing to reach the window, in seconds.
+
+        Returns:
+            bool -- True if the reachable tracks add up to the needed time.
+        """
+
+        reachable: float = 0.0
+        seen: Set[str] = {track.filename}
+        frontier: List[Track] = [track]
+
+        while frontier:
+            for neighbour in library.neighbours[frontier.pop().filename]:
+                if (
+                    neighbour.filename in seen
+                    or neighbour.filename in visited
+                    or neighbour.metadata.duration is None
+                ):
+                    continue
+
+                reachable += self._duration(neighbour)
+                if reachable >= needed:
+                    return True
+
+                seen.add(neighbour.filename)
+                frontier.append(neighbour)
+
+        return False
+
+    def _successors(
+        self,
+        library: Library,
+        track: Track,
+        visited: Set[str],
+        scores: Dict[str, List[float]],
+    ) -> List[Tuple[float, Track]]:
+        """
+        List the timed neighbours of a track, worst transition first so that popping
+        from the end of the list yields the best one.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            track {Track} -- The current considered track.
+            visited {Set[str]} -- Filenames of the tracks already on the path.
+            scores {Dict[str, List[float]]} -- Transition scores to the neighbours of each timed track.
+
+        Returns:
+            List[(float, Track)] -- Neighbours along with their transition scores.
+        """
+
+        successors = [
+            (score, neighbour)
+            for score, neighbour in zip(
+                scores[track.filename], library.neighbours[track.filename]
+            )
+            if neighbour.metadata.duration is not None
+            and neighbour.filename not in visited
+        ]
+        successors.sort(key=lambda successor: successor[0], reverse=True)
+
+        return successors
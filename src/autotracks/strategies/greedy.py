@@ -0,0 +1,138 @@
+from typing import Dict, List, Optional, Set
+
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.strategy import Strategy
+from src.autotracks.track import Track
+
+
+class Greedy(Strategy):
+    def generate_playlists(self, library: Library) -> List[Playlist]:
+        """
+        Build one playlist per connected component with a nearest-neighbour walk.
+
+        Each walk starts from the component's best connected track and repeatedly
+        moves to the best scoring neighbour that is not part of the playlist yet.
+        Every neighbour list is scanned once, which keeps the whole strategy fast
+        enough for very large libraries. Its playlists can also seed costlier strategies.
+
+        When the strategy is anchored, walks start from the anchored first track, or
+        from every track of the anchored last track's component, and stop at the
+        anchored last track.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+
+        Returns:
+            List[Playlist] -- One playlist per connected component of the library.
+        """
+
+        playlists: List[Playlist] = []
+
+        if self.first is not None or self.last is not None:
+            starts: List[Track]
+            if self.first is not None:
+                starts = [self.first]
+            else:
+                assert self.last is not None
+                component = library.components[library.component_of(self.last.filename)]
+                starts = [
+                    library.tracks[filename]
+                    for filename in sorted(component - {self.last.filename})
+                ]
+
+            # every walk stays in the component of its first track
+            scores = self.scorer.score_neighbours(
+                library, library.components[library.component_of(starts[0].filename)]
+            )
+            for first in starts:
+                playlist = self.walk(library, first, self.last, scores)
+                if not playlist.is_empty():
+                    playlists.append(playlist)
+
+            return playlists
+
+        for component in library.components:
+            # highest degree first, filename order on ties
+            first = min(
+                component,
+                key=lambda filename: (-len(library.neighbours[filename]), filename),
+            )
+            scores = self.scorer.score_neighbours(library, component)
+            playlists.append(self.walk(library, library.tracks[first], scores=scores))
+
+        return playlists
+
+    def select_playlist(self, playlists: List[Playlist]) -> Playlist:
+        """
+        Select the best scoring playlist across the set.
+
+        Returns:
+            {Playlist} -- The best playlist from the list, or an empty playlist if the list is empty.
+        """
+
+        return max(
+            playlists,
+            key=lambda playlist: playlist.score(self.scorer),
+            default=Playlist([]),
+        )
+
+    def walk(
+        self,
+        library: Library,
+        first: Track,
+        last: Optional[Track] = None,
+        scores: Optional[Dict[str, List[float]]] = None,
+    ) -> Playlist:
+        """
+        Follow the best scoring unvisited neighbour from a track until none is left.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+            first {Track} -- The track that opens the playlist.
+
+        Keyword Arguments:
+            last {Optional[Track]} -- A track that closes the playlist once reached (default: {None}).
+            scores {Optional[Dict[str, List[float]]]} -- Transition scores to the neighbours of each track of the component, from Scorer.score_neighbours (default: {None}, scored on the way).
+
+        Returns:
+            Playlist -- The playlist built from the first track, or an empty playlist if
+            the last track was never reached.
+        """
+
+        visited: Set[str] = {first.filename}
+        path: List[Track] = [first]
+        current = first
+
+        if scores is None:
+            scores = self.scorer.score_neighbours(
+                library, library.components[library.component_of(first.filename)]
+            )
+
+        while current != last:
+            successors = [
+                (score, neighbour)
+                for score, neighbour in zip(
+                    scores[current.filename], library.neighbours[current.filename]
+                )
+                if neighbour.filename not in visited
+            ]
+
+            # best score first, then first in the neighbour list
+            best = min(
+                range(len(successors)),
+                key=lambda index: successors[index][0],
+                default=None,
+            )
+            if best is None:
+                break
+
+            _, current = successors[best]
+
+            visited.add(current.filename)
+            path.append(current)
+
+        if last is not None and current != last:
+            return Playlist([])
+
+        return Playlist(path)
@@ -0,0 +1,411 @@
+import heapq
+import itertools
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.strategy import Strategy
+from src.autotracks.track import Track
+
+# (from, to) filenames of consecutive tracks
+Transition = Tuple[str, str]
+
+# prefix tree of the playlists expanded so far, keyed by track filename
+Trie = Dict[str, Any]
+
+
+class KBest(Strategy):
+    """
+    Enumerate the k best distinct playlists, best first, without listing every candidate.
+
+    Playlists are selected one at a time. Each one is the best candidate of a search
+    in the style of Yen's k shortest paths algorithm: expanded playlists are forked at
+    every track, keeping the tracks before the fork and walking again from there while
+    avoiding the continuations already taken. Walks follow the best scoring
+    transitions, as the exhaustive search does.
+
+    Diversity is measured on transitions: long playlists of a crate share most of
+    their tracks, but not the order they play them in. Once a walk shares max_overlap
+    of the transitions of a selected playlist, it stops taking them.
+    """
+
+    def __init__(
+        self,
+        scorer: Scorer,
+        k: int = 5,
+        max_overlap: float = 0.5,
+        max_expansions: int = 100,
+        first: Optional[Track] = None,
+        last: Optional[Track] = None,
+    ):
+        """
+        Initialize strategy with a scorer and the number of playlists to enumerate.
+
+        Arguments:
+            scorer {Scorer} -- The scorer to use for evaluating tracks.
+
+        Keyword Arguments:
+            k {int} -- Number of playlists to enumerate (default: {5}).
+            max_overlap {float} -- Largest part of a playlist's transitions that may appear in a better one (default: {0.5}).
+            max_expansions {int} -- Search budget for each playlist, in expanded candidates (default: {100}).
+            first {Optional[Track]} -- The track every playlist must open with (default: {None}).
+            last {Optional[Track]} -- The track every playlist must close with (default: {None}).
+        """
+        super().__init__(scorer, first, last)
+        self.k = k
+        self.max_overlap = max_overlap
+        self.max_expansions = max_expansions
+
+    def generate_playlists(self, library: Library) -> List[Playlist]:
+        """
+        Enumerate the k best playlists that are different enough from each other.
+
+        Only the expanded candidates and their forks are kept in memory, instead of
+        every possible path.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+
+        Returns:
+            List[Playlist] -- Up to k playlists, best first.
+        """
+
+        starts = self._starts(library)
+        successors: Dict[str, List[Tuple[float, Track]]] = {}
+
+        selected: List[Playlist] = []
+        selected_transitions: List[Set[Transition]] = []
+
+        while len(selected) < self.k:
+            search = _Search(
+                self, library, starts, successors, selected, selected_transitions
+            )
+            playlist = search.best()
+            if playlist is None:
+                break
+
+            selected.append(playlist)
+            selected_transitions.append(transitions(playlist))
+
+        # a later search may find a better playlist than an earlier one, on a budget
+        return sorted(selected, key=lambda playlist: -playlist.score(self.scorer))
+
+    def select_playlist(self, playlists: List[Playlist]) -> Playlist:
+        """
+        Select the best scoring playlist across the set.
+
+        Returns:
+            {Playlist} -- The best playlist from the list, or an empty playlist if the list is empty.
+        """
+
+        return max(
+            playlists,
+            key=lambda playlist: playlist.score(self.scorer),
+            default=Playlist([]),
+        )
+
+    def _starts(self, library: Library) -> List[Track]:
+        """
+        List the tracks a playlist may open with, best connected first.
+
+        Arguments:
+            library {Library} -- The considered library of tracks.
+
+        Returns:
+            List[Track] -- The anchored first track, or every track that has a neighbour.
+        """
+
+        if self.first is not None:
+            return [self.first]
+
+        filenames = [
+            filename
+            for component in library.components
+            if len(component) > 1
+            and (self.last is None or self.last.filename in component)
+            for filename in component
+            if self.last is None or filename != self.last.filename
+        ]
+
+        return [
+            library.tracks[filename]
+            for filename in sorted(
+                filenames,
+                key=lambda filename: (-len(library.neighbours[filename]), filename),
+            )
+        ]
+
+
+def transitions(playlist: Playlist) -> Set[Transition]:
+    """
+    List the transitions of a playlist.
+
+    Arguments:
+        playlist {Playlist} -- The playlist.
+
+    Returns:
+        Set[Transition] -- The (from, to) filenames of each transition.
+    """
+
+    tracks = playlist.tracks
+
+    return {(a.filename, b.filename) for a, b in zip(tracks, tracks[1:])}
+
+
+class _Search:
+    """
+    Search for the best playlist that is different enough from the selected ones.
+
+    Attributes:
+        strategy {KBest} -- The strategy, for its scorer, anchors and overlap limit.
+        library {Library} -- The considered library of tracks.
+        starts {List[Track]} -- The tracks a playlist may open with.
+        successors {Dict[str, List[Tuple[float, Track]]]} -- Scored neighbours, filled one component at a time.
+        selected {List[Playlist]} -- The playlists selected so far.
+        selected_transitions {List[Set[Transition]]} -- Transitions of the playlists selected so far.
+    """
+
+    def __init__(
+        self,
+        strategy: KBest,
+        library: Library,
+        starts: List[Track],
+        successors: Dict[str, List[Tuple[float, Track]]],
+        selected: List[Playlist],
+        selected_transitions: List[Set[Transition]],
+    ) -> None:
+        self.strategy = strategy
+        self.library = library
+        self.starts = starts
+        self.successors = successors
+        self.selected = selected
+        self.selected_transitions = selected_transitions
+
+        # candidates, best score first, then lowest transition cost
+        self._heap: List[Tuple[float, float, int, int, Playlist]] = []
+        self._seen: Set[Playlist] = set()
+        self._trie: Trie = {}
+        self._counter = itertools.count()
+
+    def best(self) -> Optional[Playlist]:
+        """
+        Expand candidates best first, then pick the best one that is different enough.
+
+        Unlike shortest paths, a fork may score better than the playlist it was forked
+        from, so the whole budget is expanded before candidates are ranked. Walks may
+        find a playlist that was already selected: it is still expanded, outside of the
+        budget, since its forks lead to the next candidates, but it cannot be picked
+        again.
+
+        Returns:
+            Optional[Playlist] -- The best candidate, or None if there is none left.
+        """
+
+        self._push(self._walk(Playlist([]), set()), 0)
+
+        expanded: List[Tuple[float, float, int, int, Playlist]] = []
+        while self._heap:
+            *_, playlist = self._heap[0]
+            is_selected = playlist in self.selected
+            if not is_selected and len(expanded) >= self.strategy.max_expansions:
+                break
+
+            candidate = heapq.heappop(self._heap)
+            if not is_selected:
+                expanded.append(candidate)
+
+            _, _, _, deviation, playlist = candidate
+            self._expand(playlist, deviation)
+
+        for *_, playlist in sorted(expanded + self._heap):
+            if playlist not in self.selected and self._is_diverse(
+                transitions(playlist)
+            ):
+                return playlist
+
+        return None
+
+    def _push(self, playlist: Optional[Playlist], deviation: int) -> None:
+        """
+        Add a candidate, unless it was already found.
+
+        Arguments:
+            playlist {Optional[Playlist]} -- The candidate, if a walk found one.
+            deviation {int} -- Index of the first track that the candidate's fork walked to.
+        """
+
+        if playlist is None or playlist in self._seen:
+            return
+
+        self._seen.add(playlist)
+
+        scorer = self.strategy.scorer
+        tracks = playlist.tracks
+        cost = sum(scorer.score_transitions(tracks[:-1], tracks[1:]))
+
+        heapq.heappush(
+            self._heap,
+            (-playlist.score(scorer), cost, next(self._counter), deviation, playlist),
+        )
+
+    def _expand(self, playlist: Playlist, deviation: int) -> None:
+        """
+        Fork a playlist at each of its tracks, and push the resulting candidates.
+
+        The tracks before the fork are kept, and the walk from the fork avoids every
+        continuation that an expanded playlist already took after the same tracks. As
+        in Lawler's variant of Yen's algorithm, a playlist is only forked from where its
+        own fork started: earlier forks belong to the playlist it was forked from.
+
+        Arguments:
+            playlist {Playlist} -- The playlist to fork.
+            deviation {int} -- Index of the first track that the playlist's own fork walked to.
+        """
+
+        tracks = playlist.tracks
+
+        node = self._trie
+        for track in tracks:
+            node = node.setdefault(track.filename, {})
+
+        # the root before the fork, and the trie node of that root
+        root, node = Playlist([]), self._trie
+        for index in range(-1, len(tracks) - 1):
+            if index >= 0:
+                root = root.with_track(tracks[index])
+                node = node[tracks[index].filename]
+
+            if index + 1 >= deviation:
+                self._push(self._walk(root, set(node)), index + 1)
+
+    def _walk(self, root: Playlist, banned: Set[str]) -> Optional[Playlist]:
+        """
+        Extend a playlist by following the best scoring transitions to unused tracks.
+
+        Arguments:
+            root {Playlist} -- The tracks to keep.
+            banned {Set[str]} -- Filenames that may not directly follow the root.
+
+        Returns:
+            Optional[Playlist] -- The extended playlist, or None if the root cannot be
+            extended into a valid playlist.
+        """
+
+        last = self.strategy.last
+        visited = {track.filename for track in root.tracks}
+
+        # transitions shared with each selected playlist so far
+        shared = [len(transitions(root) & other) for other in self.selected_transitions]
+
+        if root.is_empty():
+            current = next((t for t in self.starts if t.filename not in banned), None)
+            if current is None:
+                return None
+            playlist = Playlist([current])
+            banned = set()
+        else:
+            assert root.last is not None
+            current, playlist = root.last, root
+        visited.add(current.filename)
+
+        while current != last:
+            best_score, best_track = float("inf"), None
+            for score, track in self._successors(current):
+                if track.filename in visited or track.filename in banned:
+                    continue
+                if score < best_score and self._allowed(
+                    shared, current, track, len(playlist)
+                ):
+                    best_score, best_track = score, track
+
+            if best_track is None:
+                break
+
+            transition = (current.filename, best_track.filename)
+            for index, other in enumerate(self.selected_transitions):
+                if transition in other:
+                    shared[index] += 1
+
+            banned = set()
+            playlist = playlist.with_track(best_track)
+            visited.add(best_track.filename)
+            current = best_track
+
+        # a fork must add tracks to its root, and reach the anchored last track
+        if len(playlist) < max(2, len(root) + 1):
+            return None
+        if last is not None and current != last:
+            return None
+
+        return playlist
+
+    def _allowed(
+        self, shared: List[int], current: Track, track: Track, length: int
+    ) -> bool:
+        """
+        Check that a transition does not make a walk too close to a selected playlist.
+
+        The overlap limit holds after every step, so that a walk cannot make up for
+        a long shared stretch with the tracks it would add afterwards.
+
+        Arguments:
+            shared {List[int]} -- Transitions the walk shares with each selected playlist.
+            current {Track} -- The track the walk is at.
+            track {Track} -- The track it would move to.
+            length {int} -- Number of transitions of the walk once the track is added.
+
+        Returns:
+            bool -- True if the transition can be taken.
+        """
+
+        transition = (current.filename, track.filename)
+        max_overlap = self.strategy.max_overlap
+
+        return all(
+            transition not in other
+            or count + 1 <= max_overlap * min(len(other), length)
+            for other, count in zip(self.selected_transitions, shared)
+        )
+
+    def _successors(self, track: Track) -> List[Tuple[float, Track]]:
+        """
+        Score the transitions from a track to its neighbours, along with every other
+        transition of its component on first use.
+
+        Arguments:
+            track {Track} -- The current track.
+
+        Returns:
+            List[Tuple[float, Track]] -- The neighbours, along with their scores.
+        """
+
+        if track.filename not in self.successors:
+            library = self.library
+            component = library.components[library.component_of(track.filename)]
+            scores = self.strategy.scorer.score_neighbours(library, component)
+            for filename, neighbour_scores in scores.items():
+                self.successors[filename] = list(
+                    zip(neighbour_scores, library.neighbours[filename])
+                )
+
+        return self.successors[track.filename]
+
+    def _is_diverse(self, candidate: Set[Transition]) -> bool:
+        """
+        Check that a candidate is different enough from every selected playlist.
+
+        Arguments:
+            candidate {Set[Transition]} -- Transitions of the candidate playlist.
+
+        Returns:
+            bool -- True if it shares at most max_overlap of the shorter playlist's
+            transitions with each selected playlist.
+        """
+
+        return all(
+            len(candidate & other)
+            <= self.strategy.max_overlap * min(len(candidate), len(other))
+            for other in self.selected_transitions
+        )
@@ -1,9 +1,10 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
 
 from src.autotracks.library import Library
 from src.autotracks.playlist import Playlist
 from src.autotracks.scorer import Scorer
+from src.autotracks.track import Track
 
 
 class Strategy(ABC):
@@ -12,16 +13,28 @@ class Strategy(ABC):
 
     A Strategy determines the relationships between tracks and leverages them to build playlists.
     It must be able to build one or multiple playlists and select the best among them.
+    Playlists can be anchored to a chosen first and/or last track.
     """
 
-    def __init__(self, scorer: Scorer):
+    def __init__(
+        self,
+        scorer: Scorer,
+        first: Optional[Track] = None,
+        last: Optional[Track] = None,
+    ):
         """
         Initialize strategy with a scorer.
 
         Arguments:
             scorer {Scorer} -- The scorer to use for evaluating tracks.
+
+        Keyword Arguments:
+            first {Optional[Track]} -- The track every playlist must open with (default: {None}).
+            last {Optional[Track]} -- The track every playlist must close with (default: {None}).
         """
         self.scorer = scorer
+        self.first = first
+        self.last = last
 
     @abstractmethod
     def generate_playlists(self, library: Library) -> List[Playlist]:
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Optional, Tuple
 
-from src.autotracks.key import Key, compatible_keys
+from src.autotracks.key import DEFAULT_COMPATIBILITY, Key, key_code
 
 
 @dataclass
 class TrackMetadata:
-    # TODO: add track length
     bpm: float
     key: Key
+    # length in seconds, if known
+    duration: Optional[float] = None
 
 
 class Track:
@@ -22,19 +24,23 @@ class Track:
         self.filename: str = audio_filename
         self.metadata_filename: str = metadata_filename
         self.metadata: TrackMetadata = metadata
+        self.key_code: int = key_code(metadata.key)
 
-    def is_neighbour(self, other: Track) -> bool:
+    def is_neighbour(
+        self, other: Track, compatibility: Tuple[int, ...] = DEFAULT_COMPATIBILITY
+    ) -> bool:
         """
         Check if the track's key is equal to, or is in the neighbourhood of another track's key.
 
         Arguments:
             other {Track} -- Another track to check key neighbourhood with.
 
+        Keyword Arguments:
+            compatibility {Tuple[int, ...]} -- Key compatibility table, as built by
+            compatibility_table() (default: relative and adjacent keys).
+
         Returns:
             boolean -- True if both track keys are neighbours, else False.
         """
 
-        return (
-            self.metadata.key == other.metadata.key
-            or other.metadata.key in compatible_keys(self.metadata.key)
-        )
+        return bool(compatibility[self.key_code] >> other.key_code & 1)
@@ -0,0 +1,347 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.autotracks.failure import FAILURE_SUFFIX
+from src.autotracks.library import Library
+from src.autotracks.lock import ReadWriteLock
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+INOTIFY_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+def watched_filenames(paths: List[str]) -> List[str]:
+    """
+    List the files a set of paths covers, the same way the library is scanned.
+
+    Directories contribute the files they directly contain, other paths are taken as is.
+
+    Arguments:
+        paths {List[str]} -- Directories and/or files.
+
+    Returns:
+        List[str] -- The covered filenames.
+    """
+    filenames: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                filenames.extend(entry.path for entry in entries if entry.is_file())
+        elif os.path.isfile(path):
+            filenames.append(path)
+
+    return filenames
+
+
+class Watcher(ABC):
+    """
+    Reports files that were created, modified, moved or deleted under a set of paths.
+
+    Attributes:
+        paths {List[str]} -- Watched directories and/or files.
+    """
+
+    def __init__(self, paths: List[str]) -> None:
+        self.paths = paths
+
+    @abstractmethod
+    def wait(self, timeout: float) -> Set[str]:
+        """
+        Block until files change or the timeout expires.
+
+        Arguments:
+            timeout {float} -- Maximum time to wait, in seconds.
+
+        Returns:
+            Set[str] -- The changed filenames, empty if nothing changed.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Release the resources held by the watcher.
+        """
+        pass
+
+
+class InotifyWatcher(Watcher):
+    """
+    Watcher backed by Linux inotify, through the C library.
+
+    Files are watched through their parent directory, so that they can be replaced
+    or deleted and created again.
+
+    Raises:
+        OSError -- If inotify is not available on this system.
+    """
+
+    def __init__(self, paths: List[str]) -> None:
+        super().__init__(paths)
+
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self._fd: int = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        # watched directory for each watch descriptor, and which of its files matter
+        self._directories: Dict[int, str] = {}
+        self._files: Dict[str, Optional[Set[str]]] = {}
+
+        for path in paths:
+            if os.path.isdir(path):
+                directory, names = path, None
+            else:
+                directory = os.path.dirname(path) or "."
+                names = {os.path.basename(path)}
+
+            if directory in self._files:
+                known = self._files[directory]
+                self._files[directory] = (
+                    None if known is None or names is None else known | names
+                )
+                continue
+
+            descriptor = libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), INOTIFY_MASK
+            )
+            if descriptor < 0:
+                self.close()
+                raise OSError(ctypes.get_errno(), f"Could not watch: {directory}")
+
+            self._directories[descriptor] = directory
+            self._files[directory] = names
+
+    def wait(self, timeout: float) -> Set[str]:
+        changed: Set[str] = set()
+
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+
+        try:
+            buffer = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+
+        offset = 0
+        while offset < len(buffer):
+            descriptor, _, _, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            directory = self._directories.get(descriptor)
+            if directory is None or not name:
+                continue
+
+            names = self._files[directory]
+            if names is None or name in names:
+                changed.add(os.path.join(directory, name))
+
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher(Watcher):
+    """
+    Portable watcher comparing file sizes and modification times between scans.
+    """
+
+    def __init__(self, paths: List[str]) -> None:
+        super().__init__(paths)
+        self._state = self._scan()
+
+    def wait(self, timeout: float) -> Set[str]:
+        time.sleep(timeout)
+
+        state = self._scan()
+        changed = {
+            filename
+            for filename in state.keys() | self._state.keys()
+            if state.get(filename) != self._state.get(filename)
+        }
+        self._state = state
+
+        return changed
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """
+        Record the size and modification time of every watched file.
+
+        Returns:
+            Dict[str, Tuple[int, int]] -- Size and modification time (ns) for each filename.
+        """
+        state: Dict[str, Tuple[int, int]] = {}
+        for filename in watched_filenames(self.paths):
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                continue
+            state[filename] = (stat.st_size, stat.st_mtime_ns)
+
+        return state
+
+
+def make_watcher(paths: List[str]) -> Watcher:
+    """
+    Build the best watcher available on this system.
+
+    Arguments:
+        paths {List[str]} -- Directories and/or files to watch.
+
+    Returns:
+        Watcher -- An inotify watcher, or a polling watcher where inotify is not available.
+    """
+    try:
+        return InotifyWatcher(paths)
+    except OSError as error:
+        logging.info(f"Falling back to polling for file changes ({error})")
+        return PollingWatcher(paths)
+
+
+class LibraryWatcher:
+    """
+    Keeps a library up to date with the files of the paths it was loaded from.
+
+    Changes are debounced: they are applied once no event has been seen for the debounce
+    delay, so that a file being copied or a whole folder being dropped is handled once.
+    Only new or changed files are analysed, and deleted files are dropped from the library.
+
+    Attributes:
+        library {Library} -- The library to update.
+        watcher {Watcher} -- The source of file changes.
+        debounce {float} -- Quiet time before changes are applied, in seconds.
+        lock {Optional[ReadWriteLock]} -- Held for writing while the library is updated.
+        on_change {Optional[Callable[[], None]]} -- Called after each library update.
+    """
+
+    def __init__(
+        self,
+        library: Library,
+        watcher: Watcher,
+        debounce: float = 1.0,
+        lock: Optional[ReadWriteLock] = None,
+        on_change: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.library = library
+        self.watcher = watcher
+        self.debounce = debounce
+        self.lock = lock
+        self.on_change = on_change
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        """
+        Apply file changes to the library until stop() is called.
+        """
+        pending: Set[str] = set()
+        last_event = 0.0
+
+        try:
+            while not self._stopped.is_set():
+                changed = self.watcher.wait(self.debounce)
+
+                if changed:
+                    pending |= changed
+                    last_event = time.monotonic()
+                elif pending and time.monotonic() - last_event >= self.debounce:
+                    self.apply(pending)
+                    pending = set()
+        finally:
+            self.watcher.close()
+
+    def stop(self) -> None:
+        """
+        Stop watching, at the latest one debounce delay later.
+        """
+        self._stopped.set()
+
+    def apply(self, filenames: Set[str]) -> None:
+        """
+        Bring the library up to date with a set of changed files.
+
+        Audio files are the source of truth: a .meta file only matters on its own, when
+        its audio file is not there. An audio file that is newer than its .meta file has
+        been modified, so its stale metadata is discarded and the file analysed again.
+        Failure records are the library's own bookkeeping and are ignored.
+
+        Arguments:
+            filenames {Set[str]} -- Files that were created, modified or deleted.
+        """
+        removed: List[str] = []
+        changed: List[str] = []
+
+        for filename in sorted(filenames):
+            if filename.endswith(FAILURE_SUFFIX):
+                # failure records the library writes and removes while analysing
+                continue
+
+            audio_filename = self.library.audio_filename(filename)
+            if filename != audio_filename and os.path.exists(audio_filename):
+                # our own .meta writes, or metadata of a track handled by its audio file
+                continue
+
+            if os.path.isfile(filename):
+                self._discard_stale_metadata(filename)
+                changed.append(filename)
+            else:
+                removed.append(filename)
+
+        if not changed and not removed:
+            return
+
+        # analyse outside the lock, so the library can still be read meanwhile
+        tracks, errors = self.library.load_metadata(changed)
+
+        with self.lock.write() if self.lock else nullcontext():
+            if removed:
+                self.library.remove_tracks(removed)
+            self.library.insert_tracks(tracks, errors)
+
+        logging.info(
+            f"Library updated: {len(tracks)} tracks loaded, {len(errors)} errors, {len(removed)} files removed"
+        )
+
+        if self.on_change is not None:
+            self.on_change()
+
+    def _discard_stale_metadata(self, filename: str) -> None:
+        """
+        Remove the .meta file of an audio file modified after it was analysed.
+
+        Arguments:
+            filename {str} -- The path to a changed file.
+        """
+        metadata_filename = self.library.metadata_filename(filename)
+
+        try:
+            if os.path.getmtime(metadata_filename) < os.path.getmtime(filename):
+                os.remove(metadata_filename)
+        except FileNotFoundError:
+            pass
@@ -1,11 +1,80 @@
+import functools
+import logging
+import os
 import pytest
+import wave
 
-from typing import Dict
+from typing import Callable, Dict, Iterator, List
+
+from src.autotracks.config import AutotracksConfig, setup_logging, stop_logging
+
+# stand-ins for the analysis tools, also used by bench.analysis
+STUBS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "bench",
+    "stubs",
+)
+
+
+@pytest.fixture(scope="module")
+def config() -> AutotracksConfig:
+    return AutotracksConfig(
+        bpm_tag="bpm-tag",
+        keyfinder_cli="keyfinder-cli",
+        ffprobe="ffprobe",
+    )
+
+
+@pytest.fixture
+def cli_logging(tmp_path: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    # main() logs to files under the working directory; keep them in the test's
+    # temporary directory and stop the listener it starts
+    monkeypatch.setattr(
+        "src.autotracks.__main__.setup_logging",
+        functools.partial(setup_logging, os.path.join(tmp_path, "log")),
+    )
+
+    yield
+
+    stop_logging()
+    for handler in logging.getLogger().handlers[:]:
+        logging.getLogger().removeHandler(handler)
 
 
 @pytest.fixture(scope="module")
-def config() -> Dict[str, str | None]:
+def stub_environment() -> Dict[str, str]:
     return {
-        "BPM_TAG": "bpm-tag",
-        "KEYFINDER_CLI": "keyfinder-cli",
+        "BPM_TAG": os.path.join(STUBS_DIRECTORY, "bpm-tag"),
+        "KEYFINDER_CLI": os.path.join(STUBS_DIRECTORY, "keyfinder-cli"),
+        "FFPROBE": os.path.join(STUBS_DIRECTORY, "ffprobe"),
     }
+
+
+@pytest.fixture(scope="module")
+def stub_config(stub_environment: Dict[str, str]) -> AutotracksConfig:
+    return AutotracksConfig(
+        bpm_tag=stub_environment["BPM_TAG"],
+        keyfinder_cli=stub_environment["KEYFINDER_CLI"],
+        ffprobe=stub_environment["FFPROBE"],
+    )
+
+
+@pytest.fixture(scope="session")
+def write_audio_files() -> Callable[[str, int], List[str]]:
+    # writes tiny silent WAV files, recognised as audio by the library
+    def write(directory: str, count: int) -> List[str]:
+        os.makedirs(directory, exist_ok=True)
+
+        filenames: List[str] = []
+        for index in range(count):
+            filename = os.path.join(directory, f"track-{index}.wav")
+            with wave.open(filename, "wb") as audio_file:
+                audio_file.setnchannels(1)
+                audio_file.setsampwidth(2)
+                audio_file.setframerate(8000)
+                audio_file.writeframes(b"\0\0" * 800)
+            filenames.append(filename)
+
+        return filenames
+
+    return write
@@ -0,0 +1,86 @@
+import json
+import os
+import pytest
+
+from typing import List
+
+from src.autotracks.__main__ import main
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.stats import library_stats
+
+
+@pytest.mark.usefixtures("cli_logging")
+def test_generate(shared_datadir: str, tmp_path: str):
+    output = os.path.join(tmp_path, "greedy.m3u")
+
+    assert main(["generate", "--strategy", "greedy", output, str(shared_datadir)]) == 0
+
+    with open(output) as playlist_file:
+        assert len([line for line in playlist_file if not line.startswith("#")]) == 4
+
+
+@pytest.mark.usefixtures("cli_logging")
+def test_generate_all(shared_datadir: str, tmp_path: str):
+    output = os.path.join(tmp_path, "playlists", "cover.m3u")
+    os.mkdir(os.path.dirname(output))
+
+    assert main(["generate", "--strategy", "cover", output, str(shared_datadir)]) == 0
+    assert sorted(os.listdir(os.path.dirname(output))) == [
+        "cover-01.m3u",
+        "cover-02.m3u",
+    ]
+
+
+@pytest.mark.usefixtures("cli_logging")
+@pytest.mark.parametrize(
+    "options",
+    [
+        ["--budget", "10"],
+        ["--strategy", "duration", "--option", "target=abc"],
+        ["--strategy", "greedy", "--duration", "60"],
+        ["--tolerance", "5"],
+    ],
+)
+def test_generate_invalid_options(
+    shared_datadir: str, tmp_path: str, options: List[str]
+):
+    output = os.path.join(tmp_path, "dfs.m3u")
+
+    assert main(["generate", *options, output, str(shared_datadir)]) == os.EX_USAGE
+    assert not os.path.exists(output)
+
+
+@pytest.mark.usefixtures("cli_logging")
+def test_batch(shared_datadir: str, tmp_path: str):
+    outputs = [os.path.join(tmp_path, name) for name in ("greedy.m3u", "dfs.m3u")]
+    jobs = os.path.join(tmp_path, "jobs.json")
+    with open(jobs, "w") as jobs_file:
+        json.dump(
+            [{"output": outputs[0], "strategy": "greedy"}, {"output": outputs[1]}],
+            jobs_file,
+        )
+
+    assert main(["batch", jobs, str(shared_datadir)]) == os.EX_OK
+    assert all(os.path.isfile(output) for output in outputs)
+
+
+@pytest.mark.usefixtures("cli_logging")
+def test_batch_invalid_file(shared_datadir: str, tmp_path: str):
+    jobs = os.path.join(tmp_path, "jobs.json")
+    with open(jobs, "w") as jobs_file:
+        json.dump({"output": "dfs.m3u"}, jobs_file)
+
+    assert main(["batch", jobs, str(shared_datadir)]) == os.EX_USAGE
+
+
+def test_stats(config: AutotracksConfig, shared_datadir: str):
+    summary = library_stats(Autotracks(config, [shared_datadir]).library)
+
+    assert summary.tracks == 5
+    assert summary.errors == 3
+    assert summary.keys == {"Amin": 1, "Dmin": 1, "Cmaj": 1, "Bmaj": 1, "Fmaj": 1}
+    assert summary.edges == 4
+    assert summary.components == [4, 1]
+    assert summary.search_pairs == 12
+    assert summary.search_transitions == 8
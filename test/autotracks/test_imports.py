@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+
+
+def test_imports_are_side_effect_free(tmp_path: str):
+    # heavy dependencies are only imported on the code paths that need them
+    code = (
+        "import sys\n"
+        "import src.autotracks.__main__, src.autotracks.server\n"
+        "heavy = ('magic', 'tqdm', 'numpy', 'dotenv', 'ctypes')\n"
+        "print(','.join(m for m in heavy if m in sys.modules))\n"
+    )
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": root},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == ""
+    assert os.listdir(tmp_path) == []
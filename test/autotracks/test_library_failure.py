@@ -0,0 +1,86 @@
+import json
+import os
+import pytest
+
+from typing import Callable, List
+
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.failure import (
+    RETRY_BACKOFF,
+    RETRY_BACKOFF_MAX,
+    FailureRecord,
+    failure_filename,
+    read_failure,
+)
+from src.autotracks.library import Library
+
+
+def age_failure(filename: str, seconds: float) -> None:
+    with open(failure_filename(filename)) as failure_file:
+        record = json.load(failure_file)
+    record["failed_at"] -= seconds
+    with open(failure_filename(filename), "w") as failure_file:
+        json.dump(record, failure_file)
+
+
+def test_backoff():
+    record = FailureRecord(
+        size=1, mtime_ns=1, tools="", attempts=1, failed_at=0.0, message=""
+    )
+    assert record.retry_at() == RETRY_BACKOFF
+
+    record.attempts = 3
+    assert record.retry_at() == 4 * RETRY_BACKOFF
+
+    record.attempts = 100
+    assert record.retry_at() == RETRY_BACKOFF_MAX
+
+
+def test_failures_are_kept(
+    stub_config: AutotracksConfig,
+    write_audio_files: Callable[[str, int], List[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: str,
+):
+    (filename,) = write_audio_files(os.path.join(tmp_path, "audio"), 1)
+
+    def load(retry_failed: bool = False) -> Library:
+        return Library(stub_config, [filename], retry_failed=retry_failed)
+
+    monkeypatch.setenv("STUB_KEYFINDER_CLI_FAILURE_RATE", "1")
+    assert filename in load().errors
+    assert read_failure(filename).attempts == 1
+
+    # the tools would now succeed, but the known failure is not analysed again
+    monkeypatch.setenv("STUB_KEYFINDER_CLI_FAILURE_RATE", "0")
+    errors: List[str] = [load().errors[filename].message]
+    errors.append(load(retry_failed=True).errors[filename].message)
+    assert all(message.startswith("Skipping") for message in errors)
+
+    # once the backoff has elapsed, --retry-failed analyses it again
+    age_failure(filename, RETRY_BACKOFF)
+    library = load(retry_failed=True)
+    assert filename in library.tracks
+    assert read_failure(filename) is None
+
+
+def test_failures_are_forgotten(
+    stub_config: AutotracksConfig,
+    write_audio_files: Callable[[str, int], List[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: str,
+):
+    (filename,) = write_audio_files(os.path.join(tmp_path, "audio"), 1)
+
+    monkeypatch.setenv("STUB_BPM_TAG_FAILURE_RATE", "1")
+    Library(stub_config, [filename])
+    Library(stub_config, [filename], retry_failed=True)
+    age_failure(filename, RETRY_BACKOFF)
+    Library(stub_config, [filename], retry_failed=True)
+    assert read_failure(filename).attempts == 2
+
+    # a modified file is analysed again right away
+    monkeypatch.setenv("STUB_BPM_TAG_FAILURE_RATE", "0")
+    stat = os.stat(filename)
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert filename in Library(stub_config, [filename]).tracks
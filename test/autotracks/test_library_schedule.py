@@ -0,0 +1,51 @@
+import os
+import pytest
+
+from typing import List
+
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.library import Library, TrackData
+
+
+def write_files(directory: str, sizes: List[int]) -> List[str]:
+    filenames: List[str] = []
+    for index, size in enumerate(sizes):
+        filename = os.path.join(directory, f"{index}.flac")
+        with open(filename, "wb") as audio_file:
+            audio_file.write(b"\0" * size)
+        filenames.append(filename)
+
+    return filenames
+
+
+def test_schedule(config: AutotracksConfig, tmp_path: str):
+    small, large, medium = write_files(str(tmp_path), [10, 1000, 100])
+    missing = os.path.join(tmp_path, "missing.flac")
+    filenames = [small, large, missing, medium]
+
+    def order(schedule: str) -> List[str]:
+        return Library(config, [], schedule=schedule).schedule_analysis(filenames)
+
+    assert order("longest") == [large, medium, small, missing]
+    assert order("shortest") == [missing, small, medium, large]
+    assert order("none") == filenames
+
+    with pytest.raises(ValueError):
+        Library(config, [], schedule="random")
+
+
+def test_analysis_order(config: AutotracksConfig, tmp_path: str):
+    filenames = write_files(str(tmp_path), [10, 1000, 100, 10000])
+    library = Library(config, [], workers=1, schedule="longest")
+
+    analysed: List[str] = []
+
+    def extract(filename: str) -> TrackData:
+        analysed.append(filename)
+        return {"bpm": 124.0, "key": "1m", "duration": None}
+
+    tracks, errors = library._analyse_audio(filenames, extract)
+
+    # a single worker takes the largest files first
+    assert analysed == [filenames[3], filenames[1], filenames[2], filenames[0]]
+    assert len(tracks) == 4 and not errors
@@ -0,0 +1,106 @@
+import os
+import pytest
+
+from typing import Callable, Dict, List
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.error import UnknownTrackError
+from src.autotracks.library import Library
+from src.autotracks.snapshot import load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def snapshot_filename(tmp_path: str) -> str:
+    return os.path.join(tmp_path, "library.snapshot")
+
+
+@pytest.fixture
+def cold(
+    config: AutotracksConfig, shared_datadir: str, snapshot_filename: str
+) -> Library:
+    return Autotracks(config, [shared_datadir], snapshot_filename).library
+
+
+def describe(library: Library) -> Dict[str, List[str]]:
+    return {
+        filename: [neighbour.filename for neighbour in neighbours]
+        for filename, neighbours in library.neighbours.items()
+    }
+
+
+def test_snapshot_written(cold: Library, snapshot_filename: str):
+    assert os.path.isfile(snapshot_filename)
+
+
+def test_snapshot_warm(
+    cold: Library,
+    config: AutotracksConfig,
+    shared_datadir: str,
+    snapshot_filename: str,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    # a warm start must not parse any .meta file
+    def fail(*_: object) -> None:
+        raise AssertionError("metadata parsed")
+
+    monkeypatch.setattr(Library, "load_metadata", fail)
+    warm = Autotracks(config, [shared_datadir], snapshot_filename).library
+
+    assert describe(warm) == describe(cold)
+    assert sorted(warm.errors) == sorted(cold.errors)
+    assert [t.metadata for t in warm.tracks.values()] == [
+        t.metadata for t in cold.tracks.values()
+    ]
+
+
+def test_snapshot_stale(
+    cold: Library, config: AutotracksConfig, shared_datadir: str, snapshot_filename: str
+):
+    with open(os.path.join(shared_datadir, "4.flac.meta"), "w") as meta:
+        print("124\n1m", file=meta)
+
+    fresh = Autotracks(config, [shared_datadir], snapshot_filename).library
+
+    assert [len(component) for component in fresh.components] == [5]
+
+
+def test_snapshot_analysis(
+    config: AutotracksConfig,
+    shared_datadir: str,
+    snapshot_filename: str,
+    write_audio_files: Callable[[str, int], List[str]],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    (filename,) = write_audio_files(str(shared_datadir), 1)
+
+    cached = Autotracks(config, [shared_datadir], snapshot_filename, analyse=False)
+    assert cached.library.errors[filename].message.startswith("No cached metadata")
+
+    analysed: List[str] = []
+
+    def analyse_audio(
+        library: Library, filenames: List[str], _: object, on_submitted, on_track
+    ):
+        analysed.extend(filenames)
+        on_submitted()
+        return {}, {}
+
+    # a snapshot of a library loaded without analysis must not skip it afterwards
+    monkeypatch.setattr(Library, "_analyse_audio", analyse_audio)
+    Autotracks(config, [shared_datadir], snapshot_filename)
+
+    assert analysed == [filename]
+
+
+def test_snapshot_other_errors(cold: Library, snapshot_filename: str):
+    # errors of any type are restored, rather than missing the whole snapshot
+    cold.errors["other.flac"] = UnknownTrackError("Unknown track: other.flac")
+    digest = bytes(32)
+    save_snapshot(cold, snapshot_filename, digest)
+
+    snapshot = load_snapshot(snapshot_filename, digest)
+
+    assert snapshot is not None
+    _, errors, _ = snapshot
+    assert errors["other.flac"].message == "Unknown track: other.flac"
@@ -0,0 +1,108 @@
+import os
+import pytest
+
+from typing import Callable, Dict, List
+
+from src.autotracks.__main__ import main
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.library import Library
+
+
+def scan(directory: str) -> List[str]:
+    return [os.path.join(directory, filename) for filename in os.listdir(directory)]
+
+
+def test_ready_before_analysis(
+    stub_config: AutotracksConfig,
+    write_audio_files: Callable[[str, int], List[str]],
+    shared_datadir: str,
+    tmp_path: str,
+):
+    fresh = write_audio_files(os.path.join(tmp_path, "audio"), 4)
+    cached = scan(str(shared_datadir))
+
+    seen: List[List[str]] = []
+
+    def ready(library: Library) -> None:
+        seen.append(list(library.tracks))
+        # the preliminary library is consistent on its own
+        assert set(library.neighbours) == set(library.tracks)
+        assert sum(map(len, library.components)) == len(library.tracks)
+
+    library = Library(stub_config, cached + fresh, workers=2, on_ready=ready)
+
+    # called once, with the cached tracks only
+    assert len(seen) == 1
+    assert sorted(seen[0]) == sorted(
+        f.removesuffix(".meta")
+        for f in cached
+        if f.removesuffix(".meta") not in library.errors
+    )
+
+    # analysed tracks are linked as they complete, as a full rebuild would
+    assert set(fresh) <= set(library.tracks)
+    rebuilt = library.find_neighbours(library.tracks)
+    assert {
+        filename: sorted(t.filename for t in neighbours)
+        for filename, neighbours in library.neighbours.items()
+    } == {
+        filename: sorted(t.filename for t in neighbours)
+        for filename, neighbours in rebuilt.items()
+    }
+    assert sum(map(len, library.components)) == len(library.tracks)
+
+
+def test_not_ready_without_analysis(stub_config: AutotracksConfig, shared_datadir: str):
+    seen: List[Library] = []
+    Library(stub_config, scan(str(shared_datadir)), on_ready=seen.append)
+
+    # nothing to wait for, the library is complete right away
+    assert not seen
+
+
+def test_cached_only(
+    config: AutotracksConfig, shared_datadir: str, capsys: pytest.CaptureFixture[str]
+):
+    Library(config, scan(str(shared_datadir)))
+
+    # no analysis, no empty progress bar
+    assert "Analysing audio files" not in capsys.readouterr().err
+
+
+@pytest.mark.usefixtures("cli_logging")
+def test_run_preliminary(
+    stub_environment: Dict[str, str],
+    write_audio_files: Callable[[str, int], List[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    shared_datadir: str,
+    tmp_path: str,
+):
+    for name, value in stub_environment.items():
+        monkeypatch.setenv(name, value)
+
+    audio = os.path.join(tmp_path, "audio")
+    write_audio_files(audio, 3)
+    preliminary = os.path.join(tmp_path, "preliminary.m3u")
+    output = os.path.join(tmp_path, "playlist.m3u")
+
+    status = main(
+        [
+            "run",
+            "--strategy",
+            "greedy",
+            "--preliminary",
+            preliminary,
+            output,
+            str(shared_datadir),
+            audio,
+        ]
+    )
+
+    assert status == os.EX_OK
+    assert os.path.exists(output)
+
+    # the preliminary playlist only holds tracks that were cached
+    with open(preliminary) as playlist_file:
+        tracks = [line.strip() for line in playlist_file if not line.startswith("#")]
+    assert tracks
+    assert not any(track.startswith(audio) for track in tracks)
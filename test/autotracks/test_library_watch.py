@@ -0,0 +1,102 @@
+import os
+import shutil
+import pytest
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.watch import InotifyWatcher, LibraryWatcher, PollingWatcher
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+def write_meta(filename: str, bpm: float, key: str) -> None:
+    with open(filename, "w") as meta_file:
+        print(bpm, file=meta_file)
+        print(key, file=meta_file)
+
+
+def test_apply_added_and_removed(autotracks: Autotracks, shared_datadir: str):
+    library = autotracks.library
+    watcher = LibraryWatcher(library, PollingWatcher([str(shared_datadir)]))
+
+    # a new track in A minor joins the main component
+    added = os.path.join(shared_datadir, "9.flac.meta")
+    write_meta(added, 124, "1m")
+    watcher.apply({added})
+
+    audio_filename = os.path.join(shared_datadir, "9.flac")
+    assert audio_filename in library.tracks
+    assert len(library.components[0]) == 5
+    assert any(
+        t.filename == audio_filename
+        for t in library.neighbours[os.path.join(shared_datadir, "2.mp3")]
+    )
+
+    os.remove(added)
+    removed = os.path.join(shared_datadir, "4.flac.meta")
+    os.remove(removed)
+    watcher.apply({added, removed})
+
+    assert audio_filename not in library.tracks
+    assert os.path.join(shared_datadir, "4.flac") not in library.tracks
+    assert len(library.components) == 1
+
+
+def test_apply_changed(autotracks: Autotracks, shared_datadir: str):
+    library = autotracks.library
+    changes = []
+    watcher = LibraryWatcher(
+        library,
+        PollingWatcher([str(shared_datadir)]),
+        on_change=lambda: changes.append(len(library.tracks)),
+    )
+
+    # the isolated B major track moves to C major
+    changed = os.path.join(shared_datadir, "4.flac.meta")
+    write_meta(changed, 128, "1d")
+    watcher.apply({changed})
+
+    assert (
+        str(library.tracks[os.path.join(shared_datadir, "4.flac")].metadata.key)
+        == "Cmaj"
+    )
+    assert len(library.components) == 1
+    assert changes == [5]
+
+
+def test_apply_own_writes(autotracks: Autotracks, shared_datadir: str):
+    changes = []
+    watcher = LibraryWatcher(
+        autotracks.library,
+        PollingWatcher([str(shared_datadir)]),
+        on_change=lambda: changes.append(True),
+    )
+
+    # the .meta and .fail files of an audio file are written by the library itself
+    open(os.path.join(shared_datadir, "1.flac"), "w").close()
+    watcher.apply({os.path.join(shared_datadir, "1.flac.meta")})
+    open(os.path.join(shared_datadir, "9.flac.fail"), "w").close()
+    watcher.apply({os.path.join(shared_datadir, "9.flac.fail")})
+
+    assert changes == []
+
+
+@pytest.mark.parametrize("watcher_class", [PollingWatcher, InotifyWatcher])
+def test_watcher(watcher_class, tmp_path: str, shared_datadir: str):
+    try:
+        watcher = watcher_class([str(tmp_path)])
+    except OSError:
+        pytest.skip("inotify is not available")
+
+    created = os.path.join(tmp_path, "1.flac.meta")
+    shutil.copy(os.path.join(shared_datadir, "1.flac.meta"), created)
+    assert watcher.wait(0.1) == {created}
+
+    os.remove(created)
+    assert watcher.wait(0.1) == {created}
+    assert watcher.wait(0.1) == set()
+
+    watcher.close()
@@ -0,0 +1,51 @@
+import logging
+import os
+import pytest
+
+from typing import Iterator
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig, setup_logging, stop_logging
+from src.autotracks.registry import make_scorer, make_strategy
+
+
+@pytest.fixture
+def log_directory(tmp_path: str) -> Iterator[str]:
+    yield os.path.join(tmp_path, "log")
+
+    stop_logging()
+    for handler in logging.getLogger().handlers[:]:
+        logging.getLogger().removeHandler(handler)
+
+
+def read_log(log_directory: str) -> str:
+    # the queued records are only guaranteed to be written once logging stops
+    stop_logging()
+    (filename,) = os.listdir(log_directory)
+    with open(os.path.join(log_directory, filename)) as log_file:
+        return log_file.read()
+
+
+@pytest.mark.parametrize("trace", [False, True])
+def test_trace(
+    trace: bool, config: AutotracksConfig, shared_datadir: str, log_directory: str
+):
+    setup_logging(log_directory, trace=trace)
+
+    autotracks = Autotracks(config, [shared_datadir])
+    autotracks.generate_playlists(make_strategy("dfs", make_scorer("bybpm")))
+
+    log = read_log(log_directory)
+    assert "Total combinations: 12" in log
+    assert ("Starting with" in log) == trace
+
+
+def test_level(log_directory: str):
+    setup_logging(log_directory, level="WARNING")
+
+    logging.info("hidden")
+    logging.warning("shown")
+
+    log = read_log(log_directory)
+    assert "hidden" not in log
+    assert "shown" in log
@@ -0,0 +1,45 @@
+import json
+import os
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.metrics import Metrics, instrument
+from src.autotracks.registry import make_scorer, make_strategy
+
+
+def test_metrics():
+    metrics = Metrics()
+
+    with metrics.phase("walk"):
+        pass
+    metrics.add_time("walk", 1.0)
+    metrics.count("cache.hits")
+    metrics.count("cache.hits", 2)
+
+    report = metrics.report()
+    assert report["phases"]["walk"]["calls"] == 2
+    assert report["phases"]["walk"]["seconds"] >= 1.0
+    assert report["counters"] == {"cache.hits": 3}
+
+    metrics.reset()
+    assert metrics.report() == {"phases": {}, "counters": {}}
+
+
+def test_instrument(config: AutotracksConfig, shared_datadir: str, tmp_path: str):
+    filename = os.path.join(tmp_path, "metrics.json")
+
+    with instrument(filename, trace_memory=True):
+        autotracks = Autotracks(config, [shared_datadir])
+        strategy = make_strategy("dfs", make_scorer("bybpm"))
+        playlists = autotracks.generate_playlists(strategy)
+        autotracks.select_playlist(strategy, playlists)
+
+    with open(filename) as metrics_file:
+        report = json.load(metrics_file)
+
+    for phase in ["walk", "classify", "cache.load", "neighbours", "search", "select"]:
+        assert phase in report["phases"]
+    assert report["phases"]["dfs.discover_graph"]["calls"] == 1
+    assert report["counters"]["files.meta"] == 8
+    assert report["counters"]["playlists.generated"] == 12
+    assert report["memory"]["peak_bytes"] > 0
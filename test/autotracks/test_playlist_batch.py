@@ -0,0 +1,86 @@
+import json
+import os
+import pytest
+
+from typing import Any, Dict, List
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.error import InvalidJobError
+from src.autotracks.job import Job, load_jobs, parse_job
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def jobs(tmp_path: str) -> List[Job]:
+    filename = os.path.join(tmp_path, "jobs.json")
+    with open(filename, "w") as jobs_file:
+        json.dump(
+            [
+                {"output": os.path.join(tmp_path, "dfs.m3u")},
+                {
+                    "output": os.path.join(tmp_path, "greedy.m3u"),
+                    "strategy": "greedy",
+                    "scorer": "composite",
+                },
+                {
+                    "output": os.path.join(tmp_path, "cover.m3u"),
+                    "strategy": "cover",
+                    "all": True,
+                },
+            ],
+            jobs_file,
+        )
+
+    return load_jobs(filename)
+
+
+def test_batch_outputs(autotracks: Autotracks, jobs: List[Job]):
+    results = autotracks.run_jobs(jobs)
+    filenames: List[List[str]] = [
+        [os.path.basename(filename) for filename in result] for result in results
+    ]
+
+    assert filenames == [
+        ["dfs.m3u"],
+        ["greedy.m3u"],
+        ["cover-01.m3u", "cover-02.m3u"],
+    ]
+    assert all(os.path.isfile(f) for result in results for f in result)
+
+
+def test_batch_unknown_strategy(autotracks: Autotracks, tmp_path: str):
+    job = Job(output=os.path.join(tmp_path, "x.m3u"), strategy="unknown")
+
+    with pytest.raises(InvalidJobError):
+        autotracks.run_job(job)
+
+    assert autotracks.run_jobs([job]) == [[]]
+
+
+def test_batch_failures(autotracks: Autotracks, tmp_path: str):
+    written = Job(output=os.path.join(tmp_path, "written.m3u"))
+    unwritable = Job(output=os.path.join(tmp_path, "missing", "x.m3u"))
+    # a value of the wrong type fails while generating, not as a job error
+    broken = Job(
+        output=os.path.join(tmp_path, "broken.m3u"),
+        strategy="kbest",
+        strategy_options={"k": "5"},
+    )
+
+    results = autotracks.run_jobs([unwritable, broken, written])
+
+    assert results == [[], [], [written.output]]
+
+
+@pytest.mark.parametrize(
+    "entry",
+    [{"first": 5}, {"strategy": ["dfs"]}, {"all": "yes"}, {"strategy_options": []}],
+)
+def test_batch_invalid_types(entry: Dict[str, Any]):
+    with pytest.raises(InvalidJobError):
+        parse_job(entry)
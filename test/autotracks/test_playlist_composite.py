@@ -0,0 +1,87 @@
+import pytest
+
+from dataclasses import replace
+from typing import List
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.composite import Composite
+from src.autotracks.strategy import Strategy
+from src.autotracks.strategies.dfs import DFS
+from src.autotracks.track import Track
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return Composite()
+
+
+@pytest.fixture
+def strategy(scorer: Scorer) -> Strategy:
+    return DFS(scorer)
+
+
+@pytest.fixture
+def selected(autotracks: Autotracks, strategy: Strategy) -> Playlist:
+    playlists = autotracks.generate_playlists(strategy)
+    return autotracks.select_playlist(strategy, playlists)
+
+
+def test_playlist_length(selected: Playlist):
+    assert len(selected.tracks) == 4
+
+
+def test_playlist_score(autotracks: Autotracks, scorer: Scorer, selected: Playlist):
+    score = autotracks.score_playlist(scorer, selected)
+
+    assert 3.0 < score < 4.0
+
+
+def test_scorer_batch(autotracks: Autotracks, scorer: Scorer):
+    tracks: List[Track] = list(autotracks.library.tracks.values())
+    pairs = [(a, b) for a in tracks for b in tracks]
+
+    single = [scorer.score_transition(a, b) for a, b in pairs]
+    scorer.prepare(autotracks.library)
+    batch = scorer.score_transitions([a for a, _ in pairs], [b for _, b in pairs])
+
+    assert batch == pytest.approx(single)
+    assert all(score == 0 for (a, b), score in zip(pairs, batch) if a == b)
+
+
+def test_scorer_reloaded(autotracks: Autotracks, scorer: Scorer):
+    library = autotracks.library
+    scorer.prepare(library)
+
+    # a track analysed again replaces the one the columns were extracted from
+    a, b = list(library.tracks.values())[:2]
+    reloaded = Track(b.filename, b.metadata_filename, replace(b.metadata, bpm=90))
+    library.insert_tracks({b.filename: reloaded}, {})
+
+    assert scorer.score_transitions([a], [reloaded]) == pytest.approx(
+        [scorer.score_transition(a, reloaded)]
+    )
+    assert scorer.score_transition(a, reloaded) != scorer.score_transition(a, b)
+
+
+@pytest.mark.parametrize("prepared", [False, True])
+def test_scorer_neighbours(autotracks: Autotracks, scorer: Scorer, prepared: bool):
+    library = autotracks.library
+    if prepared:
+        scorer.prepare(library)
+
+    scores = scorer.score_neighbours(library, library.tracks)
+
+    assert set(scores) == set(library.tracks)
+    for filename, track in library.tracks.items():
+        neighbours = library.neighbours[filename]
+        assert scores[filename] == pytest.approx(
+            [scorer.score_transition(track, neighbour) for neighbour in neighbours]
+        )
@@ -0,0 +1,57 @@
+import os
+import pytest
+
+from typing import List
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.bybpm import ByBPM
+from src.autotracks.strategy import Strategy
+from src.autotracks.strategies.cover import Cover
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return ByBPM()
+
+
+@pytest.fixture
+def strategy(scorer: Scorer) -> Strategy:
+    return Cover(scorer)
+
+
+@pytest.fixture
+def playlists(autotracks: Autotracks, strategy: Strategy) -> List[Playlist]:
+    return autotracks.generate_playlists(strategy)
+
+
+def test_playlist_cover_length(playlists: List[Playlist]):
+    assert [len(playlist.tracks) for playlist in playlists] == [4, 1]
+
+
+def test_playlist_cover_neighbours(playlists: List[Playlist]):
+    for playlist in playlists:
+        for a, b in zip(playlist.tracks, playlist.tracks[1:]):
+            assert b.is_neighbour(a)
+
+
+def test_playlist_cover_unused(autotracks: Autotracks, playlists: List[Playlist]):
+    covered: List[str] = [track.filename for p in playlists for track in p.tracks]
+
+    assert len(covered) == len(set(covered)) == len(autotracks.library.tracks)
+
+
+def test_playlist_cover_write(
+    autotracks: Autotracks, playlists: List[Playlist], tmp_path: str
+):
+    filenames = autotracks.write_playlists(playlists, os.path.join(tmp_path, "set.m3u"))
+
+    assert [os.path.basename(f) for f in filenames] == ["set-01.m3u", "set-02.m3u"]
+    assert all(os.path.isfile(f) for f in filenames)
@@ -1,9 +1,11 @@
+import dataclasses
 import os
 import pytest
 
-from typing import Dict, List, Set, Tuple
+from typing import List, Set, Tuple
 
 from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
 from src.autotracks.error import Error
 from src.autotracks.playlist import Playlist
 from src.autotracks.scorer import Scorer
@@ -14,7 +16,7 @@ from src.autotracks.track import Track
 
 
 @pytest.fixture
-def autotracks(config: Dict[str, str | None], shared_datadir: str) -> Autotracks:
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
     return Autotracks(config, [shared_datadir])
 
 
@@ -78,3 +80,53 @@ def test_playlist_errors(errors: Set[Tuple[str, Error]]):
 
 def test_playlist_score(score: float):
     assert score == 4.0
+
+
+def test_library_components(autotracks: Autotracks):
+    sizes: List[int] = [len(component) for component in autotracks.library.components]
+
+    assert sizes == [4, 1]
+
+
+def test_playlist_components(autotracks: Autotracks, strategy: Strategy):
+    playlists = autotracks.generate_playlists(strategy)
+    best: List[Playlist] = autotracks.select_component_playlists(strategy, playlists)
+
+    assert len(best) == 1
+    assert len(best[0].tracks) == 4
+
+
+def test_playlist_anchored(autotracks: Autotracks, scorer: Scorer, shared_datadir: str):
+    first = autotracks.library.find_track(os.path.join(shared_datadir, "3.wav"))
+    last = autotracks.library.find_track(os.path.join(shared_datadir, "1.flac"))
+    strategy = DFS(scorer, first, last)
+
+    playlists = autotracks.generate_playlists(strategy)
+    selected = autotracks.select_playlist(strategy, playlists)
+
+    assert selected.tracks[0] == first
+    assert selected.tracks[-1] == last
+    for a, b in zip(selected.tracks, selected.tracks[1:]):
+        assert b.is_neighbour(a)
+
+
+def test_playlist_with_track(selected: Playlist):
+    prefix = Playlist(selected.tracks[:2])
+    extended = prefix
+    for track in selected.tracks[2:]:
+        extended = extended.with_track(track)
+
+    assert extended == selected
+    assert hash(extended) == hash(selected)
+    assert extended.tracks[:2] == prefix.tracks
+    assert len(prefix) == 2
+
+
+def test_library_mixing_rules(config: AutotracksConfig, shared_datadir: str):
+    loose = dataclasses.replace(
+        config, mixing_rules=("relative", "adjacent", "semitone")
+    )
+    autotracks = Autotracks(loose, [shared_datadir])
+    sizes: List[int] = [len(component) for component in autotracks.library.components]
+
+    assert sizes == [5]
@@ -0,0 +1,126 @@
+import pytest
+
+from typing import Any, Callable, Dict, List
+
+from bench.synthetic import generate_library
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.error import InvalidJobError
+from src.autotracks.library import Library
+from src.autotracks.playlist import Playlist
+from src.autotracks.registry import make_strategy
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.bybpm import ByBPM
+from src.autotracks.strategy import Strategy
+from src.autotracks.strategies.duration import Duration
+from src.autotracks.track import Track
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return ByBPM()
+
+
+@pytest.fixture
+def strategy(scorer: Scorer) -> Strategy:
+    return Duration(scorer, target=15 * 60, tolerance=60)
+
+
+@pytest.fixture
+def selected(autotracks: Autotracks, strategy: Strategy) -> Playlist:
+    playlists = autotracks.generate_playlists(strategy)
+    return autotracks.select_playlist(strategy, playlists)
+
+
+def test_playlist_length(selected: Playlist):
+    assert len(selected.tracks) == 3
+
+
+def test_playlist_duration(selected: Playlist):
+    assert selected.duration() == 900.0
+
+
+def test_playlist_neighbours(selected: Playlist):
+    a: Track = selected.tracks[0]
+    for b in selected.tracks[1:]:
+        assert b.is_neighbour(a)
+        a = b
+
+
+def test_playlist_unreachable(autotracks: Autotracks, scorer: Scorer):
+    strategy = Duration(scorer, target=60 * 60, tolerance=60)
+    playlists = autotracks.generate_playlists(strategy)
+
+    assert autotracks.select_playlist(strategy, playlists).is_empty()
+
+
+def test_playlist_pruned(
+    config: AutotracksConfig,
+    scorer: Scorer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: str,
+):
+    generate_library(str(tmp_path), 40)
+    autotracks = Autotracks(config, [str(tmp_path)])
+    strategy = Duration(scorer, target=20 * 60, tolerance=30)
+
+    pruned = autotracks.generate_playlists(strategy)
+
+    # branches cut for lack of reachable time never held a playlist within the window
+    monkeypatch.setattr(Duration, "_can_reach", lambda *_: True)
+    exhaustive = autotracks.generate_playlists(strategy)
+
+    assert pruned
+    assert [playlist.tracks for playlist in pruned] == [
+        playlist.tracks for playlist in exhaustive
+    ]
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"target": "abc"},
+        {"target": 0},
+        {"target": True},
+        {"target": 900, "tolerance": -1},
+        {"target": 900, "max_expansions": 0},
+        {"target": 900, "max_expansions": 1.5},
+    ],
+)
+def test_invalid_options(scorer: Scorer, options: Dict[str, Any]):
+    with pytest.raises(ValueError):
+        Duration(scorer, **options)
+
+    with pytest.raises(InvalidJobError):
+        make_strategy("duration", scorer, options=options)
+
+
+def test_duration_backfilled(
+    config: AutotracksConfig,
+    write_audio_files: Callable[[str, int], List[str]],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: str,
+):
+    # a track cached before durations were recorded
+    (filename,) = write_audio_files(str(tmp_path), 1)
+    with open(f"{filename}.meta", "w") as meta:
+        print("123\n1m", file=meta)
+
+    monkeypatch.setattr(Library, "_probe_duration", lambda *_: 300.0)
+    library = Autotracks(config, [str(tmp_path)]).library
+
+    assert library.tracks[filename].metadata.duration == 300.0
+    with open(f"{filename}.meta") as meta:
+        assert meta.read().split() == ["123.0", "Amin", "300.0"]
+
+    # the file is only probed once
+    def fail(*_: object) -> None:
+        raise AssertionError("duration probed")
+
+    monkeypatch.setattr(Library, "_probe_duration", fail)
+    assert Autotracks(config, [str(tmp_path)]).library.tracks[filename]
@@ -1,9 +1,10 @@
 import os
 import pytest
 
-from typing import Dict, List, Set
+from typing import List, Set
 
 from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
 from src.autotracks.playlist import Playlist
 from src.autotracks.scorer import Scorer
 from src.autotracks.scorers.bybpm import ByBPM
@@ -13,7 +14,7 @@ from src.autotracks.track import Track
 
 
 @pytest.fixture
-def autotracks(config: Dict[str, str | None], shared_datadir: str) -> Autotracks:
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
     return Autotracks(config, [shared_datadir])
 
 
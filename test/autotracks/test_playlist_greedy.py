@@ -0,0 +1,68 @@
+import os
+import pytest
+
+from typing import List, Set
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.bybpm import ByBPM
+from src.autotracks.strategy import Strategy
+from src.autotracks.strategies.greedy import Greedy
+from src.autotracks.track import Track
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return ByBPM()
+
+
+@pytest.fixture
+def strategy(scorer: Scorer) -> Strategy:
+    return Greedy(scorer)
+
+
+@pytest.fixture
+def selected(autotracks: Autotracks, strategy: Strategy) -> Playlist:
+    playlists = autotracks.generate_playlists(strategy)
+    return autotracks.select_playlist(strategy, playlists)
+
+
+@pytest.fixture
+def unused(autotracks: Autotracks, selected: Playlist) -> Set[Track]:
+    return autotracks.get_unused_tracks(selected)
+
+
+def test_playlist_length(selected: Playlist):
+    assert len(selected.tracks) == 4
+
+
+def test_playlist_neighbours(selected: Playlist):
+    a: Track = selected.tracks[0]
+    for b in selected.tracks[1:]:
+        assert b.is_neighbour(a)
+        a = b
+
+
+def test_playlist_unused(unused: Set[Track]):
+    filenames: List[str] = [os.path.basename(track.filename) for track in unused]
+
+    assert len(filenames) == 1
+    assert "4.flac" in filenames
+
+
+def test_playlist_anchored(autotracks: Autotracks, scorer: Scorer, shared_datadir: str):
+    first = autotracks.library.find_track(os.path.join(shared_datadir, "5.flac"))
+    strategy = Greedy(scorer, first)
+
+    playlists = autotracks.generate_playlists(strategy)
+    selected = autotracks.select_playlist(strategy, playlists)
+
+    assert len(playlists) == 1
+    assert selected.tracks[0] == first
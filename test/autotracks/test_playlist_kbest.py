@@ -0,0 +1,140 @@
+import os
+import pytest
+
+from itertools import combinations
+from typing import List, Set, Tuple
+
+from bench.synthetic import generate_library
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.playlist import Playlist
+from src.autotracks.registry import make_strategy
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.bybpm import ByBPM
+from src.autotracks.strategies.kbest import KBest
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return ByBPM()
+
+
+@pytest.fixture(scope="module")
+def synthetic(config: AutotracksConfig, tmp_path_factory: pytest.TempPathFactory):
+    directory = str(tmp_path_factory.mktemp("synthetic"))
+    generate_library(directory, 80, seed=3)
+
+    return Autotracks(config, [directory])
+
+
+def transitions(playlist: Playlist) -> Set[Tuple[str, str]]:
+    return {
+        (a.filename, b.filename) for a, b in zip(playlist.tracks, playlist.tracks[1:])
+    }
+
+
+def maximal_paths(autotracks: Autotracks) -> Set[Tuple[str, ...]]:
+    # every simple path that cannot be extended any further
+    neighbours = autotracks.library.neighbours
+    paths: Set[Tuple[str, ...]] = set()
+
+    def extend(path: Tuple[str, ...]) -> None:
+        following = [
+            track.filename
+            for track in neighbours[path[-1]]
+            if track.filename not in path
+        ]
+        if not following and len(path) > 1:
+            paths.add(path)
+        for filename in following:
+            extend(path + (filename,))
+
+    for filename in neighbours:
+        extend((filename,))
+
+    return paths
+
+
+def filenames(playlist: Playlist) -> Tuple[str, ...]:
+    return tuple(track.filename for track in playlist.tracks)
+
+
+def assert_valid(playlists: List[Playlist]) -> None:
+    for playlist in playlists:
+        filenames = [track.filename for track in playlist.tracks]
+        assert len(filenames) == len(set(filenames)) > 1
+        for a, b in zip(playlist.tracks, playlist.tracks[1:]):
+            assert b.is_neighbour(a)
+
+    assert len(set(playlists)) == len(playlists)
+
+
+def test_playlist_kbest(synthetic: Autotracks, scorer: Scorer):
+    strategy = KBest(scorer, k=4)
+    playlists = synthetic.generate_playlists(strategy)
+
+    assert len(playlists) == 4
+    assert_valid(playlists)
+
+    # best first, and different enough from each other
+    scores = [playlist.score(scorer) for playlist in playlists]
+    assert scores == sorted(scores, reverse=True)
+    assert synthetic.select_playlist(strategy, playlists) == playlists[0]
+    for a, b in combinations(playlists, 2):
+        shared = transitions(a) & transitions(b)
+        assert len(shared) <= 0.5 * min(len(a), len(b))
+
+
+def test_playlist_kbest_disjoint(synthetic: Autotracks, scorer: Scorer):
+    playlists = synthetic.generate_playlists(KBest(scorer, k=3, max_overlap=0))
+
+    assert len(playlists) == 3
+    assert_valid(playlists)
+    for a, b in combinations(playlists, 2):
+        assert not transitions(a) & transitions(b)
+
+
+def test_playlist_kbest_budget(synthetic: Autotracks, scorer: Scorer):
+    # without expansions, each playlist is the first walk that is diverse enough
+    playlists = synthetic.generate_playlists(KBest(scorer, k=3, max_expansions=0))
+
+    assert 1 <= len(playlists) <= 3
+    assert_valid(playlists)
+
+
+def test_playlist_kbest_anchored(
+    autotracks: Autotracks, scorer: Scorer, shared_datadir: str
+):
+    first = autotracks.library.find_track(os.path.join(shared_datadir, "1.flac"))
+    strategy = make_strategy(
+        "kbest", scorer, first=first, options={"k": 10, "max_overlap": 1}
+    )
+    playlists = autotracks.generate_playlists(strategy)
+
+    assert_valid(playlists)
+    assert {filenames(playlist) for playlist in playlists} == {
+        path for path in maximal_paths(autotracks) if path[0] == first.filename
+    }
+
+
+def test_playlist_kbest_exhaustive(autotracks: Autotracks, scorer: Scorer):
+    # without an overlap limit, every walk is found once the best one is selected
+    playlists = autotracks.generate_playlists(KBest(scorer, k=50, max_overlap=1))
+
+    assert_valid(playlists)
+    assert len(playlists) == 8
+    assert {filenames(playlist) for playlist in playlists} == maximal_paths(autotracks)
+
+
+def test_playlist_kbest_unbudgeted(synthetic: Autotracks, scorer: Scorer):
+    # selected playlists are still forked when the budget is spent
+    strategy = KBest(scorer, k=5, max_overlap=1, max_expansions=0)
+    playlists = synthetic.generate_playlists(strategy)
+
+    assert len(playlists) == 5
+    assert_valid(playlists)
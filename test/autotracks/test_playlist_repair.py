@@ -0,0 +1,103 @@
+import os
+import pytest
+
+from typing import List
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.playlist import Playlist
+from src.autotracks.scorer import Scorer
+from src.autotracks.scorers.bybpm import ByBPM
+
+
+@pytest.fixture
+def autotracks(config: AutotracksConfig, shared_datadir: str) -> Autotracks:
+    return Autotracks(config, [shared_datadir])
+
+
+@pytest.fixture
+def scorer() -> Scorer:
+    return ByBPM()
+
+
+@pytest.fixture
+def playlist_filename(autotracks: Autotracks, shared_datadir: str) -> str:
+    playlist = Playlist(
+        [
+            autotracks.library.tracks[os.path.join(shared_datadir, filename)]
+            for filename in ["1.flac", "2.mp3", "3.wav"]
+        ]
+    )
+    filename = os.path.join(shared_datadir, "set.m3u")
+    autotracks.write_playlist(playlist, filename)
+
+    return filename
+
+
+@pytest.fixture
+def added(shared_datadir: str) -> List[str]:
+    filename = os.path.join(shared_datadir, "9.flac.meta")
+    with open(filename, "w") as meta:
+        print("126\n1d\n300", file=meta)
+
+    return [filename]
+
+
+def basenames(playlist: Playlist) -> List[str]:
+    return [os.path.basename(track.filename) for track in playlist.tracks]
+
+
+def test_playlist_read(autotracks: Autotracks, playlist_filename: str):
+    playlist = autotracks.read_playlist(playlist_filename)
+
+    assert basenames(playlist) == ["1.flac", "2.mp3", "3.wav"]
+
+
+def test_playlist_repair_added(
+    autotracks: Autotracks, scorer: Scorer, playlist_filename: str, added: List[str]
+):
+    repaired = autotracks.repair_playlist(scorer, playlist_filename, added, [])
+
+    assert len(repaired.tracks) == 4
+    assert "9.flac" in basenames(repaired)
+    for a, b in zip(repaired.tracks, repaired.tracks[1:]):
+        assert b.is_neighbour(a)
+
+
+def test_playlist_repair_removed(
+    autotracks: Autotracks,
+    scorer: Scorer,
+    playlist_filename: str,
+    added: List[str],
+    shared_datadir: str,
+):
+    removed = [os.path.join(shared_datadir, "2.mp3")]
+    repaired = autotracks.repair_playlist(scorer, playlist_filename, added, removed)
+
+    assert basenames(repaired) == ["1.flac", "9.flac", "3.wav"]
+    assert os.path.join(shared_datadir, "2.mp3") not in autotracks.library.tracks
+
+
+def test_library_remove(autotracks: Autotracks, shared_datadir: str):
+    autotracks.library.remove_tracks([os.path.join(shared_datadir, "1.flac")])
+
+    sizes: List[int] = [len(component) for component in autotracks.library.components]
+    assert sorted(sizes) == [1, 3]
+
+
+def test_playlist_repair_unbridged(
+    autotracks: Autotracks, scorer: Scorer, shared_datadir: str
+):
+    # 4.flac has no neighbour: the gaps around it cannot be bridged
+    playlist = Playlist(
+        [
+            autotracks.library.tracks[os.path.join(shared_datadir, filename)]
+            for filename in ["1.flac", "4.flac", "2.mp3", "3.wav"]
+        ]
+    )
+    filename = os.path.join(shared_datadir, "gap.m3u")
+    autotracks.write_playlist(playlist, filename)
+
+    repaired = autotracks.repair_playlist(scorer, filename, [], [])
+
+    assert basenames(repaired) == ["1.flac", "4.flac", "2.mp3", "3.wav"]
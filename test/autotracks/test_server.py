@@ -0,0 +1,80 @@
+import json
+import threading
+import pytest
+
+from http.client import HTTPConnection
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from src.autotracks.autotracks import Autotracks
+from src.autotracks.config import AutotracksConfig
+from src.autotracks.server import PlaylistService, make_server
+
+
+@pytest.fixture
+def address(config: AutotracksConfig, shared_datadir: str) -> Iterator[Tuple[str, int]]:
+    service = PlaylistService(Autotracks(config, [shared_datadir]))
+    server = make_server(service, ("127.0.0.1", 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server.server_address
+
+    server.shutdown()
+    server.server_close()
+
+
+def request(
+    address: Tuple[str, int], method: str, path: str, body: Optional[Dict] = None
+) -> Tuple[int, Dict[str, Any]]:
+    connection = HTTPConnection(*address)
+    connection.request(method, path, json.dumps(body) if body is not None else None)
+    response = connection.getresponse()
+    status, payload = response.status, json.loads(response.read())
+    connection.close()
+
+    return status, payload
+
+
+def test_status(address: Tuple[str, int]):
+    status, payload = request(address, "GET", "/status")
+
+    assert status == 200
+    assert payload["tracks"] == 5
+    assert payload["errors"] == 3
+
+
+def test_playlist(address: Tuple[str, int]):
+    status, payload = request(address, "POST", "/playlist", {"strategy": "greedy"})
+
+    assert status == 200
+    assert len(payload["playlists"]) == 1
+    assert len(payload["playlists"][0]["tracks"]) == 4
+
+
+def test_playlist_anchored(address: Tuple[str, int], shared_datadir: str):
+    first = str(shared_datadir / "1.flac")
+    status, payload = request(address, "POST", "/playlist", {"first": first})
+
+    assert status == 200
+    assert payload["playlists"][0]["tracks"][0]["filename"].endswith("1.flac")
+
+
+def test_invalid_requests(address: Tuple[str, int]):
+    assert request(address, "POST", "/playlist", {"strategy": "nope"})[0] == 400
+    assert request(address, "POST", "/playlist", {"output": "x.m3u"})[0] == 400
+    assert request(address, "POST", "/playlist", {"first": "missing.mp3"})[0] == 400
+    assert request(address, "POST", "/playlist", {"first": 5})[0] == 400
+    assert request(address, "POST", "/playlist", {"strategy": ["dfs"]})[0] == 400
+    assert request(address, "GET", "/nope")[0] == 404
+
+
+def test_internal_error(address: Tuple[str, int], monkeypatch: pytest.MonkeyPatch):
+    def fail(*_: object) -> None:
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(PlaylistService, "playlist", fail)
+
+    status, payload = request(address, "POST", "/playlist", {})
+
+    assert status == 500
+    assert payload == {"error": "Internal server error"}
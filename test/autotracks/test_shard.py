@@ -0,0 +1,105 @@
+import itertools
+import os
+import subprocess
+import sys
+import pytest
+
+from typing import Callable, Dict, List
+
+from src.autotracks.key import lookup_key
+from src.autotracks.shard import parse_shard, select_shard, shard_of
+from src.autotracks.store import (
+    ResultStore,
+    StoreRecord,
+    merge_stores,
+    read_store,
+    write_store,
+)
+from src.autotracks.track import Track, TrackMetadata
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_parse_shard():
+    assert parse_shard("3/16") == (2, 16)
+
+    for spec in ["3", "0/4", "5/4", "a/b"]:
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_select_shard():
+    filenames = [os.path.join("/tracks", f"{index}.flac") for index in range(100)]
+    shards = [select_shard(filenames, "/tracks", index, 4) for index in range(4)]
+
+    # every file belongs to exactly one shard, wherever the tree is mounted
+    assert sorted(itertools.chain(*shards)) == sorted(filenames)
+    assert all(shards)
+    assert shard_of("a/b.flac", 7) == shard_of(os.path.join("a", "b.flac"), 7)
+
+
+def test_merge_newest_wins(tmp_path: str):
+    old = StoreRecord(path="a.wav", bpm=120, key="Amin", duration=None, mtime_ns=1)
+    new = StoreRecord(path="a.wav", bpm=125, key="Cmaj", duration=300, mtime_ns=2)
+    other = StoreRecord(path="b.wav", bpm=90, key="Dmin", duration=None, mtime_ns=1)
+
+    first, second = os.path.join(tmp_path, "1.jsonl"), os.path.join(tmp_path, "2.jsonl")
+    write_store({"a.wav": new, "b.wav": other}, first)
+    write_store({"a.wav": old}, second)
+
+    # an interrupted run may leave a truncated last line
+    with open(second, "a") as store_file:
+        store_file.write('{"path": "c.wav", "bpm"')
+
+    assert read_store(second) == {"a.wav": old}
+    assert merge_stores([first, second]) == {"a.wav": new, "b.wav": other}
+
+
+def test_store_closed(
+    write_audio_files: Callable[[str, int], List[str]], tmp_path: str
+):
+    (filename,) = write_audio_files(str(tmp_path), 1)
+    track = Track(filename, f"{filename}.meta", TrackMetadata(120, lookup_key("Amin")))
+    store_filename = os.path.join(tmp_path, "store.jsonl")
+
+    with ResultStore(store_filename, str(tmp_path)) as store:
+        store.add(track)
+
+    assert filename in ResultStore(store_filename, str(tmp_path))
+    assert list(read_store(store_filename)) == [os.path.basename(filename)]
+
+
+def test_sharded_analysis(
+    stub_environment: Dict[str, str],
+    write_audio_files: Callable[[str, int], List[str]],
+    tmp_path: str,
+):
+    tracks = os.path.join(tmp_path, "tracks")
+    filenames = write_audio_files(tracks, 12)
+    environment = {**os.environ, "PYTHONPATH": ROOT, **stub_environment}
+
+    def autotracks(*args: str) -> subprocess.Popen:
+        return subprocess.Popen(
+            [sys.executable, "-m", "src.autotracks", *args],
+            cwd=tmp_path,
+            env=environment,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+    # one process per shard, each with its own store
+    stores = [os.path.join(tmp_path, f"shard-{index}.jsonl") for index in (1, 2, 3)]
+    processes = [
+        autotracks("analyse", "--shard", f"{index}/3", "--store", store, tracks)
+        for index, store in zip((1, 2, 3), stores)
+    ]
+    assert [process.wait() for process in processes] == [0, 0, 0]
+
+    # shards are disjoint and no .meta file was written yet
+    paths = [set(read_store(store)) for store in stores]
+    assert sum(len(p) for p in paths) == 12
+    assert set.union(*paths) == {os.path.basename(f) for f in filenames}
+    assert not any(os.path.exists(f"{filename}.meta") for filename in filenames)
+
+    assert autotracks("merge", "--root", tracks, *stores).wait() == 0
+    assert all(os.path.exists(f"{filename}.meta") for filename in filenames)
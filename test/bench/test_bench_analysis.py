@@ -0,0 +1,32 @@
+import os
+import pytest
+
+from bench.analysis import STUBS_DIRECTORY, generate_audio_files, measure
+
+
+@pytest.fixture
+def stubs(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("BPM_TAG", os.path.join(STUBS_DIRECTORY, "bpm-tag"))
+    monkeypatch.setenv("KEYFINDER_CLI", os.path.join(STUBS_DIRECTORY, "keyfinder-cli"))
+    monkeypatch.setenv("FFPROBE", os.path.join(STUBS_DIRECTORY, "ffprobe"))
+
+
+def test_measure(stubs: None, tmp_path: str):
+    filenames = generate_audio_files(os.path.join(tmp_path, "audio"), 6)
+
+    result = measure(filenames, workers=2)
+
+    assert result["info"]["files"] == 6
+    assert result["info"]["failures"] == 0
+    assert result["metrics"]["latency.p99"] >= result["metrics"]["latency.p50"]
+    # cached metadata is removed, so that every run analyses the files again
+    assert not any(os.path.exists(f"{filename}.meta") for filename in filenames)
+
+
+def test_measure_failures(stubs: None, monkeypatch: pytest.MonkeyPatch, tmp_path: str):
+    monkeypatch.setenv("STUB_KEYFINDER_CLI_FAILURE_RATE", "1")
+    filenames = generate_audio_files(os.path.join(tmp_path, "audio"), 3)
+
+    result = measure(filenames, workers=2)
+
+    assert result["info"]["failures"] == 3
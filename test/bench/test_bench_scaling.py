@@ -0,0 +1,41 @@
+import os
+
+from bench.results import compare_reports, make_report
+from bench.scaling import measure
+from bench.synthetic import generate_library
+
+
+def test_generate_library(tmp_path: str):
+    first = generate_library(os.path.join(tmp_path, "first"), 50, seed=1)
+    second = generate_library(os.path.join(tmp_path, "second"), 50, seed=1)
+
+    assert len(first) == 50
+    for a, b in zip(first, second):
+        with open(a) as meta_a, open(b) as meta_b:
+            assert meta_a.read() == meta_b.read()
+
+
+def test_measure(tmp_path: str):
+    directory = os.path.join(tmp_path, "library")
+    generate_library(directory, 40)
+
+    result = measure(directory, ["greedy", "cover"])
+
+    assert result["info"]["tracks"] == 40
+    assert result["info"]["cover.playlists"] >= 1
+    for metric in ["load", "load.neighbours", "greedy.generate", "cover.select"]:
+        assert metric in result["metrics"]
+
+
+def test_compare_reports():
+    baseline = make_report(
+        "scaling", {}, [{"case": "size=100", "metrics": {"load": 1.0, "fast": 0.001}}]
+    )
+    current = make_report(
+        "scaling", {}, [{"case": "size=100", "metrics": {"load": 1.5, "fast": 0.1}}]
+    )
+
+    (regression,) = compare_reports(baseline, current, threshold=0.2)
+    assert regression["metric"] == "load"
+    assert regression["ratio"] == 1.5
+    assert compare_reports(baseline, current, threshold=0.6) == []